@@ -0,0 +1,293 @@
+# asset_bundle.py
+# ============================================================
+# CSV → 컬럼형 바이너리 번들 (.npy 컬럼 파일 + manifest.json)
+# - 빌드: python asset_bundle.py  (전세 행 추가 시: --new-lease-rows N)
+# - 로드: 번들이 있고 원본 CSV와 일치(fresh)하면 memory-map, 아니면 CSV 파싱
+# ============================================================
+
+import hashlib
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = Path(__file__).resolve().parent
+DATA_DIR = BASE_DIR / "data"
+
+BUNDLE_VERSION = 3  # 3: bool 컬럼을 np.bool_로 저장 (2는 문자열 "True"/"False")
+
+# 번들로 변환할 CSV (파일명 → read_csv dtype)
+BUNDLE_TABLES = {
+    "MD1_final.csv": {"PNU": str},
+    "MD2_final.csv": {"PNU": str},
+    "PNU_location.csv": {"PNU": str},
+}
+
+
+# ==========================================
+# 원본 파일 식별 (freshness 판단용)
+# ==========================================
+def file_sha256(path, size=None):
+    """파일 sha256 (size를 주면 앞 size바이트만)"""
+    h = hashlib.sha256()
+    remaining = float("inf") if size is None else size
+    with open(path, "rb") as f:
+        while remaining > 0:
+            chunk = f.read(int(min(1 << 20, remaining)))
+            if not chunk:
+                break
+            h.update(chunk)
+            remaining -= len(chunk)
+    return h.hexdigest()
+
+
+def table_dir(csv_path, bundle_dir=None):
+    csv_path = Path(csv_path)
+    bundle_dir = Path(bundle_dir) if bundle_dir is not None else csv_path.parent / "bundle"
+    return bundle_dir / csv_path.stem
+
+
+def source_entry(path, append_only=False):
+    """
+    원본 식별 정보. append_only=True면 뒤에 행이 붙는 것은 허용 (기록 시점까지의 앞부분만 비교)
+    → 월 델타를 원본 CSV 끝에 이어 붙이는 거래 이력용
+    """
+    path = Path(path)
+    entry = {"name": path.name, "size": path.stat().st_size, "sha256": file_sha256(path)}
+    if append_only:
+        entry["append_only"] = True
+    return entry
+
+
+def sources_match(sources, data_dir):
+    """
+    기록된 원본 목록(source_entry)이 data_dir의 현재 파일과 크기/sha256까지 같은지.
+    append_only 원본은 현재 파일이 기록 시점 파일로 시작하면 (앞 size바이트의 sha256이 같으면) 일치.
+    data_dir에 없는 원본은 건너뜀 (원본 없이 결과물만 배포된 경우).
+    """
+    data_dir = Path(data_dir)
+    for src in sources:
+        src_path = data_dir / src["name"]
+        if not src_path.exists():
+            continue
+        size = src_path.stat().st_size
+        if src.get("append_only"):
+            if size < src["size"] or file_sha256(src_path, src["size"]) != src["sha256"]:
+                return False
+        elif size != src["size"] or file_sha256(src_path) != src["sha256"]:
+            return False
+    return True
+
+
+def is_bundle_fresh(csv_path, bundle_dir=None):
+    """
+    번들 manifest가 있고, 원본 파일(sources)이 있다면 크기/sha256이 모두 같을 때만 fresh.
+    원본 없이 번들만 배포된 경우에도 fresh로 간주.
+    """
+    manifest_path = table_dir(csv_path, bundle_dir) / "manifest.json"
+    if not manifest_path.exists():
+        return False
+
+    try:
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return False
+
+    if manifest.get("version") != BUNDLE_VERSION:
+        return False
+
+    return sources_match(manifest.get("sources", []), Path(csv_path).parent)
+
+
+# ==========================================
+# 쓰기 / 읽기
+# ==========================================
+def write_table_bundle(df, csv_path, bundle_dir=None, sources=None):
+    """
+    DataFrame을 컬럼별 .npy로 저장 (숫자형은 dtype 그대로, bool은 np.bool_ + NA 마스크,
+    문자열은 고정폭 유니코드 + NaN 마스크).
+    sources: freshness 판단에 쓸 원본 파일들 (기본: csv_path). 파생 테이블은 여러 원본을 넘김.
+    """
+    out_dir = table_dir(csv_path, bundle_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for old in out_dir.glob("*.npy"):
+        old.unlink()
+
+    columns = []
+    for i, col in enumerate(df.columns):
+        s = df[col]
+        entry = {"name": col, "file": f"c{i}.npy", "mask": None}
+
+        if pd.api.types.is_bool_dtype(s):
+            # bool / nullable boolean: 문자열로 저장하면 "False"가 참으로 읽힘
+            entry["kind"] = "bool"
+            missing = s.isna().to_numpy()
+            np.save(out_dir / entry["file"], s.fillna(False).to_numpy(dtype=bool))
+            if missing.any():
+                entry["mask"] = f"c{i}.mask.npy"
+                np.save(out_dir / entry["mask"], missing)
+        elif pd.api.types.is_numeric_dtype(s):
+            entry["kind"] = "numeric"
+            np.save(out_dir / entry["file"], s.to_numpy())
+        else:
+            entry["kind"] = "str"
+            missing = s.isna().to_numpy()
+            np.save(out_dir / entry["file"], np.asarray(s.astype(object).where(~missing, "").tolist(), dtype=str))
+            if missing.any():
+                entry["mask"] = f"c{i}.mask.npy"
+                np.save(out_dir / entry["mask"], missing)
+
+        columns.append(entry)
+
+    sources = [csv_path] if sources is None else sources
+    manifest = {
+        "version": BUNDLE_VERSION,
+        "sources": [source_entry(p) for p in sources if Path(p).exists()],
+        "n_rows": int(len(df)),
+        "columns": columns,
+    }
+    (out_dir / "manifest.json").write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+    return out_dir
+
+
+def read_table_bundle(csv_path, bundle_dir=None, mmap=True):
+    """번들 → DataFrame. 숫자 / bool 컬럼은 memory-map 배열을 복사 없이 사용 (NA 있는 bool은 boolean)."""
+    in_dir = table_dir(csv_path, bundle_dir)
+    manifest = json.loads((in_dir / "manifest.json").read_text(encoding="utf-8"))
+    mmap_mode = "r" if mmap else None
+
+    data = {}
+    for entry in manifest["columns"]:
+        arr = np.load(in_dir / entry["file"], mmap_mode=mmap_mode)
+        if entry["kind"] == "numeric":
+            data[entry["name"]] = arr
+        elif entry["kind"] == "bool":
+            if entry["mask"]:
+                data[entry["name"]] = pd.arrays.BooleanArray(np.array(arr), np.load(in_dir / entry["mask"]))
+            else:
+                data[entry["name"]] = arr
+        else:
+            values = arr.astype(object)
+            if entry["mask"]:
+                values[np.load(in_dir / entry["mask"])] = np.nan
+            data[entry["name"]] = pd.Series(values)
+
+    return pd.DataFrame(data, copy=False)
+
+
+def load_table(csv_path, dtype=None, bundle_dir=None):
+    """번들이 fresh하면 번들에서, 아니면 CSV에서 로드."""
+    if is_bundle_fresh(csv_path, bundle_dir):
+        try:
+            return read_table_bundle(csv_path, bundle_dir)
+        except (OSError, ValueError, KeyError):
+            pass
+    return pd.read_csv(csv_path, dtype=dtype)
+
+
+# ==========================================
+# 빌드 단계
+# ==========================================
+def build_asset_bundle(data_dir=DATA_DIR, bundle_dir=None):
+    """data_dir의 CSV를 전부 번들로 변환. 없는 CSV는 건너뜀."""
+    data_dir = Path(data_dir)
+    bundle_dir = Path(bundle_dir) if bundle_dir is not None else data_dir / "bundle"
+
+    built = []
+    for name, dtype in BUNDLE_TABLES.items():
+        csv_path = data_dir / name
+        if not csv_path.exists():
+            print(f"[skip] {name} 없음")
+            continue
+        df = pd.read_csv(csv_path, dtype=dtype)
+        out_dir = write_table_bundle(df, csv_path, bundle_dir)
+        print(f"[ok] {name} → {out_dir} ({len(df)} rows)")
+        built.append(out_dir)
+
+    for build in (build_pnu_spatial_bundle, build_jibun_index_bundle):
+        out_dir = build(data_dir, bundle_dir)
+        if out_dir is not None:
+            built.append(out_dir)
+
+    # Track B mu / sigma 추정치 (MD1에 거래가 컬럼이 있을 때만)
+    import market_params
+
+    if market_params.build_market_params(data_dir / "MD1_final.csv", bundle_dir) is not None:
+        built.append(market_params.market_params_path(bundle_dir))
+    return built
+
+
+def build_pnu_spatial_bundle(data_dir=DATA_DIR, bundle_dir=None, new_lease_rows=None):
+    """
+    PNU별 공간 변수(nearby_auction_1km / local_morans_i) 파생 테이블 빌드.
+    new_lease_rows=N이면 MD2_final.csv의 마지막 N행만 새로 추가된 것으로 보고,
+    기존 테이블에서 영향받는 PNU만 재계산.
+    """
+    import tracka_final as ta
+
+    data_dir = Path(data_dir)
+    lease_csv, location_csv = data_dir / "MD2_final.csv", data_dir / "PNU_location.csv"
+    table_path = data_dir / ta.PNU_SPATIAL_TABLE
+    if not (lease_csv.exists() and location_csv.exists()):
+        print(f"[skip] {ta.PNU_SPATIAL_TABLE} (MD2_final.csv / PNU_location.csv 필요)")
+        return None
+
+    df_lease = pd.read_csv(lease_csv, dtype=BUNDLE_TABLES["MD2_final.csv"])
+    pnu_location = pd.read_csv(location_csv, dtype=BUNDLE_TABLES["PNU_location.csv"])
+    spatial_index = ta.build_lease_spatial_index(df_lease)
+
+    previous_dir = table_dir(table_path, bundle_dir)
+    if new_lease_rows and (previous_dir / "manifest.json").exists():
+        previous = read_table_bundle(table_path, bundle_dir, mmap=False)
+        features, affected = ta.update_pnu_spatial_features(
+            previous, pnu_location, spatial_index, df_lease.iloc[len(df_lease) - int(new_lease_rows):]
+        )
+        note = f"{len(affected)} PNU 재계산"
+    else:
+        features = ta.build_pnu_spatial_features(pnu_location, spatial_index)
+        note = "전체 계산"
+
+    out_dir = write_table_bundle(features, table_path, bundle_dir, sources=[lease_csv, location_csv])
+    print(f"[ok] {ta.PNU_SPATIAL_TABLE} → {out_dir} ({len(features)} PNU, {note})")
+    return out_dir
+
+
+def build_jibun_index_bundle(data_dir=DATA_DIR, bundle_dir=None):
+    """지번 자동완성 / 사전 검증 색인 (MD1 PNU ∩ PNU_location) 빌드"""
+    import tracka_final as ta
+
+    data_dir = Path(data_dir)
+    trade_csv, location_csv = data_dir / "MD1_final.csv", data_dir / "PNU_location.csv"
+    table_path = data_dir / ta.JIBUN_INDEX_TABLE
+    if not (trade_csv.exists() and location_csv.exists()):
+        print(f"[skip] {ta.JIBUN_INDEX_TABLE} (MD1_final.csv / PNU_location.csv 필요)")
+        return None
+
+    index = ta.build_jibun_index(
+        pd.read_csv(trade_csv, dtype=BUNDLE_TABLES["MD1_final.csv"]),
+        pd.read_csv(location_csv, dtype=BUNDLE_TABLES["PNU_location.csv"]),
+    )
+    out_dir = write_table_bundle(index, table_path, bundle_dir, sources=[trade_csv, location_csv])
+    # 입력 화면 자동완성용 정렬 키 (tracka_final.load_jibun_keys: manifest / 원본 해시 없이 이 파일만 읽음)
+    keys = index["main"].to_numpy(dtype=np.int64) * 10000 + index["sub"].to_numpy(dtype=np.int64)
+    np.save(out_dir / ta.JIBUN_KEYS_FILE, keys)
+    ta.load_jibun_keys.cache_clear()
+    print(f"[ok] {ta.JIBUN_INDEX_TABLE} → {out_dir} ({len(index)} 지번)")
+    return out_dir
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="CSV → 컬럼형 번들 + 파생 테이블 빌드")
+    parser.add_argument(
+        "--new-lease-rows", type=int, default=None,
+        help="MD2_final.csv 끝에 새로 붙은 행 수 (PNU별 공간 변수를 증분 갱신)",
+    )
+    args = parser.parse_args()
+
+    if args.new_lease_rows:
+        build_pnu_spatial_bundle(new_lease_rows=args.new_lease_rows)
+    else:
+        build_asset_bundle()
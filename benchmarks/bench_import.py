@@ -0,0 +1,72 @@
+# bench_import.py
+# ============================================================
+# import 비용 측정: 새 프로세스에서 모듈 import 시간 + 딸려 들어온 무거운 모듈 확인
+#   python benchmarks/bench_import.py          # 측정 + 예산 초과 시 exit 1
+# ============================================================
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+# 입력 화면이 뜨기 전에 필요한 모듈들의 import 예산 (초)
+IMPORT_BUDGET_S = {
+    "tracka_final": 0.05,
+    "trackb_final": 0.05,
+    "jeonse_ratio": 0.05,
+    "juso_index": 0.05,
+}
+
+# import 뒤 입력 화면에서 바로 불리는 경로: 무거운 모듈 없이 끝나야 함 (시간 예산 포함)
+CALL_BUDGET_S = {
+    "juso_index.load_juso_index (색인 없음)": (
+        "juso_index", "juso_index.load_juso_index(bundle_dir='/nonexistent-bundle')", 0.05,
+    ),
+}
+
+# import 시점에 로드되면 안 되는 모델링 스택
+HEAVY_MODULES = ["numpy", "pandas", "scipy", "statsmodels", "sklearn", "joblib"]
+
+_PROBE = """
+import json, sys, time
+t = time.perf_counter()
+import {module}
+{call}
+elapsed = time.perf_counter() - t
+print(json.dumps({{"elapsed": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure_import(module, repeat=3, call=""):
+    """새 인터프리터에서 repeat번 import (+ call 실행) → (최소 시간, 로드된 무거운 모듈 목록)"""
+    best, loaded = float("inf"), []
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(module=module, call=call, heavy=HEAVY_MODULES)],
+            cwd=BASE_DIR, capture_output=True, text=True, check=True,
+        )
+        res = json.loads(proc.stdout.strip().splitlines()[-1])
+        best = min(best, res["elapsed"])
+        loaded = res["loaded"]
+    return best, loaded
+
+
+def main():
+    ok = True
+    probes = [(module, module, "", budget) for module, budget in IMPORT_BUDGET_S.items()]
+    probes += [(label, module, call, budget) for label, (module, call, budget) in CALL_BUDGET_S.items()]
+    for label, module, call, budget in probes:
+        elapsed, loaded = measure_import(module, call=call)
+        within = elapsed <= budget and not loaded
+        ok &= within
+        print(
+            f"{'OK  ' if within else 'FAIL'} {label:<14} {elapsed * 1000:8.1f} ms "
+            f"(budget {budget * 1000:.0f} ms) heavy={loaded or '-'}"
+        )
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
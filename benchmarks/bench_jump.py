@@ -0,0 +1,78 @@
+# bench_jump.py
+# ============================================================
+# Merton 점프-확산(pd_el_merton) vs GBM 폐형식(pd_gbm_closed_form + expected_loss_closed_form)
+# - 비용: 행 수 / 점프 강도(lam → 포아송 급수 항 수)별 시간
+# - 꼬리: 같은 총 분산에서 전세가율별 PD 비교
+#   python benchmarks/bench_jump.py
+# ============================================================
+
+import sys
+import time
+from math import sqrt
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import trackb_final as tb  # noqa: E402
+
+SIZES = [10_000, 100_000, 1_000_000]
+LAMBDAS = [0.1, 0.5, 2.0]
+
+
+def best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t)
+    return best
+
+
+def jump_with(lam):
+    """lam만 바꾸고 총 로그분산은 SIGMA_ANNUAL^2로 유지"""
+    jump = dict(tb.JUMP_PARAMS, lam=lam)
+    sigma = sqrt(tb.SIGMA_ANNUAL**2 - lam * (jump["mu_j"] ** 2 + jump["delta"] ** 2))
+    return jump, sigma
+
+
+def cost():
+    rng = np.random.default_rng(0)
+    mu, alpha = tb.MU_ANNUAL, tb.ALPHA_USED
+    print(f"[cost] {'n':>10} {'model':>14} {'terms':>6} {'PD+EL':>10} {'vs GBM':>7}")
+    for n in SIZES:
+        V0 = rng.uniform(10_000, 80_000, n)
+        B = V0 * rng.uniform(0.5, 1.2, n)
+        T = rng.choice([1.0, 2.0, 3.0, 4.0], n)
+        repeat = 5 if n <= 100_000 else 2
+
+        t_gbm = best_of(lambda: (
+            tb.pd_gbm_closed_form(V0, B, T, mu, tb.SIGMA_ANNUAL),
+            tb.expected_loss_closed_form(V0, B, T, mu, tb.SIGMA_ANNUAL, alpha),
+        ), repeat)
+        print(f"[cost] {n:>10,} {'gbm':>14} {1:>6} {t_gbm * 1e3:>7.1f} ms {1.0:>6.1f}x")
+
+        for lam in LAMBDAS:
+            jump, sigma = jump_with(lam)
+            terms = tb._poisson_n_max(lam * T.max()) + 1
+            t_jump = best_of(lambda: tb.pd_el_merton(V0, B, T, mu, sigma, alpha, jump), repeat)
+            print(f"[cost] {n:>10,} {f'merton lam={lam}':>14} {terms:>6} {t_jump * 1e3:>7.1f} ms {t_jump / t_gbm:>6.1f}x")
+
+
+def tail():
+    ratios = np.array([0.3, 0.5, 0.7, 0.9, 1.1])
+    V0, T = np.full(ratios.shape, 30_000.0), np.full(ratios.shape, 2.0)
+    B = V0 * ratios
+    print("[tail] T=2, 총 분산 동일: 전세가율별 PD (GBM vs Merton)")
+    pd_gbm = tb.pd_gbm_closed_form(V0, B, T, tb.MU_ANNUAL, tb.SIGMA_ANNUAL)
+    print(f"  {'B/V0':>6} " + " ".join(f"{r:>9.1f}" for r in ratios))
+    print(f"  {'gbm':>6} " + " ".join(f"{p:>9.2e}" for p in pd_gbm))
+    for lam in LAMBDAS:
+        jump, sigma = jump_with(lam)
+        p = tb.pd_merton_closed_form(V0, B, T, tb.MU_ANNUAL, sigma, jump)
+        print(f"  {f'λ={lam}':>6} " + " ".join(f"{x:>9.2e}" for x in p))
+
+
+if __name__ == "__main__":
+    cost()
+    tail()
@@ -0,0 +1,128 @@
+# bench_juso.py
+# ============================================================
+# 주소 검색 부하 테스트 (네트워크 없이): 합성 주소 N건 → 로컬 색인 + JUSO 대역 서버
+# - local  : juso_index.local_search 직접 호출
+# - fresh  : 요청마다 requests.get (기존 juso_search 방식, 매번 새 연결)
+# - pooled : juso_index.remote_search (keep-alive 세션, 캐시 / 선조회 없이 순수 전송 비용)
+# - paging : 1 → 2 → 3 페이지 넘김에서 선조회 유무 비교
+#   python benchmarks/bench_juso.py
+# ============================================================
+
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import juso_index as ji  # noqa: E402
+
+N_RECORDS = 50_000
+N_QUERIES = 400
+THREADS = [1, 4, 16]
+SERVER_DELAY = 0.02        # 대역 서버 응답 지연 (원격 API 왕복 흉내, 초)
+ROADS = ["화곡로", "강서로", "까치산로", "초록마을로", "곰달래로", "화곡로1길", "우장산로", "등촌로", "공항대로"]
+EMDS = ["화곡동", "등촌동", "내발산동", "가양동"]
+
+
+def synthetic_export(n, seed=0):
+    """주소DB 레이아웃(JUSO_EXPORT_COLUMNS)의 합성 행"""
+    rng = np.random.default_rng(seed)
+    sub = rng.choice(["0", "0", "0", "1", "2", "12"], n)
+    name = np.where(rng.random(n) < 0.3, np.char.add("OO빌라", rng.integers(1, 40, n).astype(str)), "")
+    df = pd.DataFrame({c: "" for c in ji.JUSO_EXPORT_COLUMNS}, index=range(n))
+    df["bdMgtSn"] = [f"11500{i:020d}" for i in range(n)]
+    df["siNm"], df["sggNm"], df["mtYn"], df["udrtYn"] = "서울특별시", "강서구", "0", "0"
+    df["emdNm"] = rng.choice(EMDS, n)
+    df["rn"] = rng.choice(ROADS, n)
+    df["buldMnnm"] = rng.integers(1, 400, n).astype(str)
+    df["buldSlno"] = sub
+    df["lnbrMnnm"] = rng.integers(1, 1200, n).astype(str)
+    df["lnbrSlno"] = sub
+    df["zipNo"] = np.char.add("07", rng.integers(500, 800, n).astype(str))
+    df["bdNm"] = name
+    df["bdKdcd"] = np.where(name != "", "1", "0")
+    return df
+
+
+def queries(n, seed=1):
+    rng = np.random.default_rng(seed)
+    return [
+        f"{ROADS[rng.integers(len(ROADS))]} {rng.integers(1, 400)}" if rng.random() < 0.7
+        else f"{EMDS[rng.integers(len(EMDS))]} {rng.integers(1, 1200)}"
+        for _ in range(n)
+    ]
+
+
+def start_server(index, delay):
+    server = ji.make_juso_server(index, port=0)
+    handler = server.RequestHandlerClass
+    do_get = handler.do_GET
+
+    def slow_get(self):
+        time.sleep(delay)
+        do_get(self)
+
+    handler.do_GET = slow_get
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/addrlink/addrLinkApi.do"
+
+
+def fresh_get(url, q, page=1):
+    params = {"confmKey": ji.JUSO_API_KEY, "currentPage": str(page), "countPerPage": "10", "keyword": q, "resultType": "json"}
+    r = requests.get(url, params=params, timeout=6)
+    r.raise_for_status()
+    return ji.parse_juso_response(r.json(), page, 10)
+
+
+def run(label, fn, qs, threads):
+    t = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        lat = list(pool.map(lambda q: _timed(fn, q), qs))
+    dt = time.perf_counter() - t
+    lat = np.array(lat) * 1e3
+    print(
+        f"  {label:>7} threads={threads:>2}: {len(qs) / dt:>8,.0f} q/s  "
+        f"p50 {np.percentile(lat, 50):6.2f} ms  p95 {np.percentile(lat, 95):6.2f} ms"
+    )
+
+
+def _timed(fn, q):
+    t = time.perf_counter()
+    fn(q)
+    return time.perf_counter() - t
+
+
+def paging(url, q, prefetch):
+    ji._page_cache.clear()
+    out = []
+    for page in (1, 2, 3):
+        t = time.perf_counter()
+        ji.remote_search(q, page, 10, url=url, prefetch=prefetch)
+        out.append((time.perf_counter() - t) * 1e3)
+        time.sleep(0.05)          # 사용자가 결과를 보는 시간
+    return out
+
+
+if __name__ == "__main__":
+    t = time.perf_counter()
+    index = ji.make_juso_index(ji.juso_records(synthetic_export(N_RECORDS)))
+    print(f"[juso] {N_RECORDS:,} 주소, 토큰 {len(index['vocab']):,}개, 색인 {time.perf_counter() - t:.2f} s")
+    qs = queries(N_QUERIES)
+
+    server, url = start_server(index, SERVER_DELAY)
+    print(f"[juso] 대역 서버 {url} (응답 지연 {SERVER_DELAY * 1e3:.0f} ms)")
+    for threads in THREADS:
+        run("local", lambda q: ji.local_search(index, q, 1, 10), qs, threads)
+        run("fresh", lambda q: fresh_get(url, q), qs, threads)
+        run("pooled", lambda q: ji.remote_search(q, 1, 10, url=url, prefetch=False), qs, threads)
+        ji._page_cache.clear()
+
+    for prefetch in (False, True):
+        ms = paging(url, "화곡로", prefetch)
+        print(f"  paging prefetch={prefetch!s:>5}: " + " → ".join(f"{m:.1f} ms" for m in ms))
+    server.shutdown()
@@ -0,0 +1,88 @@
+# bench_mc.py
+# ============================================================
+# trackb_mc.mc_gbm vs 폐형식(pd_gbm_closed_form / expected_loss_closed_form)
+# - 수렴: SCENARIOS별 경로 수 증가에 따른 오차 / 표준오차 (plain / antithetic / sobol)
+# - 처리량: (매물 × 경로)/초, 프로세스 수별 확장
+#   python benchmarks/bench_mc.py
+# ============================================================
+
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import trackb_final as tb  # noqa: E402
+import trackb_mc as mc  # noqa: E402
+
+N_LISTINGS = 100
+PATHS = [2**10, 2**13, 2**16, 2**18]
+METHODS = {
+    "plain": dict(antithetic=False),
+    "antithetic": dict(antithetic=True),
+    "sobol": dict(antithetic=False, sobol=True),
+}
+
+
+def sample_listings(n, seed=0):
+    rng = np.random.default_rng(seed)
+    V0 = rng.uniform(10_000, 80_000, n)
+    B = V0 * rng.uniform(0.5, 1.2, n)
+    T = rng.choice([1.0, 2.0, 3.0, 4.0], n)
+    return V0, B, T
+
+
+def closed_form(V0, B, T, shock):
+    V0_s = V0 * (1.0 + shock)
+    return (
+        tb.pd_gbm_closed_form(V0_s, B, T, tb.MU_ANNUAL, tb.SIGMA_ANNUAL),
+        tb.expected_loss_closed_form(V0_s, B, T, tb.MU_ANNUAL, tb.SIGMA_ANNUAL, tb.ALPHA_USED),
+    )
+
+
+def convergence(V0, B, T):
+    print(f"[convergence] {N_LISTINGS} listings, 오차 = MC - 폐형식 (매물 평균 RMSE), se = 평균 표준오차")
+    print(f"  {'scenario':>9} {'method':>10} {'paths':>8} {'PD rmse':>9} {'PD se':>9} {'EL rmse':>9} {'EL se':>9} {'|z|>3':>6}")
+    for s_name, shock in tb.SCENARIOS.items():
+        pd_ref, el_ref = closed_form(V0, B, T, shock)
+        for m_name, kw in METHODS.items():
+            for n_paths in PATHS:
+                r = mc.mc_gbm(V0, B, T, shock=shock, n_paths=n_paths, seed=1, **kw)
+                pd_err, el_err = r["PD"] - pd_ref, r["EL"] - el_ref
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    z = np.abs(el_err / r["EL_se"])
+                print(
+                    f"  {s_name:>9} {m_name:>10} {r['n_paths']:>8} "
+                    f"{np.sqrt(np.mean(pd_err**2)):>9.2e} {np.mean(r['PD_se']):>9.2e} "
+                    f"{np.sqrt(np.mean(el_err**2)):>9.2e} {np.mean(r['EL_se']):>9.2e} {int(np.sum(z > 3)):>6}"
+                )
+
+
+def throughput(V0, B, T):
+    n_paths = PATHS[-1]
+    t = time.perf_counter()
+    for _ in range(100):
+        closed_form(V0, B, T, 0.0)
+    t_cf = (time.perf_counter() - t) / 100
+    print(f"[throughput] 폐형식: {N_LISTINGS / t_cf:,.0f} 매물/s")
+
+    for m_name, kw in METHODS.items():
+        mc.mc_gbm(V0[:2], B[:2], T[:2], n_paths=1024, **kw)   # import / 워밍업
+        t = time.perf_counter()
+        r = mc.mc_gbm(V0, B, T, n_paths=n_paths, **kw)
+        dt = time.perf_counter() - t
+        print(f"[throughput] MC {m_name:>10}: {N_LISTINGS * r['n_paths'] / dt:,.0f} 매물·경로/s ({dt:.2f} s)")
+
+    for n_jobs in sorted({1, 2, min(4, os.cpu_count() or 1)}):
+        t = time.perf_counter()
+        r = mc.mc_gbm(V0, B, T, n_paths=4 * n_paths, n_jobs=n_jobs)
+        dt = time.perf_counter() - t
+        print(f"[throughput] n_jobs={n_jobs}: {N_LISTINGS * r['n_paths'] / dt:,.0f} 매물·경로/s ({dt:.2f} s)")
+
+
+if __name__ == "__main__":
+    V0, B, T = sample_listings(N_LISTINGS)
+    convergence(V0, B, T)
+    throughput(V0, B, T)
@@ -0,0 +1,103 @@
+# bench_norm_cdf.py
+# ============================================================
+# trackb_final.norm_cdf / norm_logcdf: 정확도(mpmath 기준) + 속도(기존 np.vectorize(erf) 대비)
+#   python benchmarks/bench_norm_cdf.py
+# ============================================================
+
+import sys
+import time
+from math import erf, sqrt
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import trackb_final as tb  # noqa: E402
+
+SIZES = [1_000, 100_000, 10_000_000]
+
+
+def norm_cdf_vectorize(x):
+    """기존 구현 (파이썬 레벨 루프)"""
+    return 0.5 * (1.0 + np.vectorize(erf)(x / sqrt(2.0)))
+
+
+def best_of(fn, x, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn(x)
+        best = min(best, time.perf_counter() - t)
+    return best
+
+
+def with_backend(backend, fn):
+    def run(x):
+        prev, tb.NORM_CDF_BACKEND = tb.NORM_CDF_BACKEND, backend
+        try:
+            return fn(x)
+        finally:
+            tb.NORM_CDF_BACKEND = prev
+    return run
+
+
+BACKENDS = ["numpy"] + (["auto"] if tb._get_scipy_special() is not None else [])
+
+
+def accuracy(backend):
+    try:
+        import mpmath as mp
+    except ImportError:
+        print("[accuracy] mpmath 없음, 생략 (pip install mpmath)")
+        return
+
+    mp.mp.dps = 40
+    ranges = [(-5.0, 0.0), (-37.0, -5.0), (0.0, 10.0)]
+    norm_cdf = with_backend(backend, tb.norm_cdf)
+    norm_logcdf = with_backend(backend, tb.norm_logcdf)
+    print(f"[accuracy:{backend}] norm_cdf vs mpmath.ncdf")
+    for lo, hi in ranges:
+        x = np.linspace(lo, hi, 20001)
+        ref = np.array([float(mp.ncdf(v)) for v in x])
+        got = norm_cdf(x)
+        old = norm_cdf_vectorize(x)
+        if hi <= 0:
+            err_new = np.max(np.abs(got - ref) / ref)
+            err_old = np.max(np.abs(old - ref) / ref)
+            kind = "rel"
+        else:
+            err_new = np.max(np.abs(got - ref))
+            err_old = np.max(np.abs(old - ref))
+            kind = "abs"
+        print(f"  x in [{lo:>6}, {hi:>5}] max {kind} err: new {err_new:.2e}  old {err_old:.2e}")
+
+    # x > 0은 log1p(-Φ(-x))로 기준값 계산 (1 - Φ(-x)의 자릿수 손실 방지)
+    mp.mp.dps = 50
+    print(f"[accuracy:{backend}] norm_logcdf vs mpmath")
+    for lo, hi in [(-1e4, 0.0), (0.0, 8.0), (8.0, 37.0)]:
+        x = np.linspace(lo, hi, 20001)
+        ref = np.array([float(mp.log(mp.ncdf(v)) if v <= 0 else mp.log1p(-mp.ncdf(-v))) for v in x])
+        got = norm_logcdf(x)
+        print(f"  x in [{lo:>6}, {hi:>5}] max rel err: {np.max(np.abs(got - ref) / np.abs(ref)):.2e}")
+
+
+def speed():
+    rng = np.random.default_rng(0)
+    print(f"[speed] {'backend':>7} {'n':>10} {'vectorize(erf)':>16} {'norm_cdf':>12} {'norm_logcdf':>12} {'speedup':>8}")
+    for n in SIZES:
+        x = rng.normal(scale=2.0, size=n)
+        repeat = 5 if n <= 100_000 else 1
+        t_old = best_of(norm_cdf_vectorize, x, repeat)
+        for backend in BACKENDS:
+            t_new = best_of(with_backend(backend, tb.norm_cdf), x, repeat)
+            t_log = best_of(with_backend(backend, tb.norm_logcdf), x, repeat)
+            print(
+                f"[speed] {backend:>7} {n:>10,} {t_old * 1e3:>13.2f} ms {t_new * 1e3:>9.2f} ms "
+                f"{t_log * 1e3:>9.2f} ms {t_old / t_new:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    for backend in BACKENDS:
+        accuracy(backend)
+    speed()
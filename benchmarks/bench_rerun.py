@@ -0,0 +1,125 @@
+# bench_rerun.py
+# ============================================================
+# Streamlit 재실행 비용 (서버 쪽): 위젯 상호작용 1회당 스크립트 실행 시간
+# - full     : 스크립트 전체 재실행 (fragment 도입 전에는 모든 상호작용이 이 비용)
+# - fragment : fragment 함수 본문만 (도입 후 토글 / PDF / 주소 선택이 치르는 비용)
+# streamlit.testing.v1.AppTest는 fragment 안 클릭도 전체를 다시 돌리므로,
+# st.fragment를 감싸 본문 시간만 따로 잼 (fragment 재실행의 프레임워크 오버헤드는 제외)
+#   python benchmarks/bench_rerun.py [--data-dir DIR] [--app scam_streamlit.py] 2>/dev/null
+# ============================================================
+
+import argparse
+import statistics
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+import tracka_final as ta  # noqa: E402
+import trackb_final as tb  # noqa: E402
+
+REPEAT = 7
+TIMEOUT = 120
+DEMO_LISTINGS = [          # 입력 페이지의 추천 데이터셋 (지번, 면적, 층, 보증금)
+    ("366-50", 29.94, 4, 27000),
+    ("1040-24", 72.09, 3, 31000),
+    ("94-1", 59.72, 2, 17000),
+    ("50-120", 43.92, 3, 12500),
+]
+
+fragment_times = defaultdict(list)
+_fragment = st.fragment
+
+
+def timed_fragment(func=None, **kwargs):
+    """st.fragment 대체: 본문 실행 시간을 함수 이름별로 기록"""
+    if func is None:
+        return lambda f: timed_fragment(f, **kwargs)
+
+    def body(*args, **kw):
+        t = time.perf_counter()
+        try:
+            return func(*args, **kw)
+        finally:
+            fragment_times[func.__name__].append(time.perf_counter() - t)
+
+    body.__name__ = func.__name__
+    return _fragment(body, **kwargs)
+
+
+def demo_inputs():
+    """첫 번째로 예측 가능한 추천 데이터셋 → 결과 / 상세 페이지가 쓰는 session_state.inputs"""
+    listing = next((d for d in DEMO_LISTINGS if ta.is_known_jibun(d[0])), None)
+    if listing is None:
+        listing = (ta.suggest_jibun("1")[0], 59.5, 3, 20000)
+    jibun, area, floor, deposit = listing
+    resA, commentsA = ta.predict_final_cached(jibun, area, floor, deposit, disk=False)
+    market = tb.load_market_params()
+    res = tb.trackB_evaluate(
+        V0=float(resA["V0"]), B=float(deposit), T=2.0,
+        mu=market["MU_ANNUAL"], sigma=market["SIGMA_ANNUAL"], mu_before=market["MU_HAT"],
+    )
+    return {
+        "JIBUN": jibun, "AREA_M2": float(area), "FLOOR": f"{floor}층", "FLOOR_NUM": floor,
+        "DEPOSIT": int(deposit), "ROAD_ADDR": f"서울특별시 강서구 화곡동 {jibun}", "ZIPNO": "",
+        "CONTRACT_YEARS": 2, "V0": float(resA["V0"]),
+        "STRUCTURAL_RISK_RESULT": resA, "STRUCTURAL_RISK_COMMENTS": commentsA,
+        "MARKET_RISK_RESULT": res["row"], "JEONSE_RATIO": float(res["row"]["jeonse_ratio"]),
+    }
+
+
+def make_app(app_path, page, inputs, state=None):
+    at = AppTest.from_file(str(app_path), default_timeout=TIMEOUT)
+    at.session_state["page"] = page
+    at.session_state["inputs"] = dict(inputs)
+    for k, v in (state or {}).items():
+        at.session_state[k] = v
+    return at.run()
+
+
+def measure(label, app_path, page, inputs, interact, fragment_name, state=None):
+    """interact(at) 뒤 재실행 REPEAT회: 전체 실행 시간과 그중 fragment 본문 시간 (중앙값, ms)"""
+    at = make_app(app_path, page, inputs, state)
+    interact(at).run()       # 첫 상호작용 (지연 import / 캐시 채우기)
+    full = []
+    for _ in range(REPEAT):
+        fragment_times.clear()
+        t = time.perf_counter()
+        interact(at).run()
+        full.append(time.perf_counter() - t)
+        if at.exception:
+            raise RuntimeError(f"{label}: {at.exception[0].message}")
+    frag = fragment_times.get(fragment_name, [])
+    full_ms = statistics.median(full) * 1e3
+    frag_ms = statistics.median(frag) * 1e3 if frag else float("nan")
+    print(f"  {label:<28} full {full_ms:8.1f} ms   fragment {frag_ms:8.2f} ms   (x{full_ms / frag_ms:,.0f})")
+
+
+def click(key):
+    return lambda at: at.button(key=key).click()
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--data-dir", help="MD CSV / 모델이 있는 폴더 (기본: tracka_final.DATA_DIR)")
+    ap.add_argument("--app", default=str(ROOT / "scam_streamlit.py"))
+    args = ap.parse_args()
+    if args.data_dir:
+        ta.DATA_DIR = Path(args.data_dir)
+
+    st.fragment = timed_fragment
+    inputs = demo_inputs()
+    print(f"[rerun] {args.app} / 지번 {inputs['JIBUN']} / 반복 {REPEAT}회 중앙값")
+
+    queries = iter(["10", "104", "1041", "36"] * REPEAT)
+    measure("input: 지번 자동완성 입력", args.app, "input", {}, lambda at: at.text_input(key="jibun_query_input").input(next(queries)),
+            "render_address_picker", state={"addr_open": True})
+    measure("result: PDF 보고서 생성", args.app, "result", inputs, click("pdf_report"), "render_pdf_download")
+    measure("structural: 계산 과정 토글", args.app, "structural_risk", inputs, click("toggle_tracka_calc"), "render_calc_explainer")
+    measure("market: 계산 과정 토글", args.app, "market_risk", inputs, click("toggle_trackb_calc"), "render_calc_explainer")
+    print(f"[rerun] Track B 메모 {tb.trackB_memo_info()}")
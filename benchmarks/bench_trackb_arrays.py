@@ -0,0 +1,104 @@
+# bench_trackb_arrays.py
+# ============================================================
+# add_trackB_risk_columns: 기존(열 하나씩 대입 + 재추출) vs 배열 코어(trackB_risk_arrays) 래퍼
+# - 결과 일치 확인, 처리량(행/초), tracemalloc 최대 메모리
+#   python benchmarks/bench_trackb_arrays.py [행 수 ...]
+# ============================================================
+
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import trackb_final as tb  # noqa: E402
+
+SIZES = [100_000, 1_000_000, 5_000_000]
+
+
+def add_trackB_risk_columns_legacy(
+    df, v0_col="hedonic_price", b_col="deposit", t_col="term",
+    mu=tb.MU_ANNUAL, sigma=tb.SIGMA_ANNUAL, alpha=tb.ALPHA_USED, scenarios=tb.SCENARIOS,
+):
+    """기존 구현 (df 복사 + 열 하나씩 대입 + PD/EL 재추출)"""
+    out = df.copy()
+    V0 = pd.to_numeric(out[v0_col], errors="coerce").to_numpy(dtype=float)
+    B = pd.to_numeric(out[b_col], errors="coerce").to_numpy(dtype=float)
+    out[t_col] = pd.to_numeric(out[t_col], errors="coerce")
+    out["T_years"] = out[t_col]
+    T = out["T_years"].to_numpy(dtype=float)
+    out["jeonse_ratio"] = np.where((V0 > 0) & np.isfinite(V0) & np.isfinite(B), B / V0, np.nan)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for s_name, shock in scenarios.items():
+            V0_s = V0 * (1.0 + shock)
+            V0_s = np.where(V0_s > 0, V0_s, np.nan)
+            out[f"PD_{s_name}"] = tb.pd_gbm_closed_form(V0_s, B, T, mu, sigma)
+            out[f"EL_{s_name}"] = tb.expected_loss_closed_form(V0_s, B, T, mu, sigma, alpha)
+            PD_arr = out[f"PD_{s_name}"].to_numpy(dtype=float)
+            EL_arr = out[f"EL_{s_name}"].to_numpy(dtype=float)
+            out[f"LGD_{s_name}"] = np.where(
+                (PD_arr > 1e-12) & np.isfinite(PD_arr) & np.isfinite(EL_arr), EL_arr / PD_arr, 0.0
+            )
+            out[f"PD_fp_{s_name}"] = tb.pd_first_passage_closed_form(V0_s, B, T, mu, sigma)
+            out[f"EL_fp_{s_name}"] = tb.expected_loss_first_passage(V0_s, B, T, mu, sigma, alpha)
+    return out
+
+
+def sample_frame(n, seed=0):
+    rng = np.random.default_rng(seed)
+    V0 = rng.uniform(10_000, 80_000, n)
+    return pd.DataFrame({
+        "hedonic_price": V0,
+        "deposit": V0 * rng.uniform(0.5, 1.2, n),
+        "term": rng.choice([1.0, 2.0, 3.0, 4.0], n),
+    })
+
+
+def measure(fn):
+    tracemalloc.start()
+    t = time.perf_counter()
+    result = fn()
+    dt = time.perf_counter() - t
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, dt, peak / 2**20
+
+
+def main(sizes):
+    tb.add_trackB_risk_columns(sample_frame(1_000))   # scipy import 등 워밍업
+    print(f"{'n':>10} {'variant':>16} {'time':>8} {'rows/s':>12} {'peak MB':>9} {'max abs diff':>13}")
+    for n in sizes:
+        df = sample_frame(n)
+        ref, t_ref, m_ref = measure(lambda: add_trackB_risk_columns_legacy(df))
+        print(f"{n:>10,} {'legacy':>16} {t_ref:>7.2f}s {n / t_ref:>12,.0f} {m_ref:>9.0f} {'-':>13}")
+
+        names = tb.trackB_output_names()
+        variants = {
+            "wrapper f64": lambda: tb.add_trackB_risk_columns(df),
+            "wrapper f32": lambda: tb.add_trackB_risk_columns(df, dtype=np.float32),
+            "arrays f64": lambda: tb.trackB_risk_arrays(
+                df["hedonic_price"].to_numpy(), df["deposit"].to_numpy(), df["term"].to_numpy()
+            ),
+        }
+        # 미리 할당된 버퍼에 다시 쓰는 경우 (버퍼 할당은 측정에서 제외)
+        buffers = {k: np.empty(n) for k in names}
+        variants["arrays prealloc"] = lambda: tb.trackB_risk_arrays(
+            df["hedonic_price"].to_numpy(), df["deposit"].to_numpy(), df["term"].to_numpy(), out=buffers
+        )
+
+        for label, fn in variants.items():
+            got, dt, mem = measure(fn)
+            diff = max(
+                float(np.nanmax(np.abs(np.asarray(got[k], dtype=float) - ref[k].to_numpy())))
+                for k in names
+            )
+            print(f"{n:>10,} {label:>16} {dt:>7.2f}s {n / dt:>12,.0f} {mem:>9.0f} {diff:>13.2e}")
+            del got
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or SIZES)
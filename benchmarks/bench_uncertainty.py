@@ -0,0 +1,56 @@
+# bench_uncertainty.py
+# ============================================================
+# trackb_final.trackB_param_quantiles: 매물 × (mu, sigma) 표본 분위수
+# - 표본 수 / 청크 크기별 처리량과 최대 메모리 (tracemalloc)
+# - 분위수 폭: 표본 수가 늘 때 PD 90% 범위가 수렴하는지
+#   python benchmarks/bench_uncertainty.py
+# ============================================================
+
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import trackb_final as tb  # noqa: E402
+
+N_LISTINGS = 20_000
+DRAWS = [100, 1000, 4000]
+CHUNKS = [1 << 18, 1 << 20, 1 << 22]
+
+
+def sample_listings(n, seed=0):
+    rng = np.random.default_rng(seed)
+    V0 = rng.uniform(10_000, 80_000, n)
+    B = V0 * rng.uniform(0.5, 1.2, n)
+    T = rng.choice([1.0, 2.0, 3.0, 4.0], n)
+    return V0, B, T
+
+
+def run(V0, B, T, draws, chunk):
+    tracemalloc.start()
+    t = time.perf_counter()
+    r = tb.trackB_param_quantiles(V0, B, T, draws["mu"], draws["sigma"], chunk_elems=chunk)
+    dt = time.perf_counter() - t
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return r, dt, peak
+
+
+if __name__ == "__main__":
+    V0, B, T = sample_listings(N_LISTINGS)
+    run(V0[:10], B[:10], T[:10], tb.load_market_param_draws(n_draws=DRAWS[0]), CHUNKS[0])   # import / 워밍업
+    print(f"[uncertainty] {N_LISTINGS:,} listings")
+    print(f"  {'draws':>6} {'chunk':>9} {'sec':>7} {'M eval/s':>9} {'peak MB':>8} {'PD90 width':>11}")
+    for n_draws in DRAWS:
+        draws = tb.load_market_param_draws(n_draws=n_draws)
+        for chunk in CHUNKS:
+            r, dt, peak = run(V0, B, T, draws, chunk)
+            width = np.nanmean(r["PD"][:, -1] - r["PD"][:, 0])
+            print(
+                f"  {n_draws:>6} {chunk:>9} {dt:>7.2f} {N_LISTINGS * n_draws / dt / 1e6:>9.1f} "
+                f"{peak / 1e6:>8.1f} {width:>11.4f}"
+            )
+    print(f"  draws source: {draws['source']}")
@@ -0,0 +1,467 @@
+# juso_index.py
+# ============================================================
+# JUSO(도로명주소) 검색: 로컬 색인 / 원격 API 풀링 클라이언트 / 부하 테스트용 대역 서버
+# - 빌드: python juso_index.py build 주소_서울특별시.txt [--sgg 강서구]  → data/bundle/juso_index/
+# - 검색: search(keyword, page, count) → scam_streamlit.juso_search와 같은 응답 dict
+#   (로컬 색인이 있으면 로컬, 없으면 원격 API. JUSO_BACKEND로 강제 가능)
+# - 원격: requests.Session 커넥션 풀 + 다음 페이지 선조회(prefetch)
+# - 대역 서버: python juso_index.py serve --port 8765  (JUSO API와 같은 경로 / 응답 JSON)
+#   → JUSO_API_URL=http://127.0.0.1:8765/addrlink/addrLinkApi.do 로 앱을 띄우면 네트워크 없이 검색
+# ============================================================
+
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+
+from lazy_import import lazy_module
+
+np = lazy_module("numpy")
+pd = lazy_module("pandas")
+
+BASE_DIR = Path(__file__).resolve().parent
+JUSO_INDEX_NAME = "juso_index"          # data/bundle/juso_index/ (asset_bundle 형식 + 토큰 색인)
+
+JUSO_API_URL = os.environ.get("JUSO_API_URL", "https://business.juso.go.kr/addrlink/addrLinkApi.do")
+JUSO_API_KEY = os.environ.get("JUSO_API_KEY", "devU01TX0FVVEgyMDI2MDIwNzE1NDI1MzExNzU3MTY=")
+JUSO_BACKEND = os.environ.get("JUSO_BACKEND", "auto")   # "auto" | "local" | "remote"
+JUSO_TIMEOUT = 6
+JUSO_MAX_COUNT = 100                    # API의 countPerPage 상한
+
+# 원격 클라이언트: 커넥션 풀 크기 / 페이지 캐시 (st.cache_data ttl=60과 같은 수명)
+JUSO_POOL_SIZE = 8
+JUSO_CACHE_TTL = 60
+JUSO_CACHE_SIZE = 256
+
+# 도로명주소 한글 전체분(주소DB) 레이아웃: '|' 구분, cp949, 헤더 없음. 이름은 API 응답 필드명에 맞춤
+JUSO_EXPORT_COLUMNS = [
+    "bdMgtSn", "admCd", "siNm", "sggNm", "emdNm", "liNm", "mtYn", "lnbrMnnm", "lnbrSlno",
+    "rnMgtSn", "rn", "udrtYn", "buldMnnm", "buldSlno", "hemdCd", "hemdNm", "zipNo",
+    "prevRoadAddr", "effectDate", "bdKdcd", "changeCd", "bdNm", "sggBdNm", "note",
+]
+JUSO_EXPORT_ENCODING = "cp949"
+
+# 색인 / 응답에 남기는 필드 (앱은 roadAddr / jibunAddr / lnbrMnnm / lnbrSlno / zipNo 사용)
+JUSO_FIELDS = [
+    "roadAddr", "roadAddrPart1", "roadAddrPart2", "jibunAddr", "zipNo", "admCd", "rnMgtSn", "bdMgtSn",
+    "bdNm", "bdKdcd", "siNm", "sggNm", "emdNm", "liNm", "rn", "udrtYn", "buldMnnm", "buldSlno",
+    "mtYn", "lnbrMnnm", "lnbrSlno",
+]
+
+# 토큰: 숫자(본번-부번 포함) 또는 숫자 아닌 글자 묶음 ("화곡로1길" → 화곡로 / 1 / 길)
+_TOKEN_RE = re.compile(r"\d+(?:-\d+)?|[^\W\d_]+")
+
+
+def juso_index_dir(bundle_dir=None):
+    return (Path(bundle_dir) if bundle_dir is not None else BASE_DIR / "data" / "bundle") / JUSO_INDEX_NAME
+
+
+def tokenize(text):
+    return _TOKEN_RE.findall(str(text).lower())
+
+
+def _response(ok, total=0, page=1, count=10, juso=None, error_code="0", error_message="정상"):
+    """juso_search 응답 모양"""
+    return {
+        "ok": ok,
+        "errorCode": error_code if not ok else "0",
+        "errorMessage": error_message,
+        "totalCount": int(total),
+        "currentPage": int(page),
+        "countPerPage": int(count),
+        "juso": juso or [],
+    }
+
+
+def parse_juso_response(data, page=1, count=10):
+    """JUSO API JSON → juso_search 응답 dict"""
+    results = data.get("results", {})
+    common = results.get("common", {})
+    juso_list = results.get("juso", []) or []
+
+    error_code = common.get("errorCode", "-999")
+    return {
+        "ok": (error_code == "0"),
+        "errorCode": error_code,
+        "errorMessage": common.get("errorMessage", "알 수 없는 오류"),
+        "totalCount": int(common.get("totalCount", "0") or "0"),
+        "currentPage": int(common.get("currentPage", page) or page),
+        "countPerPage": int(common.get("countPerPage", count) or count),
+        "juso": juso_list,
+    }
+
+
+# ==========================================
+# 로컬 색인 빌드: 주소DB → 레코드 테이블 + 토큰 역색인
+# ==========================================
+def read_juso_export(paths, sgg=None, encoding=JUSO_EXPORT_ENCODING):
+    """주소DB 파일(들) → API 필드명 컬럼의 문자열 DataFrame. sgg: 시군구명으로 제한 (예: "강서구")"""
+    frames = []
+    for path in [paths] if isinstance(paths, (str, Path)) else paths:
+        df = pd.read_csv(
+            path, sep="|", header=None, names=JUSO_EXPORT_COLUMNS, dtype=str,
+            encoding=encoding, keep_default_na=False, quoting=3,
+        )
+        if sgg is not None:
+            df = df[df["sggNm"] == sgg]
+        frames.append(df)
+    return pd.concat(frames, ignore_index=True)
+
+
+def _num(main, sub):
+    """본번 / 부번 → "12" 또는 "12-3" (부번 0 생략)"""
+    return main + np.where(sub.isin(["", "0"]), "", "-" + sub)
+
+
+def juso_records(export):
+    """
+    주소DB 행 → API 응답과 같은 필드의 레코드 (도로명 / 건물번호 순 정렬).
+    roadAddr = roadAddrPart1 + roadAddrPart2 ("(법정동, 건물명)"), jibunAddr = 시도 시군구 읍면동 (리) (산) 번지 건물명
+    """
+    df = export.fillna("").astype(str).apply(lambda s: s.str.strip())
+    df["bdNm"] = df["bdNm"].where(df["bdNm"] != "", df["sggBdNm"])
+    for col in ["lnbrSlno", "buldSlno"]:
+        df[col] = df[col].replace("", "0")
+
+    udrt = np.where(df["udrtYn"] == "1", "지하 ", "")
+    road_no = _num(df["buldMnnm"], df["buldSlno"])
+    part1 = df["siNm"] + " " + df["sggNm"] + " " + df["rn"] + " " + udrt + road_no
+
+    extra = df["emdNm"].where(df["liNm"] == "", "")              # 동 지역만 법정동명 표기
+    extra = extra + np.where((df["bdKdcd"] == "1") & (df["bdNm"] != ""), np.where(extra != "", ", ", "") + df["bdNm"], "")
+    part2 = np.where(extra != "", " (" + extra + ")", "")
+
+    jibun = (
+        df["siNm"] + " " + df["sggNm"] + " " + df["emdNm"]
+        + np.where(df["liNm"] != "", " " + df["liNm"], "")
+        + np.where(df["mtYn"] == "1", " 산 ", " ") + _num(df["lnbrMnnm"], df["lnbrSlno"])
+        + np.where(df["bdNm"] != "", " " + df["bdNm"], "")
+    )
+
+    df["roadAddrPart1"] = part1
+    df["roadAddrPart2"] = part2
+    df["roadAddr"] = part1 + part2
+    df["jibunAddr"] = jibun
+
+    order = pd.DataFrame({
+        "sgg": df["sggNm"], "rn": df["rn"],
+        "main": pd.to_numeric(df["buldMnnm"], errors="coerce"), "sub": pd.to_numeric(df["buldSlno"], errors="coerce"),
+    }).sort_values(["sgg", "rn", "main", "sub"], kind="stable").index
+    return df.loc[order, JUSO_FIELDS].reset_index(drop=True)
+
+
+def _record_tokens(text, name):
+    """
+    레코드 토큰: 주소 텍스트 토큰 + 건물명 글자 토큰과 그 접미사(2글자 이상).
+    접미사까지 넣어 두면 접두어 검색만으로 건물명 중간 일치 ("롯데" → "우장산롯데캐슬").
+    건물명 속 숫자("OO빌라12")는 넣지 않음 → 숫자 검색어는 건물번호 / 지번에만 걸림
+    """
+    tokens = set(tokenize(text))
+    for tok in tokenize(name):
+        if not tok[0].isdigit():
+            tokens.update(tok[i:] for i in range(len(tok) - 1))
+    return sorted(tokens)
+
+
+def build_token_index(records):
+    """
+    레코드 → (vocab, offsets, postings): 정렬된 토큰 사전과 CSR 역색인.
+    vocab[i]의 레코드 id = postings[offsets[i]:offsets[i+1]] (오름차순). 사전순 정렬이므로
+    접두어가 같은 토큰들의 posting은 한 구간에 붙어 있음 → 접두어 검색이 슬라이스 하나.
+    """
+    text = (
+        records["siNm"] + " " + records["sggNm"] + " " + records["emdNm"] + " " + records["liNm"] + " "
+        + records["rn"] + " " + records["zipNo"] + " "
+        + np.where(records["udrtYn"] == "1", "지하 ", "")              # roadAddr의 "지하"도 검색어로 올 수 있음
+        + _num(records["buldMnnm"], records["buldSlno"]) + " " + _num(records["lnbrMnnm"], records["lnbrSlno"])
+    )
+    pairs = (
+        pd.Series([_record_tokens(t, n) for t, n in zip(text, records["bdNm"])], index=records.index)
+        .explode()
+        .dropna()
+        .rename("token")
+        .rename_axis("id")
+        .reset_index()
+        .sort_values(["token", "id"], kind="stable")
+    )
+    tokens = pairs["token"].to_numpy(dtype=str)
+    vocab, starts = np.unique(tokens, return_index=True)
+    offsets = np.append(starts, tokens.size).astype(np.int64)
+    return vocab, offsets, pairs["id"].to_numpy(dtype=np.int32)
+
+
+def build_juso_index(paths, bundle_dir=None, sgg=None):
+    """주소DB → data/bundle/juso_index/ (레코드는 asset_bundle 컬럼 번들, 토큰 색인은 .npy 3개)"""
+    from asset_bundle import write_table_bundle
+
+    paths = [paths] if isinstance(paths, (str, Path)) else list(paths)
+    records = juso_records(read_juso_export(paths, sgg=sgg))
+    vocab, offsets, postings = build_token_index(records)
+
+    out_dir = juso_index_dir(bundle_dir)
+    # table_dir(csv_path, bundle_dir) = bundle_dir / stem 이 되도록 가상의 원본 경로를 넘김
+    write_table_bundle(records, out_dir.parent / f"{JUSO_INDEX_NAME}.csv", out_dir.parent, sources=paths)
+    np.save(out_dir / "vocab.npy", vocab)
+    np.save(out_dir / "offsets.npy", offsets)
+    np.save(out_dir / "postings.npy", postings)
+    print(f"[ok] {JUSO_INDEX_NAME} → {out_dir} ({len(records)} 주소, 토큰 {len(vocab)}개)")
+    load_juso_index.cache_clear()
+    return out_dir
+
+
+def _index_dict(records, vocab, offsets, postings):
+    """검색용 색인 dict. 응답 행은 필드별 object 배열에서 바로 dict로 (DataFrame 행 접근 없이)"""
+    records = records.fillna("")
+    return {
+        "records": records,
+        "columns": [records[f].to_numpy(dtype=object) for f in JUSO_FIELDS],
+        "vocab": vocab,
+        "offsets": offsets,
+        "postings": postings,
+    }
+
+
+def make_juso_index(records):
+    """메모리 색인 (저장 없이; 대역 서버 / 벤치마크용)"""
+    return _index_dict(records, *build_token_index(records))
+
+
+@lru_cache(maxsize=2)
+def load_juso_index(bundle_dir=None):
+    """
+    저장된 로컬 색인 (없으면 None). 토큰 색인은 memory-map.
+    파일이 없으면 asset_bundle(numpy / pandas)을 import하지 않고 바로 None (원격 검색 경로를 가볍게)
+    """
+    in_dir = juso_index_dir(bundle_dir)
+    required = ["manifest.json"] + [f"{name}.npy" for name in ["vocab", "offsets", "postings"]]
+    if not all((in_dir / name).is_file() for name in required):
+        return None
+
+    from asset_bundle import read_table_bundle
+
+    try:
+        records = read_table_bundle(in_dir.parent / f"{JUSO_INDEX_NAME}.csv", in_dir.parent, mmap=False)
+        arrays = [np.load(in_dir / f"{name}.npy", mmap_mode="r") for name in ["vocab", "offsets", "postings"]]
+    except (OSError, ValueError, KeyError):
+        return None
+    return _index_dict(records, *arrays)
+
+
+# ==========================================
+# 로컬 검색
+# ==========================================
+def _token_ids(index, token):
+    """
+    토큰 하나에 걸리는 레코드 id (정렬, 중복 없음).
+    글자 토큰은 접두어 일치, 숫자 토큰 "12"는 "12" 또는 "12-*"(부번)만 (123은 제외), "12-3"은 정확히 일치.
+    """
+    vocab, offsets, postings = index["vocab"], index["offsets"], index["postings"]
+
+    def exact(key):
+        lo, hi = np.searchsorted(vocab, key, side="left"), np.searchsorted(vocab, key, side="right")
+        return postings[offsets[lo] : offsets[hi]]
+
+    def prefix(key):
+        # numpy 문자열은 끝의 NUL을 무시하므로 상한은 U+FFFF를 붙여서
+        lo, hi = np.searchsorted(vocab, [key, key + "\uffff"], side="left")
+        return postings[offsets[lo] : offsets[hi]]
+
+    if token.isdigit():
+        return np.union1d(exact(token), prefix(token + "-"))
+    if token[0].isdigit():
+        return np.asarray(exact(token))
+    return np.unique(prefix(token))
+
+
+def local_search(index, keyword, page=1, count=10):
+    """
+    로컬 색인 검색 → juso_search와 같은 응답 dict.
+    검색어 토큰을 모두 포함하는 주소 (토큰별 id 집합의 교집합), 결과 순서는 도로명 / 건물번호 순.
+    """
+    tokens = tokenize(keyword)
+    if not tokens:
+        return _response(False, page=page, count=count, error_code="E0005", error_message="검색어가 입력되지 않았습니다.")
+    page, count = max(1, int(page)), max(1, min(int(count), JUSO_MAX_COUNT))
+
+    ids = None
+    # 짧은 접두어일수록 후보가 많으므로 긴 토큰부터 교집합
+    for tok in sorted(set(tokens), key=len, reverse=True):
+        hit = _token_ids(index, tok)
+        ids = hit if ids is None else np.intersect1d(ids, hit, assume_unique=True)
+        if ids.size == 0:
+            break
+
+    rows = ids[(page - 1) * count : page * count]
+    juso = [dict(zip(JUSO_FIELDS, values)) for values in zip(*(col[rows] for col in index["columns"]))]
+    return _response(True, total=ids.size, page=page, count=count, juso=juso)
+
+
+# ==========================================
+# 원격 API: 커넥션 풀 세션 + 다음 페이지 선조회
+# ==========================================
+_session = None
+_prefetch_pool = None
+_page_cache = OrderedDict()        # (url, key, keyword, page, count) → (시각, Future)
+_lock = threading.Lock()
+
+
+def juso_session():
+    """프로세스 공용 requests.Session (keep-alive 커넥션 풀, 연결 오류만 재시도)"""
+    global _session, _prefetch_pool
+    with _lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=2, pool_maxsize=JUSO_POOL_SIZE, max_retries=1)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+            _prefetch_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="juso-prefetch")
+        return _session
+
+
+def _fetch_page(url, key, keyword, page, count, timeout):
+    params = {
+        "confmKey": key,
+        "currentPage": str(page),
+        "countPerPage": str(count),
+        "keyword": keyword,
+        "resultType": "json",
+    }
+    r = juso_session().get(url, params=params, timeout=timeout)
+    r.raise_for_status()
+    return parse_juso_response(r.json(), page, count)
+
+
+def _cached_future(url, key, keyword, page, count, timeout, background):
+    """페이지 요청 Future (TTL 안의 같은 요청은 공유). background=True면 선조회 스레드에서 실행"""
+    cache_key = (url, key, keyword, page, count)
+    now = time.monotonic()
+    with _lock:
+        hit = _page_cache.get(cache_key)
+        if hit is not None and now - hit[0] < JUSO_CACHE_TTL and not (hit[1].done() and hit[1].exception()):
+            _page_cache.move_to_end(cache_key)
+            return hit[1], False
+
+    juso_session()
+    if background:
+        future = _prefetch_pool.submit(_fetch_page, url, key, keyword, page, count, timeout)
+    else:
+        future = Future()
+    with _lock:
+        _page_cache[cache_key] = (now, future)
+        while len(_page_cache) > JUSO_CACHE_SIZE:
+            _page_cache.popitem(last=False)
+    return future, not background
+
+
+def remote_search(keyword, page=1, count=10, url=None, key=None, timeout=JUSO_TIMEOUT, prefetch=True):
+    """
+    원격 JUSO API 검색 (풀링 세션). prefetch=True면 응답 후 다음 페이지를 백그라운드로 미리 요청,
+    "다음" 버튼은 캐시된 Future를 그대로 받음.
+    """
+    url = JUSO_API_URL if url is None else url
+    key = JUSO_API_KEY if key is None else key
+
+    future, owner = _cached_future(url, key, keyword, page, count, timeout, background=False)
+    if owner:
+        try:
+            future.set_result(_fetch_page(url, key, keyword, page, count, timeout))
+        except Exception as e:
+            future.set_exception(e)
+    resp = future.result(timeout=timeout * 2)
+
+    if prefetch and resp["ok"] and page * count < resp["totalCount"]:
+        _cached_future(url, key, keyword, page + 1, count, timeout, background=True)
+    return resp
+
+
+def search(keyword, page=1, count=10, backend=None, bundle_dir=None):
+    """
+    주소 검색 (juso_search 응답 dict).
+    backend: "local"(색인 필수) / "remote" / "auto"(색인이 있으면 로컬, 없으면 원격). 기본 JUSO_BACKEND
+    """
+    backend = JUSO_BACKEND if backend is None else backend
+    if backend not in ("auto", "local", "remote"):
+        raise ValueError(f'지원하지 않는 backend: {backend} ("auto" / "local" / "remote")')
+
+    index = load_juso_index(bundle_dir) if backend != "remote" else None
+    if index is not None:
+        return local_search(index, keyword, page, count)
+    if backend == "local":
+        raise ValueError(f"로컬 주소 색인이 없습니다: {juso_index_dir(bundle_dir)} (python juso_index.py build ...)")
+    return remote_search(keyword, page, count)
+
+
+# ==========================================
+# 대역 서버: JUSO API와 같은 경로 / 파라미터 / 응답 JSON
+# ==========================================
+def make_juso_server(index, host="127.0.0.1", port=8765, confm_key=None):
+    """
+    로컬 색인으로 응답하는 ThreadingHTTPServer (serve_forever는 호출 측에서).
+    confm_key를 주면 API처럼 키가 다를 때 E0001로 응답.
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from urllib.parse import parse_qs, urlparse
+
+    class JusoHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"          # keep-alive (풀링 클라이언트 부하 테스트용)
+        wbufsize = 1 << 16                     # 헤더 + 본문을 한 번에 전송 (Nagle / delayed ACK 지연 방지)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path != "/addrlink/addrLinkApi.do":
+                self.send_error(404)
+                return
+            q = {k: v[0] for k, v in parse_qs(url.query).items()}
+            page = int(q.get("currentPage", "1") or 1)
+            count = int(q.get("countPerPage", "10") or 10)
+
+            if confm_key is not None and q.get("confmKey") != confm_key:
+                resp = _response(False, page=page, count=count, error_code="E0001", error_message="승인되지 않은 KEY 입니다.")
+            else:
+                resp = local_search(index, q.get("keyword", ""), page, count)
+
+            common = {k: str(resp[k]) for k in ["totalCount", "currentPage", "countPerPage", "errorCode", "errorMessage"]}
+            body = json.dumps({"results": {"common": common, "juso": resp["juso"]}}, ensure_ascii=False).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json;charset=UTF-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return ThreadingHTTPServer((host, port), JusoHandler)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="JUSO 로컬 주소 색인 빌드 / 대역 서버")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_build = sub.add_parser("build", help="주소DB(도로명주소 한글 전체분) → 로컬 색인")
+    p_build.add_argument("paths", nargs="+", help="주소_*.txt ('|' 구분, cp949)")
+    p_build.add_argument("--sgg", default=None, help="시군구명으로 제한 (예: 강서구)")
+    p_serve = sub.add_parser("serve", help="로컬 색인으로 JUSO API 대역 서버 실행")
+    p_serve.add_argument("--host", default="127.0.0.1")
+    p_serve.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    if args.cmd == "build":
+        build_juso_index(args.paths, sgg=args.sgg)
+    else:
+        index = load_juso_index()
+        if index is None:
+            raise SystemExit(f"로컬 주소 색인이 없습니다: {juso_index_dir()} (먼저 build)")
+        server = make_juso_server(index, args.host, args.port)
+        print(f"[serve] http://{args.host}:{args.port}/addrlink/addrLinkApi.do ({len(index['records'])} 주소)")
+        server.serve_forever()
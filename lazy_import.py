@@ -0,0 +1,36 @@
+# lazy_import.py
+# ============================================================
+# 무거운 모듈(pandas / statsmodels / scipy / joblib ...)을
+# 첫 속성 접근 시점까지 import 미루기
+# ============================================================
+
+import importlib
+import sys
+
+
+class LazyModule:
+    """`pd = LazyModule("pandas")` 후 `pd.DataFrame` 처럼 처음 쓰는 순간 실제 import."""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            # import_module은 import lock으로 보호되므로 Streamlit 스레드에서도 안전
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<LazyModule {self._name!r} ({state})>"
+
+
+def lazy_module(name):
+    """이미 import된 모듈이면 그대로, 아니면 LazyModule 반환."""
+    if name in sys.modules:
+        return sys.modules[name]
+    return LazyModule(name)
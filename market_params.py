@@ -0,0 +1,313 @@
+# market_params.py
+# ============================================================
+# MD1 거래 이력 → Track B GBM 파라미터(mu / sigma) 추정 (전체 / 동 / 준공 코호트별)
+# - 상태: 그룹 × 월별 ln(거래가) 건수 / 합 / 제곱합 → 월 델타는 새 행만 더해서 갱신
+# - 추정: 월평균 ln(거래가) 지수의 로그수익률에 EWMA / 최근 N개월 윈도
+# - 불확실성: 같은 추정을 월 수익률 블록 부트스트랩으로 반복 (bootstrap_group → trackb_final.load_market_param_draws)
+# - 빌드: python market_params.py                       (전체 이력)
+#         python market_params.py --delta new_trades.csv (월 델타만 반영, 이력 재로딩 없음)
+# - 결과: data/bundle/market_params.json → trackb_final.load_market_params
+# ============================================================
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from asset_bundle import DATA_DIR, source_entry, sources_match
+
+MARKET_PARAMS_VERSION = 2  # 2: MD1 append_only 원본 + 델타 워터마크
+MARKET_PARAMS_FILE = "market_params.json"
+
+TRADE_CSV = DATA_DIR / "MD1_final.csv"
+PRICE_COL = "거래금액(만원)"
+DATE_COL = "계약일"
+
+# "dong": 법정동코드(PNU 앞 10자리), "cohort": 준공연도 10년 단위, None: 전체만
+GROUP_BY = "dong"
+
+EWMA_HALFLIFE_MONTHS = 12
+WINDOW_MONTHS = 36          # trackb_final.MU_HAT의 "3년 평균"과 같은 창
+MIN_RETURNS = 6             # 이보다 적은 월 수익률로는 추정하지 않음 (None)
+
+BOOTSTRAP_DRAWS = 1000      # 파라미터 불확실성: (mu, sigma) 재표본 수
+BOOTSTRAP_BLOCK_MONTHS = 3  # 이동 블록 길이 (월 수익률의 약한 자기상관 유지)
+
+
+def market_params_path(bundle_dir=None):
+    return (Path(bundle_dir) if bundle_dir is not None else DATA_DIR / "bundle") / MARKET_PARAMS_FILE
+
+
+# ==========================================
+# 상태: {그룹: {"YYYY-MM": [건수, Σln가격, Σln가격²]}}
+# ==========================================
+def group_labels(df, group_by=GROUP_BY):
+    """행별 그룹 라벨 (group_by=None이면 전부 "all")"""
+    if group_by is None:
+        return pd.Series("all", index=df.index)
+    if group_by == "dong":
+        return df["PNU"].astype(str).str[:10]
+    if group_by == "cohort":
+        year = pd.to_datetime(df[DATE_COL], errors="coerce").dt.year
+        built = year - pd.to_numeric(df["건축연령"], errors="coerce")
+        return (built // 10 * 10).map(lambda y: f"{int(y)}s" if pd.notna(y) else None)
+    raise ValueError(f"지원하지 않는 group_by: {group_by}")
+
+
+def empty_state(price_col=PRICE_COL, group_by=GROUP_BY):
+    return {"price_col": price_col, "group_by": group_by, "n_rows": 0, "groups": {}}
+
+
+def update_state(state, df_trade):
+    """
+    거래 행(전체 이력 또는 월 델타)을 상태에 누적. 비용은 넘긴 행 수에만 비례.
+    계약일 / 거래가가 없거나 거래가 <= 0인 행은 제외.
+    """
+    price_col = state["price_col"]
+    for col in [price_col, DATE_COL]:
+        if col not in df_trade.columns:
+            raise ValueError(f"필수 컬럼 누락: {col}")
+
+    price = pd.to_numeric(df_trade[price_col], errors="coerce")
+    month = df_trade[DATE_COL].astype("string").str[:7]
+    ok = (price > 0) & month.str.fullmatch(r"\d{4}-\d{2}").fillna(False).astype(bool)
+
+    ln_price = np.log(price[ok])
+    labels = group_labels(df_trade.loc[ok], state["group_by"])
+    frames = [pd.DataFrame({"group": "all", "month": month[ok], "x": ln_price})]
+    if state["group_by"] is not None:
+        frames.append(pd.DataFrame({"group": labels, "month": month[ok], "x": ln_price}).dropna(subset=["group"]))
+
+    agg = (
+        pd.concat(frames, ignore_index=True)
+        .assign(xx=lambda d: d["x"] ** 2)
+        .groupby(["group", "month"])
+        .agg(n=("x", "size"), s=("x", "sum"), ss=("xx", "sum"))
+    )
+    for (group, m), row in agg.iterrows():
+        cell = state["groups"].setdefault(group, {}).setdefault(m, [0, 0.0, 0.0])
+        cell[0] += int(row["n"])
+        cell[1] += float(row["s"])
+        cell[2] += float(row["ss"])
+
+    state["n_rows"] += int(ok.sum())
+    return state
+
+
+# ==========================================
+# 추정
+# ==========================================
+def _month_index(m):
+    y, mm = m.split("-")
+    return int(y) * 12 + int(mm) - 1
+
+
+def monthly_returns(months):
+    """
+    월별 상태 → 연속 관측월 사이 로그수익률.
+    반환: (끝 월 인덱스, 수익률 r, 간격 k개월, 지수 표본잡음 분산) 배열
+    """
+    keys = sorted(months, key=_month_index)
+    idx = np.array([_month_index(m) for m in keys])
+    n = np.array([months[m][0] for m in keys], dtype=float)
+    s = np.array([months[m][1] for m in keys], dtype=float)
+    ss = np.array([months[m][2] for m in keys], dtype=float)
+
+    level = s / n
+    # 월평균의 표본분산 (건수 1이면 0으로 둠)
+    within = np.where(n > 1, np.maximum(ss - n * level**2, 0.0) / np.maximum(n - 1, 1), 0.0)
+    noise = within / n
+
+    return idx[1:], np.diff(level), np.diff(idx).astype(float), noise[1:] + noise[:-1]
+
+
+def _gbm_moments(r, k, noise, w):
+    """
+    가중 추정 (k개월 수익률 ~ N(nu*k, sig2*k + noise)), 마지막 축으로 합산:
+      nu = Σw·r / Σw·k,  sig2 = Σw·((r - nu·k)² - noise) / Σw·k   (월 단위)
+    → 연율 sigma = sqrt(12·sig2), mu = 12·nu + 0.5·sigma²  (GBM drift)
+    """
+    wk = np.sum(w * k, axis=-1)
+    nu = np.sum(w * r, axis=-1) / wk
+    sig2 = np.maximum(np.sum(w * ((r - nu[..., None] * k) ** 2 - noise), axis=-1) / wk, 0.0)
+    sigma = np.sqrt(12.0 * sig2)
+    return 12.0 * nu + 0.5 * sigma**2, sigma
+
+
+def _weighted_gbm(r, k, noise, w):
+    mu, sigma = _gbm_moments(r, k, noise, w)
+    return {"mu": float(mu), "sigma": float(sigma)}
+
+
+def estimate_group(months, halflife=EWMA_HALFLIFE_MONTHS, window=WINDOW_MONTHS, min_returns=MIN_RETURNS):
+    """그룹 하나의 EWMA / 윈도 추정. 수익률이 min_returns개 미만이면 해당 추정은 None."""
+    end, r, k, noise = monthly_returns(months)
+    out = {
+        "n_trades": int(sum(v[0] for v in months.values())),
+        "n_returns": int(r.size),
+        "first_month": min(months, key=_month_index),
+        "last_month": max(months, key=_month_index),
+        "ewma": None,
+        "rolling": None,
+    }
+    if r.size < min_returns:
+        return out
+
+    age = end[-1] - end
+    out["ewma"] = _weighted_gbm(r, k, noise, 0.5 ** (age / halflife))
+
+    in_window = age < window
+    if in_window.sum() >= min_returns:
+        out["rolling"] = _weighted_gbm(r[in_window], k[in_window], noise[in_window], np.ones(int(in_window.sum())))
+    return out
+
+
+def bootstrap_group(
+    months,
+    estimator="ewma",
+    n_draws=BOOTSTRAP_DRAWS,
+    block=BOOTSTRAP_BLOCK_MONTHS,
+    seed=0,
+    halflife=EWMA_HALFLIFE_MONTHS,
+    window=WINDOW_MONTHS,
+    min_returns=MIN_RETURNS,
+):
+    """
+    그룹 하나의 (mu, sigma) 재표본: 월 수익률을 이동 블록 부트스트랩으로 n_draws번 다시 뽑아
+    estimate_group과 같은 가중 추정을 한 번에 (draws × 수익률 행렬) 계산.
+    수익률은 원래 나이의 가중치(EWMA / 윈도)를 그대로 들고 다님.
+    반환: (mu 배열, sigma 배열), 수익률이 min_returns개 미만이면 None
+    """
+    if estimator not in ("ewma", "rolling"):
+        raise ValueError(f'지원하지 않는 estimator: {estimator} ("ewma" 또는 "rolling")')
+
+    end, r, k, noise = monthly_returns(months)
+    age = end[-1] - end if r.size else end
+    if estimator == "rolling":
+        keep = age < window
+        r, k, noise, age = r[keep], k[keep], noise[keep], age[keep]
+    if r.size < min_returns:
+        return None
+    w = 0.5 ** (age / halflife) if estimator == "ewma" else np.ones(r.size)
+
+    # 블록 시작점을 뽑아 길이 n의 인덱스 행렬 (draws, n) 구성 (끝은 앞으로 순환)
+    n = r.size
+    block = max(1, min(int(block), n))
+    rng = np.random.default_rng(seed)
+    starts = rng.integers(0, n, size=(n_draws, -(-n // block)))
+    idx = ((starts[:, :, None] + np.arange(block)) % n).reshape(n_draws, -1)[:, :n]
+
+    return _gbm_moments(r[idx], k[idx], noise[idx], w[idx])
+
+
+def estimate_all(state, halflife=EWMA_HALFLIFE_MONTHS, window=WINDOW_MONTHS, min_returns=MIN_RETURNS):
+    return {g: estimate_group(m, halflife, window, min_returns) for g, m in sorted(state["groups"].items())}
+
+
+# ==========================================
+# 캐시 (번들 디렉터리의 market_params.json)
+# ==========================================
+def state_watermark(state):
+    """상태가 반영한 거래 이력의 끝: 누적 행 수 / 마지막 계약월"""
+    months = state["groups"].get("all", {})
+    return {"n_rows": state["n_rows"], "last_month": max(months) if months else None}
+
+
+def save_market_params(state, path, sources, deltas=()):
+    """
+    sources: 전체 빌드에 쓴 거래 이력 (append_only → 델타를 끝에 붙여도 fresh)
+    deltas: 그 뒤에 반영한 월 델타 기록 (파일 식별 없이 행 수 / 마지막 계약월만, freshness에 안 쓰임)
+    """
+    payload = {
+        "version": MARKET_PARAMS_VERSION,
+        "sources": sources,
+        "deltas": list(deltas),
+        "watermark": state_watermark(state),
+        "settings": {"halflife_months": EWMA_HALFLIFE_MONTHS, "window_months": WINDOW_MONTHS},
+        "state": state,
+        "estimates": estimate_all(state),
+    }
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    return payload
+
+
+def load_market_params_cache(path, data_dir=None):
+    """
+    캐시 JSON. 없거나, 버전이 다르거나, 기록된 원본(MD1)이 data_dir의 현재 파일과 맞지 않으면 None
+    (asset_bundle.sources_match: MD1은 append_only → 빌드 시점 내용 뒤에 행이 붙는 것만 허용).
+    data_dir 기본값: 번들 디렉터리의 상위 (market_params_path 기본 배치)
+    """
+    path = Path(path)
+    if not path.exists():
+        return None
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if payload.get("version") != MARKET_PARAMS_VERSION:
+        return None
+    data_dir = path.parent.parent if data_dir is None else data_dir
+    try:
+        fresh = sources_match(payload.get("sources", []), data_dir)
+    except (OSError, KeyError, TypeError):
+        return None
+    return payload if fresh else None
+
+
+def build_market_params(trade_csv=TRADE_CSV, bundle_dir=None, price_col=PRICE_COL, group_by=GROUP_BY):
+    """거래 이력 전체로 상태를 새로 만들고 추정치 캐시. 거래가 컬럼이 없으면 건너뜀 (None)."""
+    trade_csv = Path(trade_csv)
+    if not trade_csv.exists():
+        print(f"[skip] {MARKET_PARAMS_FILE} ({trade_csv.name} 없음)")
+        return None
+
+    df_trade = pd.read_csv(trade_csv, dtype={"PNU": str})
+    if price_col not in df_trade.columns:
+        print(f"[skip] {MARKET_PARAMS_FILE} ({trade_csv.name}에 거래가 컬럼 '{price_col}' 없음 → Track B 상수 사용)")
+        return None
+
+    state = update_state(empty_state(price_col, group_by), df_trade)
+    out_path = market_params_path(bundle_dir if bundle_dir is not None else trade_csv.parent / "bundle")
+    payload = save_market_params(state, out_path, [source_entry(trade_csv, append_only=True)])
+    print(f"[ok] {MARKET_PARAMS_FILE} → {out_path} ({state['n_rows']} trades, {len(state['groups'])} groups)")
+    return payload
+
+
+def update_market_params(delta, bundle_dir=None):
+    """
+    월 델타(DataFrame 또는 CSV 경로)만 기존 상태에 더해 추정치 갱신 (이력 재로딩 없음).
+    델타는 "deltas"에 행 수 / 마지막 계약월만 기록 (델타 파일을 옮기거나 지워도 캐시는 유효).
+    델타를 MD1 끝에 이어 붙여도 fresh 유지. 캐시가 없거나 MD1 앞부분이 바뀌었으면 ValueError
+    → build_market_params로 먼저 전체 빌드.
+    """
+    out_path = market_params_path(bundle_dir)
+    payload = load_market_params_cache(out_path)
+    if payload is None:
+        raise ValueError(f"{out_path}가 없거나 원본 거래 이력과 맞지 않습니다. 먼저 전체 이력으로 빌드하세요.")
+
+    name = "DataFrame"
+    if not isinstance(delta, pd.DataFrame):
+        name = Path(delta).name
+        delta = pd.read_csv(delta, dtype={"PNU": str})
+
+    state = update_state(payload["state"], delta)
+    deltas = payload.get("deltas", []) + [{"name": name, **state_watermark(state), "rows": int(len(delta))}]
+    payload = save_market_params(state, out_path, payload["sources"], deltas)
+    print(f"[ok] {MARKET_PARAMS_FILE} 갱신 (+{len(delta)} rows, 누적 {state['n_rows']} trades)")
+    return payload
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="MD1 거래 이력 → Track B mu / sigma 추정 캐시")
+    parser.add_argument("--delta", default=None, help="새로 들어온 거래 CSV (기존 캐시에 누적)")
+    args = parser.parse_args()
+
+    if args.delta:
+        update_market_params(args.delta)
+    else:
+        build_market_params()
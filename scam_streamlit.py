@@ -1,8 +1,6 @@
 import streamlit as st
-import requests
-import tracka_final as ta
 import jeonse_ratio as jr
-import numpy as np
+import juso_index as ji
 import re
 from io import BytesIO
 from datetime import datetime
@@ -49,6 +47,14 @@ def classify_3bin(prob: float, t1: float, t2: float) -> str:
     return "Safe"
 
 
+def range_html(band: dict, prefix: str, fmt: str, unit: str = "") -> str:
+    """시장 리스크 카드의 "90% 범위" 줄 (band가 비어 있으면 범위를 낼 수 없다는 안내)"""
+    if not band:
+        return '<div style="font-size:14px; color:#9ca3af; margin-top:8px;">90% 범위 추정치 없음</div>'
+    lo, hi = format(band[f"{prefix}_q05"], fmt), format(band[f"{prefix}_q95"], fmt)
+    return f'<div style="font-size:14px; color:#6b7280; margin-top:8px;">90% 범위 {lo} ~ {hi}{unit}</div>'
+
+
 def get_9zone_case(a_level: str, b_level: str):
     """
     9분면 매핑 (3x3)
@@ -72,46 +78,16 @@ def get_9zone_case(a_level: str, b_level: str):
 
 
 # =========================
-# JUSO (도로명주소) 검색 API 설정
+# JUSO (도로명주소) 검색
+# - 로컬 색인(data/bundle/juso_index, python juso_index.py build ...)이 있으면 로컬 검색
+# - 없으면 원격 API (풀링 세션 + 다음 페이지 선조회). URL / 키 / 백엔드는 juso_index의 환경변수로
 # =========================
-JUSO_API_URL = "https://business.juso.go.kr/addrlink/addrLinkApi.do"
-JUSO_API_KEY = "devU01TX0FVVEgyMDI2MDIwNzE1NDI1MzExNzU3MTY="
 JUSO_RESULT_PER_PAGE = 10
 
 
 @st.cache_data(show_spinner=False, ttl=60)
 def juso_search(keyword: str, page: int = 1, count: int = 10):
-    params = {
-        "confmKey": JUSO_API_KEY,
-        "currentPage": str(page),
-        "countPerPage": str(count),
-        "keyword": keyword,
-        "resultType": "json",
-    }
-    r = requests.get(JUSO_API_URL, params=params, timeout=6)
-    r.raise_for_status()
-    data = r.json()
-
-    results = data.get("results", {})
-    common = results.get("common", {})
-    juso_list = results.get("juso", []) or []
-
-    error_code = common.get("errorCode", "-999")
-    error_msg = common.get("errorMessage", "알 수 없는 오류")
-
-    total_count = int(common.get("totalCount", "0") or "0")
-    current_page = int(common.get("currentPage", page) or page)
-    count_per_page = int(common.get("countPerPage", count) or count)
-
-    return {
-        "ok": (error_code == "0"),
-        "errorCode": error_code,
-        "errorMessage": error_msg,
-        "totalCount": total_count,
-        "currentPage": current_page,
-        "countPerPage": count_per_page,
-        "juso": juso_list,
-    }
+    return ji.search(keyword, page=page, count=count)
 
 
 # ----------------------------
@@ -144,6 +120,64 @@ def choose_juso(juso_obj: dict):
     st.session_state.addr_open = False
 
 
+def close_addr():
+    st.session_state.addr_open = False
+
+
+def step_addr_page(delta: int):
+    st.session_state.addr_page += delta
+
+
+def jibun_from_juso(selected: dict) -> str:
+    """JUSO 항목 → 지번 문자열 ("1067" / "1067-3"). 본번이 없으면 jibunAddr 끝에서 추출"""
+    main_no = str(selected.get("lnbrMnnm", "")).strip()
+    sub_no  = str(selected.get("lnbrSlno", "0")).strip()
+
+    if sub_no in ["", "0", "0000"]:
+        jibun = main_no
+    else:
+        jibun = f"{main_no}-{int(float(sub_no))}"
+
+    if not jibun:
+        m = re.search(r"(\d+)(?:-(\d+))?\s*$", str(selected.get("jibunAddr", "")).strip())
+        if m:
+            jibun = m.group(1) if not m.group(2) else f"{m.group(1)}-{m.group(2)}"
+    return jibun
+
+
+def jibun_check_message(selected: dict, jibun: str, keys=None):
+    """
+    분석 불가한 주소면 안내 문구, 가능하면 None (지번 색인 조회라 모델 로드 없음)
+    keys: 지번 키 list. 기본은 ta.load_jibun_index (원본과 대조, 제출 시), 입력 화면은 ta.load_jibun_keys()
+    """
+    import tracka_final as ta
+
+    if not selected:
+        return "주소를 먼저 검색해서 선택해 주세요."
+    adm_cd = str(selected.get("admCd", "") or "")
+    if adm_cd and adm_cd != ta.JIBUN_DONG_CODE:
+        return "현재는 화곡동 주소만 분석할 수 있어요."
+    if not ta.is_known_jibun(jibun, keys=keys):
+        return f"지번 {jibun or '(없음)'}은(는) 매매 이력이 없어 분석할 수 없어요. 지번 자동완성에서 분석 가능한 지번을 골라 주세요."
+    return None
+
+
+def jibun_juso(jibun: str) -> dict:
+    """자동완성으로 고른 화곡동 지번 → JUSO 항목 모양 dict (도로명 없이 지번 주소만)"""
+    import tracka_final as ta
+
+    main_no, _, sub_no = jibun.partition("-")
+    addr = f"서울특별시 강서구 화곡동 {jibun}"
+    return {
+        "roadAddr": addr,
+        "jibunAddr": addr,
+        "admCd": ta.JIBUN_DONG_CODE,
+        "lnbrMnnm": main_no,
+        "lnbrSlno": sub_no or "0",
+        "zipNo": "",
+    }
+
+
 def parse_contract_years(label: str) -> int:
     # "1년", "2년", "3년", "4년 이상" -> 숫자
     if label.startswith("4"):
@@ -154,6 +188,146 @@ def parse_contract_years(label: str) -> int:
         return 2
 
 
+# ----------------------------
+# Fragments: 위젯 상호작용 시 이 함수만 다시 실행 (CSS 주입 / 페이지 본문 / 차트는 재실행 안 함)
+# - 주소 검색·선택, 계산 과정 토글, PDF 생성 버튼
+# - 페이지 이동(go)이나 제출처럼 다른 영역에 영향을 주는 동작만 전체 재실행
+# - fragment 안에서는 st.rerun() 대신 on_click 콜백으로 상태 변경 (콜백은 재실행 전에 실행)
+# ----------------------------
+@st.fragment
+def render_address_picker():
+    import tracka_final as ta
+
+    with st.container(border=True):
+        st.markdown('<div class="section-label">📍 주소</div>', unsafe_allow_html=True)
+        st.markdown('<div class="sub">주소를 검색하고 선택하세요.</div>', unsafe_allow_html=True)
+
+        display_addr = ""
+        if st.session_state.selected_juso:
+            display_addr = st.session_state.selected_juso.get("roadAddr", "") or ""
+        if not display_addr:
+            display_addr = "주소를 검색하세요"
+
+        st.markdown('<div class="addrbar">', unsafe_allow_html=True)
+        if st.button(display_addr, type="secondary", key="open_addr"):
+            toggle_addr()
+        st.markdown("</div>", unsafe_allow_html=True)
+
+        if st.session_state.addr_open:
+            st.write("")  # spacing
+            st.session_state.addr_query = st.text_input(
+                "주소 검색",
+                value=st.session_state.addr_query,
+                placeholder="예) 화곡로 123, 화곡동 1067, OO아파트",
+                key="addr_query_input"
+            )
+
+            colA, colB = st.columns([1, 1])
+            with colA:
+                if st.button("검색", use_container_width=True, key="addr_search_btn"):
+                    st.session_state.addr_page = 1
+            with colB:
+                st.button("닫기", use_container_width=True, key="addr_close_btn", on_click=close_addr)
+
+            q = (st.session_state.addr_query or "").strip()
+            if q:
+                try:
+                    resp = juso_search(q, page=st.session_state.addr_page, count=JUSO_RESULT_PER_PAGE)
+                    if not resp["ok"]:
+                        st.error(f"주소 검색 오류: {resp['errorMessage']} (code={resp['errorCode']})")
+                    else:
+                        juso_list = resp["juso"]
+                        if not juso_list:
+                            st.info("검색 결과가 없어요.")
+                        else:
+                            st.caption("검색 결과를 선택하세요.")
+                            for i, j in enumerate(juso_list):
+                                label = j.get("roadAddr", "") or "(주소)"
+                                # 보조 정보: 지번
+                                jibun = j.get("jibunAddr", "")
+                                if jibun:
+                                    label = f"{label}  ({jibun})"
+
+                                st.button(label, type="secondary", key=f"juso_pick_{st.session_state.addr_page}_{i}", on_click=choose_juso, args=(j,))
+
+                        # pagination
+                        total = resp["totalCount"]
+                        per = resp["countPerPage"]
+                        max_page = max(1, (total + per - 1) // per)
+
+                        pcol1, pcol2, pcol3 = st.columns([1, 2, 1])
+                        with pcol1:
+                            st.button("이전", use_container_width=True, disabled=(st.session_state.addr_page <= 1), key="addr_prev", on_click=step_addr_page, args=(-1,))
+                        with pcol2:
+                            st.caption(f"{st.session_state.addr_page} / {max_page} 페이지  (총 {total}건)")
+                        with pcol3:
+                            st.button("다음", use_container_width=True, disabled=(st.session_state.addr_page >= max_page), key="addr_next", on_click=step_addr_page, args=(1,))
+
+                except Exception as e:
+                    st.error(f"주소 검색 요청 실패: {e}")
+            else:
+                st.info("검색어를 입력해 주세요.")
+
+            # 화곡동 지번 자동완성 (분석 가능한 지번만 후보로, 미리 빌드된 keys.npy만 사용)
+            jibun_q = st.text_input(
+                "화곡동 지번으로 바로 입력",
+                placeholder="예) 1067, 1067-1",
+                key="jibun_query_input"
+            ).strip()
+            jibun_keys = ta.load_jibun_keys() if jibun_q else None
+            if jibun_q and jibun_keys is None:
+                st.caption("지번 색인이 없어 자동완성을 쓸 수 없어요. (python asset_bundle.py로 빌드)")
+            elif jibun_q:
+                candidates = ta.suggest_jibun(jibun_q, limit=8, keys=jibun_keys)
+                if not candidates:
+                    st.caption("분석 가능한 지번 중 일치하는 것이 없어요.")
+                else:
+                    cols = st.columns(4)
+                    for i, cand in enumerate(candidates):
+                        with cols[i % 4]:
+                            st.button(cand, type="secondary", use_container_width=True, key=f"jibun_pick_{cand}", on_click=choose_juso, args=(jibun_juso(cand),))
+
+        # 선택한 주소가 분석 가능한지 바로 표시 (모델 실행 전, 색인이 없으면 제출 시 검증)
+        jibun_keys = ta.load_jibun_keys() if st.session_state.selected_juso else None
+        if jibun_keys is not None:
+            selected = st.session_state.selected_juso
+            jibun_error = jibun_check_message(selected, jibun_from_juso(selected), keys=jibun_keys)
+            if jibun_error:
+                st.warning(jibun_error)
+            else:
+                st.caption(f"✅ 분석 가능한 지번이에요 (화곡동 {jibun_from_juso(selected)})")
+
+
+@st.fragment
+def render_pdf_download(inputs, resA, resB, zone_name, zone_desc, a_grade, b_grade):
+    if st.button("📄 최종 보고서 다운로드 (PDF)", use_container_width=True, type="primary", key="pdf_report"):
+        pdf_buffer = generate_pdf_report(inputs, resA, resB, zone_name, zone_desc, a_grade, b_grade)
+        if pdf_buffer:
+            st.download_button(
+                label="💾 PDF 저장",
+                data=pdf_buffer,
+                file_name=f"전세위험도평가보고서_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf",
+                mime="application/pdf",
+                use_container_width=True
+            )
+
+
+@st.fragment
+def render_calc_explainer(state_key: str, toggle_key: str, html: str, height: int, footer=None):
+    """"이 결과는 어떻게 계산됐나요?" 토글 + 설명 HTML (footer: 설명 아래에 그릴 함수)"""
+    if state_key not in st.session_state:
+        st.session_state[state_key] = False
+
+    if st.button("▼ 이 결과는 어떻게 계산됐나요?" if not st.session_state[state_key] else "▲ 이 결과는 어떻게 계산됐나요?", key=toggle_key):
+        st.session_state[state_key] = not st.session_state[state_key]
+
+    if st.session_state[state_key]:
+        import streamlit.components.v1 as components
+        components.html(html, height=height)
+        if footer is not None:
+            footer()
+
+
 # ----------------------------
 # CSS (FINAL)
 # ----------------------------
@@ -403,84 +577,8 @@ def render_input():
         height=450
     )
 
-    # 1) 주소
-    with st.container(border=True):
-        st.markdown('<div class="section-label">📍 주소</div>', unsafe_allow_html=True)
-        st.markdown('<div class="sub">주소를 검색하고 선택하세요.</div>', unsafe_allow_html=True)
-
-        display_addr = ""
-        if st.session_state.selected_juso:
-            display_addr = st.session_state.selected_juso.get("roadAddr", "") or ""
-        if not display_addr:
-            display_addr = "주소를 검색하세요"
-
-        st.markdown('<div class="addrbar">', unsafe_allow_html=True)
-        if st.button(display_addr, type="secondary", key="open_addr"):
-            toggle_addr()
-        st.markdown("</div>", unsafe_allow_html=True)
-
-        if st.session_state.addr_open:
-            st.write("")  # spacing
-            st.session_state.addr_query = st.text_input(
-                "주소 검색",
-                value=st.session_state.addr_query,
-                placeholder="예) 화곡로 123, 화곡동 1067, OO아파트",
-                key="addr_query_input"
-            )
-
-            colA, colB = st.columns([1, 1])
-            with colA:
-                if st.button("검색", use_container_width=True, key="addr_search_btn"):
-                    st.session_state.addr_page = 1
-            with colB:
-                if st.button("닫기", use_container_width=True, key="addr_close_btn"):
-                    st.session_state.addr_open = False
-                    st.rerun()
-
-            q = (st.session_state.addr_query or "").strip()
-            if q:
-                try:
-                    resp = juso_search(q, page=st.session_state.addr_page, count=JUSO_RESULT_PER_PAGE)
-                    if not resp["ok"]:
-                        st.error(f"주소 검색 오류: {resp['errorMessage']} (code={resp['errorCode']})")
-                    else:
-                        juso_list = resp["juso"]
-                        if not juso_list:
-                            st.info("검색 결과가 없어요.")
-                        else:
-                            st.caption("검색 결과를 선택하세요.")
-                            for i, j in enumerate(juso_list):
-                                label = j.get("roadAddr", "") or "(주소)"
-                                # 보조 정보: 지번
-                                jibun = j.get("jibunAddr", "")
-                                if jibun:
-                                    label = f"{label}  ({jibun})"
-
-                                if st.button(label, type="secondary", key=f"juso_pick_{st.session_state.addr_page}_{i}"):
-                                    choose_juso(j)
-                                    st.rerun()
-
-                        # pagination
-                        total = resp["totalCount"]
-                        per = resp["countPerPage"]
-                        max_page = max(1, (total + per - 1) // per)
-
-                        pcol1, pcol2, pcol3 = st.columns([1, 2, 1])
-                        with pcol1:
-                            if st.button("이전", use_container_width=True, disabled=(st.session_state.addr_page <= 1), key="addr_prev"):
-                                st.session_state.addr_page -= 1
-                                st.rerun()
-                        with pcol2:
-                            st.caption(f"{st.session_state.addr_page} / {max_page} 페이지  (총 {total}건)")
-                        with pcol3:
-                            if st.button("다음", use_container_width=True, disabled=(st.session_state.addr_page >= max_page), key="addr_next"):
-                                st.session_state.addr_page += 1
-                                st.rerun()
-
-                except Exception as e:
-                    st.error(f"주소 검색 요청 실패: {e}")
-            else:
-                st.info("검색어를 입력해 주세요.")
+    # 1) 주소 (fragment: 검색 / 페이지 넘김 / 선택은 이 영역만 재실행)
+    render_address_picker()
 
     # 2) 층 / 면적
     with st.container(border=True):
@@ -549,28 +647,19 @@ def render_input():
 
     if clicked:
         import numpy as np
-        import pandas as pd
         import tracka_final as ta
         import trackb_final as tb
         
         selected = st.session_state.selected_juso or {}
 
         # --- 지번번호(JIBUN) 가공 ---
-        main_no = str(selected.get("lnbrMnnm", "")).strip()
-        sub_no  = str(selected.get("lnbrSlno", "0")).strip()
+        JIBUN = jibun_from_juso(selected)
 
-        if sub_no in ["", "0", "0000"]:
-            JIBUN = main_no
-        else:
-            JIBUN = f"{main_no}-{int(float(sub_no))}"
-
-        if not JIBUN:
-            import re
-            m = re.search(r"(\d+)(?:-(\d+))?\s*$", str(selected.get("jibunAddr", "")).strip())
-            if m:
-                JIBUN = m.group(1) if not m.group(2) else f"{m.group(1)}-{m.group(2)}"
-            else:
-                JIBUN = ""
+        # 모델 계산 전에 지번 색인으로 먼저 거름 (화곡동 + 매매 이력 / 위경도가 있는 지번만)
+        jibun_error = jibun_check_message(selected, JIBUN)
+        if jibun_error:
+            st.error(jibun_error)
+            st.stop()
 
         st.session_state.inputs = {
             "JIBUN": JIBUN,
@@ -586,7 +675,7 @@ def render_input():
         # ✅ 구조적 설계 위험 분석 계산
         try:
             with st.spinner("구조적 설계 위험 분석 계산 중..."):
-                resA, commentsA = ta.predict_final(
+                resA, commentsA = ta.predict_final_cached(
                     jibun=JIBUN,
                     area_m2=float(AREA_M2),
                     floor=int(floor_to_num(FLOOR)),
@@ -607,25 +696,20 @@ def render_input():
                     B = float(DEPOSIT)
                     T = float(contract_years)
                     
-                    df_in = pd.DataFrame([{
-                        "hedonic_price": float(V0),
-                        "deposit": B,
-                        "term": T,
-                    }])
-                    
-                    df_out = tb.add_trackB_risk_columns(
-                        df_in,
-                        v0_col="hedonic_price",
-                        b_col="deposit",
-                        t_col="term",
-                        mu=tb.MU_ANNUAL,
-                        sigma=tb.SIGMA_ANNUAL,
+                    # render_market_risk와 같은 키 → 결과 페이지 진입 시 메모이즈 적중
+                    market = tb.load_market_params()
+                    row = tb.trackB_evaluate(
+                        V0=float(V0),
+                        B=B,
+                        T=T,
+                        mu=market["MU_ANNUAL"],
+                        sigma=market["SIGMA_ANNUAL"],
                         alpha=tb.ALPHA_USED,
-                        scenarios=tb.SCENARIOS
-                    )
-                    
-                    row = df_out.iloc[0]
-                    st.session_state.inputs["MARKET_RISK_RESULT"] = row.to_dict()
+                        scenarios=tb.SCENARIOS,
+                        EL_CAP=tb.EL_CAP,
+                        mu_before=market["MU_HAT"],
+                    )["row"]
+                    st.session_state.inputs["MARKET_RISK_RESULT"] = row
                     st.session_state.inputs["JEONSE_RATIO"] = float(row["jeonse_ratio"])
             except Exception as e:
                 st.error(f"시장·시간 위험 분석 계산 실패: {e}")
@@ -1190,17 +1274,8 @@ def render_result():
     # 9분면 케이스 매핑
     zone_code, zone_name, zone_desc, zone_bg, zone_color = get_9zone_case(a_grade, b_grade)
 
-    # ---- PDF 다운로드 버튼 ----
-    if st.button("📄 최종 보고서 다운로드 (PDF)", use_container_width=True, type="primary"):
-        pdf_buffer = generate_pdf_report(inputs, resA, resB, zone_name, zone_desc, a_grade, b_grade)
-        if pdf_buffer:
-            st.download_button(
-                label="💾 PDF 저장",
-                data=pdf_buffer,
-                file_name=f"전세위험도평가보고서_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf",
-                mime="application/pdf",
-                use_container_width=True
-            )
+    # ---- PDF 다운로드 버튼 (fragment: 보고서 생성은 이 영역만 재실행) ----
+    render_pdf_download(inputs, resA, resB, zone_name, zone_desc, a_grade, b_grade)
     
     st.markdown("---")
 
@@ -1451,7 +1526,7 @@ def render_structural_risk():
     else:
         try:
             with st.spinner("구조적 설계 위험 분석 계산 중..."):
-                resA, commentsA = ta.predict_final(
+                resA, commentsA = ta.predict_final_cached(
                     jibun=inputs["JIBUN"],
                     area_m2=float(inputs["AREA_M2"]),
                     floor=int(inputs.get("FLOOR_NUM", 1)),
@@ -1767,17 +1842,11 @@ def render_structural_risk():
     # ============================================
     st.markdown("---")
     
-    # 토글 상태 초기화
-    if "show_tracka_calc" not in st.session_state:
-        st.session_state.show_tracka_calc = False
-    
-    if st.button("▼ 이 결과는 어떻게 계산됐나요?" if not st.session_state.show_tracka_calc else "▲ 이 결과는 어떻게 계산됐나요?", key="toggle_tracka_calc"):
-        st.session_state.show_tracka_calc = not st.session_state.show_tracka_calc
-    
-    if st.session_state.show_tracka_calc:
-        import streamlit.components.v1 as components
-        components.html(
-            """
+    # 토글 / 설명만 재실행 (fragment)
+    render_calc_explainer(
+        "show_tracka_calc",
+        "toggle_tracka_calc",
+        """
             <style>
                 * { font-family: 'Apple SD Gothic Neo', 'Noto Sans KR', sans-serif !important; }
             </style>
@@ -1827,9 +1896,9 @@ def render_structural_risk():
         <li>점수가 높을수록 주의가 필요한 매물이에요.</li>
     </ul>
 </div>
-            """,
-            height=900
-        )
+        """,
+        height=900,
+    )
 
     if st.button("⬅︎ 요약으로 돌아가기", use_container_width=True):
         go("result")
@@ -1894,40 +1963,20 @@ def render_market_risk():
     B = float(inputs["DEPOSIT"])
     T = float(inputs["CONTRACT_YEARS"])
 
-    df_in = pd.DataFrame([{
-        "hedonic_price": float(V0),
-        "deposit": B,
-        "term": T,
-    }])
-
-    # 계산
+    # 계산 (입력이 같으면 tb.trackB_evaluate 메모이즈 결과 재사용 → 토글 등 재실행 시 재계산 없음)
     try:
         with st.spinner("시장·시간 위험 분석 계산 중..."):
-            df_out = tb.add_trackB_risk_columns(
-                df_in,
-                v0_col="hedonic_price",
-                b_col="deposit",
-                t_col="term",
-                mu=tb.MU_ANNUAL,
-                sigma=tb.SIGMA_ANNUAL,
-                alpha=tb.ALPHA_USED,
-                scenarios=tb.SCENARIOS
-            )
-
-            rep, base_el, el_20, slope = tb.scenario_sensitivity_report(df_out, idx=0, make_plot=False)
-
-            # B* (적정보증금 상한)
-            shock = tb.SCENARIOS.get(tb.SCENARIO_FOR_BSTAR, 0.0)
-            b_before, b_after = tb.B_star_range_two_mu(
+            market = tb.load_market_params()
+            res = tb.trackB_evaluate(
                 V0=float(V0),
-                T=float(T),
-                sigma=tb.SIGMA_ANNUAL,
+                B=B,
+                T=T,
+                mu=market["MU_ANNUAL"],
+                sigma=market["SIGMA_ANNUAL"],
                 alpha=tb.ALPHA_USED,
-                shock=shock,
+                scenarios=tb.SCENARIOS,
                 EL_CAP=tb.EL_CAP,
-                mu_before=tb.MU_HAT,
-                mu_after=tb.MU_ANNUAL,
-                tol=100.0
+                mu_before=market["MU_HAT"],
             )
 
     except Exception as e:
@@ -1935,8 +1984,10 @@ def render_market_risk():
         st.exception(e)
         return
 
-    row = df_out.iloc[0]
-    inputs["MARKET_RISK_RESULT"] = row.to_dict()
+    row = res["row"]
+    band = res["band"]
+    b_before, b_after = res["b_before"], res["b_after"]
+    inputs["MARKET_RISK_RESULT"] = dict(row)
     inputs["JEONSE_RATIO"] = float(row["jeonse_ratio"])
     st.session_state.inputs = inputs
 
@@ -2034,8 +2085,10 @@ def render_market_risk():
                 <div style="text-align:center;">
                     <div style="font-size:18px; font-weight:700; color:#163a66; margin-bottom:16px;">보증금을 못 돌려받을 확률</div>
                     <div style="font-size:36px; font-weight:900; color:#000000;">{PD_VALUE}</div>
+                    {PD_RANGE}
                 </div>
-                """.replace("{PD_VALUE}", f"{row['PD_base']:.1%}"),
+                """.replace("{PD_VALUE}", f"{row['PD_base']:.1%}")
+                .replace("{PD_RANGE}", range_html(band, "PD_base", ".1%", "")),
                 unsafe_allow_html=True
             )
         
@@ -2045,8 +2098,10 @@ def render_market_risk():
                 <div style="text-align:center;">
                     <div style="font-size:18px; font-weight:700; color:#163a66; margin-bottom:16px;">평균적으로 잃을 수 있는 금액</div>
                     <div style="font-size:36px; font-weight:900; color:#000000;">약 {EL_VALUE}만원</div>
+                    {EL_RANGE}
                 </div>
-                """.replace("{EL_VALUE}", f"{row['EL_base']:,.0f}"),
+                """.replace("{EL_VALUE}", f"{row['EL_base']:,.0f}")
+                .replace("{EL_RANGE}", range_html(band, "EL_base", ",.0f", "만원")),
                 unsafe_allow_html=True
             )
         
@@ -2072,7 +2127,14 @@ def render_market_risk():
         
         # 금리 영향도
         st.markdown(f"**💡 금리 영향도**: 기준금리 1%p 상승할 때 예상 손실액이 약 {el_change_per_1pct:,.0f}만원씩 증가합니다.")
-        st.markdown(f"**📊 가격 변동성**: 화곡동의 연간 가격 변동성은 {tb.SIGMA_ANNUAL*100:.2f}%예요.")
+        st.markdown(f"**📊 가격 변동성**: 화곡동의 연간 가격 변동성은 {tb.load_market_params()['SIGMA_ANNUAL']*100:.2f}%예요.")
+        if band:
+            st.caption("90% 범위: 가격 추세(mu)·변동성(sigma) 추정의 불확실성을 반영한 손실 확률 / 손실액 범위예요.")
+        else:
+            st.caption(
+                "90% 범위 추정치 없음: 거래 이력 추정치(data/bundle/market_params.json)가 없거나 원본 거래 데이터와 맞지 않아 "
+                "점추정만 보여드려요. 가격 컬럼이 있는 거래 데이터로 `python market_params.py`를 실행하면 범위가 표시돼요."
+            )
         
         st.markdown("---")
         
@@ -2180,17 +2242,15 @@ def render_market_risk():
     # ============================================
     st.markdown("---")
     
-    # 토글 상태 초기화
-    if "show_trackb_calc" not in st.session_state:
-        st.session_state.show_trackb_calc = False
-    
-    if st.button("▼ 이 결과는 어떻게 계산됐나요?" if not st.session_state.show_trackb_calc else "▲ 이 결과는 어떻게 계산됐나요?", key="toggle_trackb_calc"):
-        st.session_state.show_trackb_calc = not st.session_state.show_trackb_calc
-    
-    if st.session_state.show_trackb_calc:
-        import streamlit.components.v1 as components
-        components.html(
-            """
+    # 토글 / 설명만 재실행 (fragment)
+    def memo_caption():
+        memo = tb.trackB_memo_info()
+        st.caption(f"계산 캐시 적중률 {memo['hit_rate']:.0%} (적중 {memo['hits']} / 계산 {memo['misses']})")
+
+    render_calc_explainer(
+        "show_trackb_calc",
+        "toggle_trackb_calc",
+        """
             <style>
                 * { font-family: 'Apple SD Gothic Neo', 'Noto Sans KR', sans-serif !important; }
             </style>
@@ -2228,9 +2288,10 @@ def render_market_risk():
         <li>"평균적으로 얼마를 잃을 수 있는지"를 의미해요.</li>
     </ul>
 </div>
-            """,
-            height=550
-        )
+        """,
+        height=550,
+        footer=memo_caption,
+    )
 
     if st.button("⬅︎ 요약으로 돌아가기", use_container_width=True):
         go("result")
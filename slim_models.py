@@ -0,0 +1,219 @@
+# slim_models.py
+# ============================================================
+# 모델 pkl → 계수만 남긴 경량 아티팩트(JSON) 내보내기 + NumPy 전용 스코어러
+# - 내보내기 + 원본 모델과 일치 검증: python slim_models.py
+# - 스코어링 시 statsmodels / scikit-learn 불필요
+# ============================================================
+
+import json
+from pathlib import Path
+
+import numpy as np
+
+from asset_bundle import file_sha256
+
+BASE_DIR = Path(__file__).resolve().parent
+MODELS_DIR = BASE_DIR / "models"
+
+HEDONIC_PKL = MODELS_DIR / "hedonic_model.pkl"
+HEDONIC_SLIM = MODELS_DIR / "hedonic_model_slim.json"
+
+AUCTION_PKL = MODELS_DIR / "hwagok_auction_risk_model.pkl"
+AUCTION_SLIM = MODELS_DIR / "hwagok_auction_risk_model_slim.json"
+
+
+# ==========================================
+# 공통: 원본 pkl과 일치하는 경량 아티팩트 로드
+# ==========================================
+def load_slim(slim_path, source_path):
+    """
+    경량 아티팩트 로드. 원본 pkl이 있는데 sha256이 다르면(재학습 등) None → 원본 경로 사용.
+    """
+    slim_path, source_path = Path(slim_path), Path(source_path)
+    if not slim_path.exists():
+        return None
+
+    try:
+        slim = json.loads(slim_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+    if source_path.exists() and file_sha256(source_path) != slim.get("source_sha256"):
+        return None
+    return slim
+
+
+def _write_json(obj, path):
+    Path(path).write_text(json.dumps(obj, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+# ==========================================
+# 헤도닉: ln(price) = intercept + X @ coef
+# ==========================================
+def export_hedonic_slim(source_path=HEDONIC_PKL, slim_path=HEDONIC_SLIM):
+    """hedonic_model.pkl(statsmodels 결과 객체) → selected_features 순서의 계수 + 절편"""
+    import pickle
+
+    with open(source_path, "rb") as f:
+        pkg = pickle.load(f)
+
+    params = pkg["model"].params
+    features = list(pkg["selected_features"])
+
+    slim = {
+        "kind": "hedonic_ols_log",
+        "source_sha256": file_sha256(source_path),
+        "selected_features": features,
+        "intercept": float(params["const"]),
+        "coef": [float(params[f]) for f in features],
+    }
+    _write_json(slim, slim_path)
+    return slim
+
+
+def hedonic_slim_package(slim):
+    """JSON 아티팩트 → load_assets의 hedonic_pkg 형태 (model 대신 coef/intercept 배열)"""
+    return {
+        "selected_features": list(slim["selected_features"]),
+        "coef": np.asarray(slim["coef"], dtype=float),
+        "intercept": float(slim["intercept"]),
+    }
+
+
+def hedonic_predict_ln(hedonic_pkg, X):
+    """
+    (n, k) 또는 (k,) 설계행렬(selected_features 순서, 상수항 제외) → ln(price).
+    경량 패키지면 NumPy 행렬곱, 원본 패키지면 statsmodels predict.
+    """
+    if "coef" in hedonic_pkg:
+        X = np.asarray(X, dtype=float)
+        return X @ hedonic_pkg["coef"] + hedonic_pkg["intercept"]
+
+    import pandas as pd
+    import statsmodels.api as sm
+
+    X_df = pd.DataFrame(np.atleast_2d(np.asarray(X, dtype=float)), columns=hedonic_pkg["selected_features"])
+    X_new = sm.add_constant(X_df, has_constant="add")
+    ln_price = np.asarray(hedonic_pkg["model"].predict(X_new), dtype=float)
+    return ln_price if np.ndim(X) == 2 else ln_price[0]
+
+
+def check_hedonic_slim(source_path=HEDONIC_PKL, slim_path=HEDONIC_SLIM, X=None, rtol=1e-10):
+    """원본 statsmodels predict vs 경량 스코어러 최대 상대오차 (기본: 학습 설계행렬 전체)"""
+    import pickle
+
+    with open(source_path, "rb") as f:
+        pkg = pickle.load(f)
+    slim = hedonic_slim_package(load_slim(slim_path, source_path))
+
+    if X is None:
+        model = pkg["model"].model
+        exog = np.asarray(model.exog, dtype=float)
+        names = list(model.exog_names)
+        X = exog[:, [names.index(f) for f in slim["selected_features"]]]
+
+    ref = np.exp(hedonic_predict_ln(pkg, X))
+    got = np.exp(hedonic_predict_ln(slim, X))
+    max_rel = float(np.max(np.abs(got - ref) / np.abs(ref)))
+    return max_rel, max_rel <= rtol
+
+
+# ==========================================
+# 경매 위험: P(y=1) = sigmoid(WoE @ coef + intercept)
+# ==========================================
+def export_auction_slim(source_path=AUCTION_PKL, slim_path=AUCTION_SLIM):
+    """hwagok_auction_risk_model.pkl(sklearn LogisticRegression + WoE 설정) → 계수/절편/구간/WoE 표"""
+    import joblib
+
+    pkg = joblib.load(source_path)
+    model = pkg["model"]
+    features = list(pkg["features"])
+
+    # predict_proba[:, 1]이 양성 클래스(1)인지 확인
+    if list(model.classes_) != [0, 1]:
+        raise ValueError(f"이진 분류(0/1) 모델만 지원합니다: classes_={list(model.classes_)}")
+
+    slim = {
+        "kind": "woe_logistic",
+        "source_sha256": file_sha256(source_path),
+        "features": features,
+        "coef": [float(c) for c in model.coef_[0]],
+        "intercept": float(model.intercept_[0]),
+        # JSON에 ±inf는 Infinity로 저장 (Python json으로 왕복 가능)
+        "bins_config": {col: [float(e) for e in pkg["bins_config"][col]] for col in features},
+        "woe_maps": {col: [[int(k), float(v)] for k, v in pkg["woe_maps"][col].items()] for col in features},
+    }
+    _write_json(slim, slim_path)
+    return slim
+
+
+def auction_slim_package(slim):
+    """JSON 아티팩트 → load_assets의 auction_pkg 형태 (model 대신 coef/intercept 배열)"""
+    return {
+        "features": list(slim["features"]),
+        "bins_config": {col: list(edges) for col, edges in slim["bins_config"].items()},
+        "woe_maps": {col: {int(k): float(v) for k, v in pairs} for col, pairs in slim["woe_maps"].items()},
+        "coef": np.asarray(slim["coef"], dtype=float),
+        "intercept": float(slim["intercept"]),
+    }
+
+
+def sigmoid(z):
+    """overflow 없는 1 / (1 + exp(-z))"""
+    z = np.asarray(z, dtype=float)
+    return np.exp(-np.logaddexp(0.0, -z))
+
+
+def auction_predict_proba(auction_pkg, W):
+    """
+    (n, 변수 수) 또는 (변수 수,) WoE 배열 → 경매 확률 P(y=1).
+    경량 패키지면 NumPy 시그모이드, 원본 패키지면 sklearn predict_proba.
+    """
+    W = np.asarray(W, dtype=float)
+    if "coef" in auction_pkg:
+        return sigmoid(W @ auction_pkg["coef"] + auction_pkg["intercept"])
+
+    prob = auction_pkg["model"].predict_proba(np.atleast_2d(W))[:, 1]
+    return prob if W.ndim == 2 else prob[0]
+
+
+def check_auction_slim(df_features, source_path=AUCTION_PKL, slim_path=AUCTION_SLIM, atol=1e-12):
+    """
+    원본 sklearn 모델 vs 경량 스코어러 최대 절대오차.
+    df_features: features 컬럼(effective_LTV 등)을 가진 표 (예: 전세 테이블 전체)
+    """
+    import joblib
+    from tracka_final import compile_woe_tables, woe_transform
+
+    pkg = joblib.load(source_path)
+    slim = auction_slim_package(load_slim(slim_path, source_path))
+
+    X = df_features[pkg["features"]].to_numpy(dtype=float)
+    W_ref = woe_transform(compile_woe_tables(pkg), X)
+    W_got = woe_transform(compile_woe_tables(slim), X)
+
+    ref = auction_predict_proba(pkg, W_ref)
+    got = auction_predict_proba(slim, W_got)
+    max_abs = float(np.max(np.abs(got - ref))) if len(X) else 0.0
+    return max_abs, max_abs <= atol
+
+
+if __name__ == "__main__":
+    export_hedonic_slim()
+    max_rel, ok = check_hedonic_slim()
+    print(f"[hedonic] {HEDONIC_SLIM.name}: max rel err {max_rel:.3e} ({'OK' if ok else 'MISMATCH'})")
+
+    export_auction_slim()
+    lease_csv = BASE_DIR / "data" / "MD2_final.csv"
+    if lease_csv.exists():
+        from asset_bundle import load_table
+
+        df_lease = load_table(lease_csv, dtype={"PNU": str})
+        missing = [c for c in auction_slim_package(load_slim(AUCTION_SLIM, AUCTION_PKL))["features"] if c not in df_lease]
+        if missing:
+            print(f"[auction] {AUCTION_SLIM.name}: 전세 테이블에 {missing} 컬럼이 없어 검증 생략")
+        else:
+            max_abs, ok = check_auction_slim(df_lease)
+            print(f"[auction] {AUCTION_SLIM.name}: {len(df_lease)} rows, max abs err {max_abs:.3e} ({'OK' if ok else 'MISMATCH'})")
+    else:
+        print(f"[auction] {AUCTION_SLIM.name}: {lease_csv.name} 없음, 검증 생략")
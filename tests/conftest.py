@@ -0,0 +1,64 @@
+# 저장소 루트의 평탄한 모듈(tracka_final, trackb_final, ...)을 import할 수 있게
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+# DATA_DIR에 묶인 tracka_final 로더 캐시 (데이터 폴더를 바꿀 때 비움)
+TRACKA_CACHES = [
+    "load_assets", "load_pnu_index", "load_jibun_index", "load_jibun_keys",
+    "load_lease_spatial_index", "load_pnu_spatial_features", "asset_version",
+]
+
+
+def synthetic_lease_frame(pnu_location, n=3000, seed=0):
+    """MD2_final.csv 형태의 합성 전세 테이블: PNU_location 좌표 주변에 흩뿌림"""
+    rng = np.random.default_rng(seed)
+    loc = pnu_location.dropna(subset=["위도", "경도"]).reset_index(drop=True)
+    pick = loc.iloc[rng.integers(0, len(loc), n)]
+    return pd.DataFrame({
+        "PNU": pick["PNU"].to_numpy(),
+        "위도": pick["위도"].to_numpy() + rng.normal(0, 0.002, n),
+        "경도": pick["경도"].to_numpy() + rng.normal(0, 0.002, n),
+        "Residual": rng.normal(0, 0.3, n),
+        "경매_4년이내": (rng.random(n) < 0.15).astype(int),
+        "local_morans_i": rng.normal(0, 0.05, n),
+    })
+
+
+@pytest.fixture(scope="session")
+def synthetic_data_dir(tmp_path_factory):
+    """저장소 data/의 MD1 / PNU_location + 합성 MD2 (MD2_final.csv는 저장소에 없음). 원본이나 모델이 없으면 skip"""
+    data_dir, models_dir = ROOT / "data", ROOT / "models"
+    needed = [data_dir / "MD1_final.csv", data_dir / "PNU_location.csv",
+              models_dir / "hedonic_model.pkl", models_dir / "hwagok_auction_risk_model.pkl"]
+    missing = [p.name for p in needed if not p.exists()]
+    if missing:
+        pytest.skip(f"데이터 / 모델 없음: {missing}")
+
+    out = tmp_path_factory.mktemp("data")
+    for name in ["MD1_final.csv", "PNU_location.csv"]:
+        (out / name).symlink_to(data_dir / name)
+    pnu_location = pd.read_csv(data_dir / "PNU_location.csv", dtype={"PNU": str})
+    synthetic_lease_frame(pnu_location).to_csv(out / "MD2_final.csv", index=False)
+    return out
+
+
+@pytest.fixture
+def tracka_data(synthetic_data_dir, monkeypatch):
+    """tracka_final.DATA_DIR을 synthetic_data_dir로 바꾸고 로더 캐시를 앞뒤로 비움"""
+    import tracka_final as ta
+
+    def clear():
+        for name in TRACKA_CACHES:
+            getattr(ta, name).cache_clear()
+
+    clear()
+    monkeypatch.setattr(ta, "DATA_DIR", synthetic_data_dir)
+    yield synthetic_data_dir
+    clear()
@@ -0,0 +1,25 @@
+import numpy as np
+import pandas as pd
+
+import asset_bundle as ab
+
+
+# ---------------------------
+# 쓰기 → 읽기 왕복: 값과 dtype 보존
+# ---------------------------
+def test_table_bundle_round_trip_keeps_dtypes(tmp_path):
+    df = pd.DataFrame({
+        "PNU": ["1150010300110670001", None, "1150010300103660050"],
+        "price": [27000.5, np.nan, 12500.0],
+        "floor": np.array([4, 3, 2], dtype=np.int64),
+        "is_basement": [False, True, False],
+        "has_view": pd.array([True, None, False], dtype="boolean"),
+    })
+    csv_path = tmp_path / "table.csv"
+    ab.write_table_bundle(df, csv_path, tmp_path / "bundle")
+    for mmap in (True, False):
+        out = ab.read_table_bundle(csv_path, tmp_path / "bundle", mmap=mmap)
+        assert out.dtypes.to_dict() == df.dtypes.to_dict()
+        assert not out["is_basement"].iloc[0]
+
+    pd.testing.assert_frame_equal(out, df)
@@ -0,0 +1,81 @@
+import pandas as pd
+import pytest
+
+import juso_index as ji
+
+
+# ---------------------------
+# 로컬 주소 색인: 주소DB 행 → 빌드 → 검색
+# ---------------------------
+def _export_row(rn, main, sub="0", emd="화곡동", lnbr="1067", lnbr_sub="1", bd_nm="", bd_kd="0", udrt="0"):
+    row = dict.fromkeys(ji.JUSO_EXPORT_COLUMNS, "")
+    row.update({
+        "bdMgtSn": f"1150010300{main:0>5}{sub:0>5}",
+        "admCd": "1150010300",
+        "siNm": "서울특별시", "sggNm": "강서구", "emdNm": emd,
+        "mtYn": "0", "lnbrMnnm": lnbr, "lnbrSlno": lnbr_sub,
+        "rnMgtSn": "115003000001", "rn": rn, "udrtYn": udrt,
+        "buldMnnm": main, "buldSlno": sub, "zipNo": "07700",
+        "bdKdcd": bd_kd, "bdNm": bd_nm,
+    })
+    return row
+
+
+def _export_frame():
+    return pd.DataFrame([
+        _export_row("화곡로", "12", bd_nm="우장산롯데캐슬", bd_kd="1"),
+        _export_row("화곡로", "12", "3", lnbr_sub="2"),
+        _export_row("화곡로", "123", lnbr="1068", lnbr_sub="0"),
+        _export_row("화곡로1길", "7", emd="등촌동", lnbr="600", lnbr_sub="5"),
+        _export_row("강서로", "5", udrt="1", lnbr="366", lnbr_sub="50"),
+    ], columns=ji.JUSO_EXPORT_COLUMNS)
+
+
+def test_local_search_returns_export_row_for_exact_road_address():
+    records = ji.juso_records(_export_frame())
+    index = ji.make_juso_index(records)
+
+    assert set(records["roadAddr"]) == {
+        "서울특별시 강서구 화곡로 12 (화곡동, 우장산롯데캐슬)",
+        "서울특별시 강서구 화곡로 12-3 (화곡동)",
+        "서울특별시 강서구 화곡로 123 (화곡동)",
+        "서울특별시 강서구 화곡로1길 7 (등촌동)",
+        "서울특별시 강서구 강서로 지하 5 (화곡동)",
+    }
+    for _, record in records.iterrows():
+        resp = ji.local_search(index, record["roadAddr"])
+        assert resp["ok"] and resp["totalCount"] == 1, record["roadAddr"]
+        assert resp["juso"][0] == record.to_dict()
+
+    # 숫자 토큰 "12"는 12 / 12-3만 (123 제외), 건물명은 중간 일치
+    hits = ji.local_search(index, "화곡로 12")
+    assert [j["roadAddr"] for j in hits["juso"]] == [
+        "서울특별시 강서구 화곡로 12 (화곡동, 우장산롯데캐슬)",
+        "서울특별시 강서구 화곡로 12-3 (화곡동)",
+    ]
+    assert ji.local_search(index, "롯데")["juso"][0]["lnbrSlno"] == "1"
+    assert ji.local_search(index, "화곡로", page=2, count=2)["juso"][0]["roadAddr"].startswith("서울특별시 강서구 화곡로 123")
+    assert ji.local_search(index, "없는길")["totalCount"] == 0
+    assert ji.local_search(index, "  ")["errorCode"] == "E0005"
+
+
+def test_search_local_backend_reads_built_index(tmp_path):
+    export = _export_frame()
+    path = tmp_path / "주소_서울특별시.txt"
+    path.write_bytes("\n".join("|".join(row) for row in export.itertuples(index=False)).encode(ji.JUSO_EXPORT_ENCODING))
+    bundle_dir = tmp_path / "bundle"
+
+    with pytest.raises(ValueError):
+        ji.search("화곡로 12", backend="local", bundle_dir=bundle_dir)
+    with pytest.raises(ValueError):
+        ji.search("화곡로 12", backend="nowhere", bundle_dir=bundle_dir)
+
+    ji.build_juso_index(path, bundle_dir=bundle_dir)
+    try:
+        expected = ji.juso_records(export)
+        road_addr = expected["roadAddr"].iloc[0]
+        for backend in ("local", "auto"):
+            resp = ji.search(road_addr, backend=backend, bundle_dir=bundle_dir)
+            assert resp["totalCount"] == 1 and resp["juso"][0] == expected.iloc[0].to_dict()
+    finally:
+        ji.load_juso_index.cache_clear()
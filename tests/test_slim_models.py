@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import slim_models as sm
+
+
+# ---------------------------
+# 경량 아티팩트 vs 원본 pkl (배포된 모델이 있을 때만)
+# ---------------------------
+def _require(source_path, slim_path, module):
+    if not (source_path.exists() and slim_path.exists()):
+        pytest.skip(f"{source_path.name} / {slim_path.name} 없음")
+    pytest.importorskip(module)
+    if sm.load_slim(slim_path, source_path) is None:
+        pytest.fail(f"{slim_path.name}이 {source_path.name}과 맞지 않습니다 (python slim_models.py로 재생성)")
+
+
+def test_hedonic_slim_matches_pkl():
+    _require(sm.HEDONIC_PKL, sm.HEDONIC_SLIM, "statsmodels")
+    max_rel, ok = sm.check_hedonic_slim()
+    assert ok, max_rel
+
+
+def test_auction_slim_matches_pkl():
+    _require(sm.AUCTION_PKL, sm.AUCTION_SLIM, "sklearn")
+    slim = sm.load_slim(sm.AUCTION_SLIM, sm.AUCTION_PKL)
+
+    # 각 변수의 모든 구간 + 경계값 + NaN을 덮는 입력
+    rng = np.random.default_rng(0)
+    columns = {}
+    for col in slim["features"]:
+        e = np.asarray(slim["bins_config"][col], dtype=float)
+        finite = e[np.isfinite(e)]
+        span = finite[-1] - finite[0]
+        values = np.concatenate([
+            rng.uniform(finite[0] - span, finite[-1] + span, 2000), finite, [np.nan],
+        ])
+        columns[col] = rng.permutation(np.resize(values, 2100))
+    max_abs, ok = sm.check_auction_slim(pd.DataFrame(columns))
+    assert ok, max_abs
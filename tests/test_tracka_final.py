@@ -0,0 +1,221 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import tracka_final as ta
+
+
+# ---------------------------
+# predict_final 결과 캐시: 키 정규화 / 적중 계층
+# ---------------------------
+def test_predict_cache_key_keeps_fractional_deposit():
+    assert ta.predict_cache_key("366-50", 29.94, 4, 15000.5) != ta.predict_cache_key("366-50", 29.94, 4, 15000.9)
+    assert ta.predict_cache_key("366-050", 29.94, 4.0, 27000) == ta.predict_cache_key("366-50", 29.94, 4, 27000.0)
+
+
+def test_predict_cache_counts_disk_hit_with_frozen_clock(monkeypatch, tmp_path):
+    calls = []
+
+    def fake_predict_final(jibun, area_m2, floor, deposit):
+        calls.append(deposit)
+        return {"prob": deposit / 1e5}, ["ok"]
+
+    monkeypatch.setattr(ta, "predict_final", fake_predict_final)
+    monkeypatch.setattr(ta.time, "time", lambda: 1_700_000_000.0)
+    monkeypatch.setattr(ta, "_predict_cache_stats", {k: 0 for k in ta._predict_cache_stats})
+    ta.clear_predict_cache()
+
+    first = ta.predict_final_cached("366-50", 29.94, 4, 27000, disk=True, cache_dir=tmp_path)
+    ta.clear_predict_cache()
+    second = ta.predict_final_cached("366-50", 29.94, 4, 27000, disk=True, cache_dir=tmp_path)
+    ta.clear_predict_cache()
+
+    assert first == second and calls == [27000]
+    info = ta.predict_cache_info()
+    assert (info["misses"], info["disk_hits"]) == (1, 1)
+
+
+# ---------------------------
+# 지번 자동완성 / 즉시 검증
+# ---------------------------
+def test_suggest_jibun_prefixes_and_unknown_input():
+    keys = sorted(ta.jibun_key(j) for j in ["106", "106-1", "1060-3", "1061", "1067-1", "1067-2", "1067-12", "107", "9999-9999"])
+
+    assert ta.suggest_jibun("106", keys=keys) == ["106", "106-1", "1060-3", "1061", "1067-1", "1067-2", "1067-12"]
+    assert ta.suggest_jibun(" 106 ", limit=2, keys=keys) == ["106", "106-1"]
+    assert ta.suggest_jibun("1067-", keys=keys) == ["1067-1", "1067-2", "1067-12"]
+    assert ta.suggest_jibun("1067-1", keys=keys) == ["1067-1", "1067-12"]
+    assert ta.suggest_jibun("9999-9999", keys=keys) == ["9999-9999"]
+    for prefix in ["108", "1067-3", "", "-", "-1", "0", "abc", "12345", "1067-01", "1067-1-2", "1067-12345", None]:
+        assert ta.suggest_jibun(prefix, keys=keys) == [], prefix
+
+    for jibun in ["106", "106-0", "1067-1", "1067-01", " 1067-12 ", "9999-9999"]:
+        assert ta.is_known_jibun(jibun, keys=keys), jibun
+    for jibun in ["108", "1067-3", "1067-", "abc", "1-2-3", "10000", "", None]:
+        assert not ta.is_known_jibun(jibun, keys=keys), jibun
+
+
+def test_suggest_jibun_candidates_are_known(tracka_data):
+    keys = ta.load_jibun_index()
+    for prefix in ["1", "10", "106", ta.format_jibun(keys[len(keys) // 2]).split("-")[0] + "-"]:
+        suggestions = ta.suggest_jibun(prefix, limit=50)
+        assert suggestions and all(ta.is_known_jibun(j) for j in suggestions), prefix
+        assert all(j.startswith(prefix) for j in suggestions), prefix
+
+
+# ---------------------------
+# 배치 예측: predict_final과 행별 계약 일치
+# ---------------------------
+def test_predict_final_batch_empty_frame():
+    empty = pd.DataFrame({"jibun": [], "area_m2": [], "floor": [], "deposit": []})
+    out = ta.predict_final_batch(empty)
+    assert out.empty and "error_code" in out.columns and "prob" in out.columns
+    assert ta.ltno_to_pnu_batch([]).empty
+
+
+def test_predict_final_batch_matches_single_row(tracka_data):
+    df_trade = pd.read_csv(tracka_data / "MD1_final.csv", dtype={"PNU": str})
+    located = set(pd.read_csv(tracka_data / "PNU_location.csv", dtype={"PNU": str})["PNU"])
+    known = [ta.format_jibun(k) for k in ta.load_jibun_index()[::150]]
+    no_location = next(
+        ta.format_jibun(int(p[11:15]) * 10000 + int(p[15:19]))
+        for p in df_trade["PNU"].dropna().unique()
+        if p.startswith(ta.JIBUN_DONG_CODE + "1") and p not in located
+    )
+
+    rows = [(j, 59.5, 3, 20000) for j in known] + [
+        (known[0], 33.1, 12, 31000.5),
+        (known[1], "45.2", "2", "15000"),
+        ("abc", 59.5, 3, 20000),
+        ("1-2-3", 59.5, 3, 20000),
+        (None, 59.5, 3, 20000),
+        ("9999-9999", 59.5, 3, 20000),
+        (no_location, 59.5, 3, 20000),
+        (known[0], np.nan, 3, 20000),
+        (known[0], 59.5, np.nan, 20000),
+        (known[0], 59.5, 3, np.inf),
+        (known[0], "넓음", 3, 20000),
+    ]
+    listings = pd.DataFrame(rows, columns=["jibun", "area_m2", "floor", "deposit"])
+    out = ta.predict_final_batch(listings)
+
+    assert list(out["error_code"].iloc[-9:]) == [
+        ta.ERR_INVALID_JIBUN, ta.ERR_INVALID_JIBUN, ta.ERR_INVALID_JIBUN,
+        ta.ERR_NO_TRADE, ta.ERR_NO_LOCATION,
+        ta.ERR_INVALID_INPUT, ta.ERR_INVALID_INPUT, ta.ERR_INVALID_INPUT, ta.ERR_INVALID_INPUT,
+    ]
+    for (jibun, area, floor, deposit), (_, row) in zip(rows, out.iterrows()):
+        try:
+            result, _ = ta.predict_final(jibun, area, floor, deposit)
+        except ValueError:
+            assert row["error_code"] is not None, (jibun, area, floor, deposit)
+            assert pd.isna(row["prob"]) and pd.isna(row["grade"])
+            continue
+        assert row["error_code"] is None, (jibun, area, floor, deposit)
+        assert row["prob"] == result["prob"] and row["grade"] == result["grade"]
+        assert row["V0"] == pytest.approx(result["V0"], rel=1e-9)
+
+
+# ---------------------------
+# 전세 공간 인덱스: 전수 cdist(create_logistic_features 기본 경로)와 같은 결과
+# ---------------------------
+def _lease_frame(n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    lat = 37.55 + rng.uniform(-0.02, 0.02, n)
+    lon = 126.85 + rng.uniform(-0.02, 0.02, n)
+    # 같은 좌표 중복(최근접 동률) + 좌표 / Residual NaN 행
+    lat[10:20], lon[10:20] = lat[0], lon[0]
+    lat[30] = np.nan
+    residual = rng.normal(0, 0.3, n)
+    residual[40] = np.nan
+    return pd.DataFrame({
+        "위도": lat,
+        "경도": lon,
+        "Residual": residual,
+        "경매_4년이내": (rng.random(n) < 0.2).astype(int),
+        "local_morans_i": rng.normal(0, 0.05, n),
+    })
+
+
+def test_lease_spatial_index_matches_brute_force():
+    df = _lease_frame()
+    index = ta.build_lease_spatial_index(df)
+    rng = np.random.default_rng(1)
+    q_lat = np.concatenate([[df["위도"][0]], df["위도"].dropna()[:50], 37.55 + rng.uniform(-0.03, 0.03, 150)])
+    q_lon = np.concatenate([[df["경도"][0]], df["경도"].dropna()[:50], 126.85 + rng.uniform(-0.03, 0.03, 150)])
+    # 정확히 1km 동쪽 (반경 '<' 경계)
+    q_lat = np.append(q_lat, df["위도"][1])
+    q_lon = np.append(q_lon, df["경도"][1] + 1.0 / ta.KM_SCALE[0])
+
+    nearby, morans = ta.query_lease_spatial_index(index, q_lat, q_lon, threshold_km=1)
+    for i in range(len(q_lat)):
+        brute = ta.create_logistic_features(df, 10_000, 20_000, q_lat[i], q_lon[i])
+        assert nearby[i] == brute["nearby_auction_1km"], i
+        assert morans[i] == brute["local_morans_i"], i
+
+
+# ---------------------------
+# WoE 변환: pd.cut(include_lowest=True) 구간 판정과 같음
+# ---------------------------
+def test_woe_transform_matches_pd_cut():
+    pkg = {
+        "features": ["ltv", "nearby", "open"],
+        "bins_config": {
+            "ltv": [0.0, 50.0, 80.0, 100.0, 150.0],
+            "nearby": [-0.5, 0.5, 2.5, 10.5],
+            "open": [-np.inf, -1.0, 0.0, 1.0, np.inf],
+        },
+        "woe_maps": {
+            "ltv": {0: -0.8, 1: -0.1, 2: 0.4, 3: 1.2},
+            "nearby": {0: -0.3, 2: 0.9},          # 1번 구간 없음 → 0
+            "open": {0: 0.5, 1: -0.5, 2: 0.25, 3: -0.25},
+        },
+    }
+    tables = ta.compile_woe_tables(pkg)
+
+    X = {}
+    for col in pkg["features"]:
+        e = np.asarray(pkg["bins_config"][col], dtype=float)
+        finite = e[np.isfinite(e)]
+        mids = (finite[:-1] + finite[1:]) / 2
+        X[col] = np.concatenate([e, np.nextafter(e, -np.inf), np.nextafter(e, np.inf), mids,
+                                 [finite[0] - 100, finite[-1] + 100, np.nan, -np.inf, np.inf]])
+    n = max(len(v) for v in X.values())
+    X = np.column_stack([np.resize(X[col], n) for col in pkg["features"]])
+
+    expected = np.empty_like(X)
+    for j, col in enumerate(pkg["features"]):
+        bins = pd.cut(X[:, j], bins=pkg["bins_config"][col], labels=False, include_lowest=True)
+        expected[:, j] = [0.0 if np.isnan(b) else pkg["woe_maps"][col].get(int(b), 0) for b in bins]
+
+    np.testing.assert_array_equal(ta.woe_transform(tables, X), expected)
+    np.testing.assert_array_equal(ta.woe_transform(tables, X[3]), expected[3])
+
+
+# ---------------------------
+# PNU별 공간 변수: 증분 갱신 = 합친 전세 테이블로 전체 재계산
+# ---------------------------
+def test_update_pnu_spatial_features_matches_full_rebuild():
+    rng = np.random.default_rng(2)
+    lease = _lease_frame(600, seed=3)
+    n_pnu = 300
+    pnu_location = pd.DataFrame({
+        "PNU": [f"115001030010{i:03d}0000" for i in range(n_pnu)],
+        "위도": 37.55 + rng.uniform(-0.025, 0.025, n_pnu),
+        "경도": 126.85 + rng.uniform(-0.025, 0.025, n_pnu),
+    })
+    # 신규 PNU (기존 features에 없음) + 중복 PNU 행
+    old_location = pnu_location.iloc[:250]
+    pnu_location = pd.concat([pnu_location, pnu_location.iloc[[5]]], ignore_index=True)
+
+    old, new = lease.iloc[:500], lease.iloc[500:]
+    features = ta.build_pnu_spatial_features(old_location, ta.build_lease_spatial_index(old))
+    full_index = ta.build_lease_spatial_index(lease)
+
+    updated, affected = ta.update_pnu_spatial_features(features, pnu_location, full_index, new)
+    rebuilt = ta.build_pnu_spatial_features(pnu_location, full_index)
+
+    assert 0 < len(affected) < len(updated)
+    assert set(pnu_location["PNU"].iloc[250:300]) <= set(affected)
+    cols = ["PNU", "nearby_auction_1km", "local_morans_i", "nearest_km"]
+    pd.testing.assert_frame_equal(updated[cols].reset_index(drop=True), rebuilt[cols].reset_index(drop=True))
@@ -0,0 +1,375 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import trackb_final as tb
+
+
+def _listings(n=200, seed=0):
+    rng = np.random.default_rng(seed)
+    V0 = rng.uniform(10_000, 80_000, n)
+    B = V0 * rng.uniform(0.5, 1.2, n)
+    T = rng.choice([1.0, 2.0, 3.0, 4.0], n)
+    return V0, B, T
+
+
+# ---------------------------
+# Merton: sigma 기본값 (점프 분산 이중 계산 없음)
+# ---------------------------
+def test_merton_default_sigma_small_lambda_close_to_gbm():
+    V0, B, T = _listings()
+    jump = {"lam": 1e-4, "mu_j": -0.15, "delta": 0.10}
+    gbm = tb.trackB_risk_arrays(V0, B, T, model="gbm", first_passage=False)
+    mer = tb.trackB_risk_arrays(V0, B, T, model="merton", jump=jump)
+    for s in tb.SCENARIOS:
+        np.testing.assert_allclose(mer[f"PD_{s}"], gbm[f"PD_{s}"], atol=1e-4)
+        np.testing.assert_allclose(mer[f"EL_{s}"], gbm[f"EL_{s}"], rtol=1e-3, atol=1e-2)
+
+
+def test_merton_default_sigma_is_diffusion_part():
+    V0, B, T = _listings(50)
+    default = tb.trackB_risk_arrays(V0, B, T, model="merton")
+    explicit = tb.trackB_risk_arrays(V0, B, T, model="merton", sigma=tb.JUMP_SIGMA_DIFFUSION)
+    for name in default:
+        np.testing.assert_array_equal(default[name], explicit[name])
+
+    df = pd.DataFrame({"hedonic_price": V0, "deposit": B, "term": T})
+    out = tb.add_trackB_risk_columns(df, model="merton")
+    np.testing.assert_array_equal(out["PD_base"].to_numpy(), explicit["PD_base"])
+
+
+def test_merton_default_total_variance_matches_gbm():
+    # 기본 점프(lam=0.1)라도 총 분산은 GBM과 같음 → PD 차이는 꼬리 모양 차이뿐
+    # (확산 sigma에 SIGMA_ANNUAL을 그대로 쓰면 최대 0.006까지 부풀어 실패)
+    V0, B, T = _listings()
+    gbm = tb.trackB_risk_arrays(V0, B, T, model="gbm", first_passage=False)
+    mer = tb.trackB_risk_arrays(V0, B, T, model="merton")
+    np.testing.assert_allclose(mer["PD_base"], gbm["PD_base"], atol=3e-3)
+
+
+# ---------------------------
+# trackB_evaluate: 불확실성 범위는 키의 mu / sigma를 설명해야 함
+# ---------------------------
+def test_trackB_evaluate_band_follows_mu_sigma(monkeypatch):
+    rng = np.random.default_rng(0)
+    ref = {"MU_HAT": 0.01, "MU_ANNUAL": 0.02, "SIGMA_ANNUAL": 0.25, "source": "market_params.json:all:ewma"}
+    draws = {
+        "mu": 0.02 + 0.01 * rng.standard_normal(1000),
+        "sigma": 0.25 * np.exp(0.05 * rng.standard_normal(1000)),
+        "source": "market_params.json:all:ewma:bootstrap",
+    }
+    monkeypatch.setattr(tb, "load_market_params", lambda *a, **k: ref)
+    monkeypatch.setattr(tb, "load_market_param_draws", lambda *a, **k: draws)
+    tb.clear_trackB_memo()
+    try:
+        res = tb.trackB_evaluate(30000.0, 22000.0, 2.0, mu=-0.05, sigma=0.40)
+    finally:
+        tb.clear_trackB_memo()
+    assert res["band"]["PD_base_q05"] <= res["row"]["PD_base"] <= res["band"]["PD_base_q95"]
+
+
+def test_trackB_evaluate_hides_band_without_market_cache(monkeypatch):
+    draws = tb.param_posterior_draws(tb.MU_HAT, tb.SIGMA_ANNUAL)
+    monkeypatch.setattr(
+        tb, "load_market_param_draws", lambda *a, **k: {"mu": draws[0], "sigma": draws[1], "source": "constants:posterior(36m)"}
+    )
+    tb.clear_trackB_memo()
+    try:
+        res = tb.trackB_evaluate(30000.0, 22000.0, 2.0, tb.MU_ANNUAL, tb.SIGMA_ANNUAL)
+    finally:
+        tb.clear_trackB_memo()
+    assert res["band"] == {}
+
+
+# ---------------------------
+# norm_logcdf: numpy 커널 vs scipy.special.log_ndtr
+# ---------------------------
+def test_norm_logcdf_numpy_kernel_matches_scipy(monkeypatch):
+    special = pytest.importorskip("scipy.special")
+    monkeypatch.setattr(tb, "NORM_CDF_BACKEND", "numpy")
+    # (구간, 허용 상대오차 = docstring 상한 + scipy 자체 오차 여유)
+    for x, rtol in [
+        (-np.logspace(-3, 4, 4001), 2e-15),
+        (np.linspace(-40.0, 0.0, 8001), 2e-15),
+        (np.linspace(0.0, 8.0, 8001), 4e-14),
+        (np.linspace(8.0, 37.0, 8001), 8e-13),  # scipy는 x > 37.5 부터 subnormal을 0으로
+    ]:
+        np.testing.assert_allclose(tb.norm_logcdf(x), special.log_ndtr(x), rtol=rtol, atol=0)
+
+
+# ---------------------------
+# 거래 이력 추정치 캐시: MD1 원본 freshness
+# ---------------------------
+def _trade_frame(mp, n_months, start=0, seed=0):
+    rng = np.random.default_rng(seed)
+    months = [f"{2015 + k // 12}-{k % 12 + 1:02d}-15" for k in range(start, start + n_months)]
+    return pd.DataFrame({
+        "PNU": "1150010300110670001",
+        mp.DATE_COL: np.repeat(months, 5),
+        mp.PRICE_COL: np.exp(10 + rng.normal(0, 0.1, 5 * n_months)).round(),
+    })
+
+
+def _load_market(path):
+    tb.load_market_params.cache_clear()
+    tb.load_market_param_draws.cache_clear()
+    try:
+        return tb.load_market_params(path=path), tb.load_market_param_draws(path=path)
+    finally:
+        tb.load_market_params.cache_clear()
+        tb.load_market_param_draws.cache_clear()
+
+
+def test_market_params_cache_ignored_when_source_changes(tmp_path):
+    import market_params as mp
+
+    trade_csv = tmp_path / "MD1_final.csv"
+    _trade_frame(mp, 48).to_csv(trade_csv, index=False)
+    mp.build_market_params(trade_csv, tmp_path / "bundle", group_by=None)
+    path = mp.market_params_path(tmp_path / "bundle")
+
+    params, draws = _load_market(path)
+    assert params["source"].startswith(mp.MARKET_PARAMS_FILE)
+    assert draws["source"].endswith(":bootstrap")
+
+    # 기존 행 수정 (append가 아님) → 상수로 대체
+    _trade_frame(mp, 48, seed=1).to_csv(trade_csv, index=False)
+    params, draws = _load_market(path)
+    assert params["source"] == "constants" and params["SIGMA_ANNUAL"] == tb.SIGMA_ANNUAL
+    assert draws["source"].startswith("constants")
+    assert mp.load_market_params_cache(path) is None
+
+
+def test_market_params_cache_survives_monthly_delta_appended_to_md1(tmp_path):
+    import market_params as mp
+
+    trade_csv = tmp_path / "MD1_final.csv"
+    delta_csv = tmp_path / "incoming" / "new_trades.csv"
+    delta_csv.parent.mkdir()
+    bundle_dir = tmp_path / "bundle"
+    _trade_frame(mp, 48).to_csv(trade_csv, index=False)
+    mp.build_market_params(trade_csv, bundle_dir, group_by=None)
+    path = mp.market_params_path(bundle_dir)
+
+    # 델타 반영 → MD1 끝에 이어 붙임 → 델타 파일 삭제
+    delta = _trade_frame(mp, 1, start=48, seed=2)
+    delta.to_csv(delta_csv, index=False)
+    mp.update_market_params(delta_csv, bundle_dir)
+    delta.to_csv(trade_csv, mode="a", header=False, index=False)
+    delta_csv.unlink()
+
+    payload = mp.load_market_params_cache(path)
+    assert payload is not None
+    assert payload["watermark"] == {"n_rows": 245, "last_month": "2019-01"}
+    assert payload["deltas"][-1]["name"] == "new_trades.csv"
+    params, draws = _load_market(path)
+    assert params["source"].startswith(mp.MARKET_PARAMS_FILE)
+    assert draws["source"].endswith(":bootstrap")
+
+    # 다음 달 델타(DataFrame)도 그대로 누적, 결과는 합친 이력 전체 빌드와 같음
+    delta = _trade_frame(mp, 1, start=49, seed=3)
+    mp.update_market_params(delta, bundle_dir)
+    delta.to_csv(trade_csv, mode="a", header=False, index=False)
+    incremental = mp.load_market_params_cache(path)
+    assert incremental["watermark"]["last_month"] == "2019-02"
+    full = mp.build_market_params(trade_csv, tmp_path / "full", group_by=None)
+    assert incremental["estimates"]["all"]["ewma"]["mu"] == pytest.approx(full["estimates"]["all"]["ewma"]["mu"], rel=1e-9)
+    assert incremental["estimates"]["all"]["ewma"]["sigma"] == pytest.approx(full["estimates"]["all"]["ewma"]["sigma"], rel=1e-9)
+
+
+# ---------------------------
+# 시나리오 큐브: 모양 / add_trackB_risk_columns와 같은 값
+# ---------------------------
+def test_scenario_cube_shape_and_slice_matches_risk_columns():
+    V0, B, T = _listings(40)
+    df = pd.DataFrame({"hedonic_price": V0, "deposit": B, "term": T})
+    shocks = tuple(tb.SCENARIOS.values())
+    cube = tb.trackB_scenario_cube(df, mus=(tb.MU_HAT, tb.MU_ANNUAL), sigmas=(0.2, tb.SIGMA_ANNUAL))
+    assert cube["dims"] == ("listing", "shock", "mu", "sigma")
+    assert cube["PD"].shape == (40, len(shocks), 2, 2)
+
+    ref = tb.add_trackB_risk_columns(df, mu=tb.MU_ANNUAL, first_passage=False)
+    for k, name in enumerate(tb.SCENARIOS):
+        np.testing.assert_allclose(cube["PD"][:, k, 1, 1], ref[f"PD_{name}"], rtol=1e-12)
+        np.testing.assert_allclose(cube["EL"][:, k, 1, 1], ref[f"EL_{name}"], rtol=1e-12)
+
+    by_term = tb.trackB_scenario_cube(df.drop(columns="term"), terms=[1, 2.5])
+    assert by_term["PD"].shape == (40, len(shocks), 2, 1, 2)
+    np.testing.assert_array_equal(by_term["coords"]["term"], [1.0, 2.5])
+
+
+def test_scenario_cube_empty_frame_with_terms():
+    empty = pd.DataFrame({"hedonic_price": [], "deposit": []})
+    cube = tb.trackB_scenario_cube(empty, terms=2.0)
+    assert cube["PD"].shape == (0, len(tb.SCENARIOS), 2, 1, 1)
+    np.testing.assert_array_equal(cube["coords"]["term"], [2.0])
+    assert tb.scenario_cube_to_frame(cube).empty
+
+
+# ---------------------------
+# 조회표: 폐형식과의 차이가 max_err(추정치) 이내
+# ---------------------------
+def test_trackB_table_within_max_err_of_closed_form():
+    table = tb.load_trackB_table()
+    mu, sigma, alpha, max_err = table["mu"], table["sigma"], table["alpha"], table["max_err"]
+    rng = np.random.default_rng(0)
+    n = 20_000
+    V0 = rng.uniform(1e4, 9e4, n)
+    B = V0 * np.exp(rng.uniform(*np.log(tb.TABLE_RATIO_RANGE), n))
+    T = rng.uniform(*tb.TABLE_T_RANGE, n)
+
+    pd_t, el_t = tb.pd_el_from_table(table, V0, B, T)
+    assert np.max(np.abs(pd_t - tb.pd_gbm_closed_form(V0, B, T, mu, sigma))) <= max_err["pd"]
+    el_c = tb.expected_loss_closed_form(V0, B, T, mu, sigma, alpha)
+    assert np.max(np.abs(el_t - el_c) / V0) <= max_err["el_ratio"]
+
+    # B*: 표 보간 vs 폐형식 뉴턴 역산 (충격 반영 후 상한비가 격자 안인 행)
+    shock = rng.choice(list(tb.SCENARIOS.values()), n)
+    cap = V0 * (1 + shock) * np.exp(rng.uniform(*np.log(tb.TABLE_CAP_RANGE), n))
+    b_table = tb.find_B_star_from_table(table, V0, T, shock, cap)
+    b_exact = tb.find_B_star_vectorized(V0, T, mu, sigma, alpha, shock, cap)
+    assert np.all(np.isfinite(b_exact))
+    assert np.max(np.abs(np.log(b_table / b_exact))) <= max_err["ln_b_star"] + 1e-9
+
+    # 격자 밖 / 무효 입력은 폐형식과 같은 규칙
+    pd_o, el_o = tb.pd_el_from_table(table, [5e4, 5e4, -1.0], [5e4 * 20, 5e4, 1e4], [2.0, 30.0, 2.0])
+    pd_ref = tb.pd_gbm_closed_form(np.full(2, 5e4), np.array([1e6, 5e4]), np.array([2.0, 30.0]), mu, sigma)
+    np.testing.assert_allclose(pd_o[:2], pd_ref, rtol=1e-12)
+    assert np.isnan(pd_o[2]) and np.isnan(el_o[2])
+
+
+# ---------------------------
+# B* 벡터화 역산 vs 스칼라 이분법 (tol=100)
+# ---------------------------
+def test_find_B_star_vectorized_matches_scalar():
+    rng = np.random.default_rng(4)
+    n = 300
+    V0 = rng.uniform(1e4, 9e4, n)
+    T = rng.choice([1.0, 2.0, 4.0], n)
+    shock = rng.choice(list(tb.SCENARIOS.values()), n)
+    cap = V0 * rng.uniform(0.0, 0.5, n)
+    cap[:5] = 0.0                         # EL(B_low) > 0 = 상한 → B_low
+    # 도달할 수 없는 상한(EL >= 0 > EL_CAP) / 담보 소멸 / 무효 입력 → NaN
+    cap[5:10] = -1.0
+    shock[10:13] = -1.0
+    T[13:16] = 0.0
+    V0[16:19] = np.nan
+
+    mu, sigma, alpha = tb.MU_ANNUAL, tb.SIGMA_ANNUAL, tb.ALPHA_USED
+    vec = tb.find_B_star_vectorized(V0, T, mu, sigma, alpha, shock, cap)
+    ref = np.array([
+        tb.find_B_star_by_EL_closed_form(v, t, mu, sigma, alpha, s, c)
+        for v, t, s, c in zip(V0, T, shock, cap)
+    ])
+
+    np.testing.assert_array_equal(np.isnan(vec), np.isnan(ref))
+    assert np.isnan(vec[5:19]).all() and (vec[:5] == 1.0).all()
+    ok = ~np.isnan(ref)
+    assert np.max(np.abs(vec[ok] - ref[ok])) <= 100.0
+
+
+# ---------------------------
+# 최초 도달 PD: 만기 PD 이상, 극한에서 수렴
+# ---------------------------
+def test_first_passage_pd_bounds_and_limits():
+    V0, B, T = _listings(500, seed=5)
+    mu, sigma = tb.MU_ANNUAL, tb.SIGMA_ANNUAL
+    fp = tb.pd_first_passage_closed_form(V0, B, T, mu, sigma)
+    terminal = tb.pd_gbm_closed_form(V0, B, T, mu, sigma)
+    assert np.all(fp >= terminal - 1e-15) and np.all(fp <= 1.0)
+    assert np.all(fp[V0 <= B] == 1.0)
+
+    ones = np.ones(3)
+    # T → 0: 아직 도달 못 함 → 0,   B → V0: 바로 닿음 → 1,   T → ∞ (nu < 0): 언젠가 닿음 → 1
+    assert np.all(tb.pd_first_passage_closed_form(1e5 * ones, 7e4 * ones, np.array([1e-2, 1e-4, 1e-6]), mu, sigma) < 1e-6)
+    near = tb.pd_first_passage_closed_form(1e5 * ones, 1e5 * (1 - np.array([1e-4, 1e-6, 1e-8])), 2 * ones, mu, sigma)
+    assert np.all(np.diff(near) > 0) and near[-1] > 1 - 1e-6
+    far = tb.pd_first_passage_closed_form(1e5 * ones, 7e4 * ones, np.array([1e2, 1e3, 1e4]), mu, sigma)
+    assert np.all(np.diff(far) > 0) and far[-1] > 1 - 1e-9
+    # sigma → 0: 확정적 경로의 결과로
+    np.testing.assert_allclose(
+        tb.pd_first_passage_closed_form(V0, B, T, mu, 1e-6), tb.pd_first_passage_closed_form(V0, B, T, mu, 0.0), atol=1e-9
+    )
+
+    el_fp = tb.expected_loss_first_passage(V0, B, T, mu, sigma, tb.ALPHA_USED)
+    above = V0 > B
+    np.testing.assert_allclose(el_fp[above], (1 - tb.ALPHA_USED) * B[above] * fp[above], rtol=1e-12)
+
+
+# ---------------------------
+# add_trackB_risk_columns: 입력 열을 복사하지 않고 공유, 입력 df는 그대로
+# ---------------------------
+def test_add_trackB_risk_columns_shares_input_columns():
+    V0, B, T = _listings(100, seed=6)
+    df = pd.DataFrame({"hedonic_price": V0, "deposit": B, "term": T, "memo": np.arange(100), "flag": V0 > B})
+    before = df.copy()
+    out = tb.add_trackB_risk_columns(df)
+
+    pd.testing.assert_frame_equal(df, before)
+    for col in ["hedonic_price", "deposit", "memo", "flag"]:
+        assert np.shares_memory(out[col].to_numpy(), df[col].to_numpy()), col
+    assert list(out.columns[:5]) == list(df.columns)
+    expected = ["T_years", *tb.trackB_output_names(tb.SCENARIOS, True)]
+    assert list(out.columns[5:]) == [c for c in expected if c not in df.columns]
+
+
+# ---------------------------
+# trackB_risk_arrays: out= 버퍼 / block= 분할 / dtype이 래퍼와 같은 결과
+# ---------------------------
+def test_trackB_risk_arrays_buffers_and_blocks_match_wrapper():
+    V0, B, T = _listings(1000, seed=7)
+    V0[[3, 7]] = [np.nan, -1.0]
+    df = pd.DataFrame({"hedonic_price": V0, "deposit": B, "term": T})
+    ref = tb.add_trackB_risk_columns(df)
+    names = tb.trackB_output_names()
+
+    buffers = {name: np.full(len(V0), -7.0) for name in names}
+    keep = dict(buffers)
+    got = tb.trackB_risk_arrays(V0, B, T, out=buffers, block=97)
+    for name in names:
+        assert got[name] is keep[name], name               # 넘긴 버퍼에 그대로 씀
+        np.testing.assert_array_equal(got[name], ref[name].to_numpy(), err_msg=name)
+
+    partial = {"PD_base": np.empty(len(V0))}
+    got = tb.trackB_risk_arrays(V0, B, T, out=partial, block=1)
+    assert set(got) == set(names)
+    for name in names:
+        np.testing.assert_array_equal(got[name], ref[name].to_numpy(), err_msg=name)
+
+    got32 = tb.trackB_risk_arrays(V0, B, T, dtype=np.float32, block=128)
+    for name in names:
+        assert got32[name].dtype == np.float32
+        np.testing.assert_allclose(got32[name], ref[name].to_numpy(), rtol=1e-6, atol=1e-3 if name.startswith("EL") else 1e-7)
+
+    with pytest.raises(ValueError):
+        tb.trackB_risk_arrays(V0, B, T, out={"PD_base": np.empty(10)})
+
+
+# ---------------------------
+# 파라미터 불확실성 분위수: 단조 / 점추정 포함 / 청크 무관
+# ---------------------------
+def test_trackB_param_quantiles_monotone_and_contains_point():
+    V0, B, T = _listings(300, seed=8)
+    V0[0], B[1] = np.nan, -1.0
+    draws = tb.load_market_param_draws(path="/nonexistent-market-params.json")
+    mu, sigma = tb.MU_ANNUAL, tb.SIGMA_ANNUAL
+
+    for shock in [0.0, -0.2]:
+        r = tb.trackB_param_quantiles(V0, B, T, draws["mu"], draws["sigma"], shock=shock)
+        assert np.isnan(r["PD"][:2]).all() and np.isnan(r["EL_mean"][:2]).all()
+        for key in ["PD", "EL"]:
+            q = r[key][2:]
+            assert np.all(np.diff(q, axis=1) >= 0), key
+
+        point_pd = tb.pd_gbm_closed_form(V0 * (1 + shock), B, T, mu, sigma)[2:]
+        point_el = tb.expected_loss_closed_form(V0 * (1 + shock), B, T, mu, sigma, tb.ALPHA_USED)[2:]
+        assert np.all((r["PD"][2:, 0] <= point_pd) & (point_pd <= r["PD"][2:, -1]))
+        assert np.all((r["EL"][2:, 0] <= point_el * (1 + 1e-12)) & (point_el <= r["EL"][2:, -1] * (1 + 1e-12)))
+
+        small = tb.trackB_param_quantiles(V0, B, T, draws["mu"], draws["sigma"], shock=shock, chunk_elems=7_000)
+        for key in ["PD", "EL", "PD_mean", "EL_mean"]:
+            np.testing.assert_allclose(small[key], r[key], rtol=1e-12, err_msg=key)
+
+    # 표본이 한 점이면 모든 분위수 = 점추정
+    one = tb.trackB_param_quantiles(V0, B, T, [mu] * 5, [sigma] * 5)
+    np.testing.assert_allclose(one["PD"][2:], np.repeat(tb.pd_gbm_closed_form(V0, B, T, mu, sigma)[2:, None], 3, axis=1), rtol=1e-12)
@@ -1,13 +1,29 @@
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import math
+import os
 import pickle
+import threading
+import time
 import warnings
+from bisect import bisect_left
+from collections import OrderedDict
 from pathlib import Path
 from functools import lru_cache
 
-import joblib
-import numpy as np
-import pandas as pd
-import statsmodels.api as sm
-from scipy.spatial.distance import cdist
+from lazy_import import lazy_module
+
+# 무거운 모듈은 첫 사용 시점에 import (입력 화면/주소 검색은 모델링 스택 없이 뜨도록)
+joblib = lazy_module("joblib")
+np = lazy_module("numpy")
+pd = lazy_module("pandas")
+spatial = lazy_module("scipy.spatial")
+distance = lazy_module("scipy.spatial.distance")
+asset_bundle = lazy_module("asset_bundle")
+slim_models = lazy_module("slim_models")
 
 warnings.filterwarnings("ignore")
 
@@ -47,16 +63,30 @@ def load_assets():
     Streamlit에서 import 후 여러 번 호출되어도
     데이터/모델을 프로세스당 1번만 로드하도록 캐싱.
     """
-    df_trade = pd.read_csv(DATA_DIR / "MD1_final.csv", dtype={"PNU": str})
-    df_lease = pd.read_csv(DATA_DIR / "MD2_final.csv", dtype={"PNU": str})
-    pnu_location = pd.read_csv(DATA_DIR / "PNU_location.csv", dtype={"PNU": str})
-
-    # hedonic_model.pkl: dict 형태(model, selected_features)
-    with open(MODELS_DIR / "hedonic_model.pkl", "rb") as f:
-        hedonic_pkg = pickle.load(f)
+    # 번들(python asset_bundle.py)이 있고 CSV와 일치하면 memory-map 로드, 아니면 CSV 파싱
+    df_trade = asset_bundle.load_table(DATA_DIR / "MD1_final.csv", dtype={"PNU": str})
+    df_lease = asset_bundle.load_table(DATA_DIR / "MD2_final.csv", dtype={"PNU": str})
+    pnu_location = asset_bundle.load_table(DATA_DIR / "PNU_location.csv", dtype={"PNU": str})
+
+    # hedonic_model_slim.json(python slim_models.py)이 원본 pkl과 일치하면 계수만 로드,
+    # 아니면 hedonic_model.pkl: dict 형태(model, selected_features)
+    hedonic_slim = slim_models.load_slim(MODELS_DIR / "hedonic_model_slim.json", MODELS_DIR / "hedonic_model.pkl")
+    if hedonic_slim is not None:
+        hedonic_pkg = slim_models.hedonic_slim_package(hedonic_slim)
+    else:
+        with open(MODELS_DIR / "hedonic_model.pkl", "rb") as f:
+            hedonic_pkg = pickle.load(f)
 
-    # hwagok_auction_risk_model.pkl: dict 형태(model, bins_config, woe_maps, features)
-    auction_pkg = joblib.load(MODELS_DIR / "hwagok_auction_risk_model.pkl")
+    # hwagok_auction_risk_model_slim.json이 원본 pkl과 일치하면 계수/WoE 표만 로드 (sklearn 불필요),
+    # 아니면 hwagok_auction_risk_model.pkl: dict 형태(model, bins_config, woe_maps, features)
+    auction_slim = slim_models.load_slim(
+        MODELS_DIR / "hwagok_auction_risk_model_slim.json", MODELS_DIR / "hwagok_auction_risk_model.pkl"
+    )
+    if auction_slim is not None:
+        auction_pkg = slim_models.auction_slim_package(auction_slim)
+    else:
+        auction_pkg = joblib.load(MODELS_DIR / "hwagok_auction_risk_model.pkl")
+    auction_pkg["woe_tables"] = compile_woe_tables(auction_pkg)
 
     # 전체 의심사례(분모) 계산: 경매_4년이내 == 1인 건수
     # (원하는 분모 정의가 따로 있으면 여기만 바꾸면 됨)
@@ -68,17 +98,116 @@ def load_assets():
     return df_trade, df_lease, pnu_location, hedonic_pkg, auction_pkg, total_suspected
 
 
-# ==========================================
-# 1단계: 헤도닉 예측 (매매 적정가)
-# ==========================================
-def predict_hedonic_price(jibun, area_m2, floor, df_trade, pnu_location, model_package):
-    """헤도닉 모델로 매매 적정가 예측 (단위: '만원'이라고 가정)"""
+# 최신 거래 행에서 가져오는 헤도닉 변수 (NaN → 0)
+HEDONIC_TRADE_COLS = [
+    "건축연령", "관내", "전월세_평균_보증금(만원)", "전월세_평균_월세(만원)", "전월세_건수",
+    "공원_최단거리", "교육_최단거리", "유통_최단거리",
+    "매수자_법인", "매도자_개인", "매도자_M", "거래유형_직거래",
+]
 
-    pnu = ltno_to_pnu(jibun)
-    if pnu is None:
-        raise ValueError(f"유효하지 않은 지번: {jibun}")
+# 사용자 입력(면적/층)에서 오는 헤도닉 변수
+HEDONIC_AREA_FLOOR_FEATURES = ["전용면적_평", "층", "area_floor_inter"]
+
+# 예측 시 고정 기준금리(연%)
+HEDONIC_BASE_RATE = 2.5
+
+
+def hedonic_trade_terms(latest):
+    """최신 거래 행 DataFrame → 면적/층을 제외한 헤도닉 변수 DataFrame (predict_hedonic_price와 동일 규칙)"""
+    terms = latest.reindex(columns=HEDONIC_TRADE_COLS).apply(pd.to_numeric, errors="coerce").fillna(0)
+    terms["건축연령_sq"] = terms["건축연령"] ** 2
+    terms["age_buycorp_inter"] = terms["건축연령"] * terms["매수자_법인"]
+    terms["기준금리(연%)"] = HEDONIC_BASE_RATE
+    return terms
+
+
+def hedonic_coef_map(hedonic_pkg):
+    """hedonic_pkg(경량/원본) → {"const": 절편, 변수명: 계수}"""
+    if "coef" in hedonic_pkg:
+        coef = dict(zip(hedonic_pkg["selected_features"], (float(c) for c in hedonic_pkg["coef"])))
+        coef["const"] = float(hedonic_pkg["intercept"])
+        return coef
+    return {k: float(v) for k, v in hedonic_pkg["model"].params.items()}
+
+
+def build_pnu_index(df_trade, pnu_location, hedonic_pkg=None):
+    """
+    PNU → {"latest": 최신 거래 행(dict), "lat": 위도, "lon": 경도} 인덱스 생성.
+    계약일 동률이면 원본 순서상 앞선 행을 택함 (sort_values 내림차순 + iloc[0]과 동일).
+    위경도가 없는 PNU는 lat/lon=None.
+    hedonic_pkg를 넘기면 면적/층 외 항의 부분 선형예측값도 함께 저장:
+      "partial_ln"      : 절편 + Σ 계수 × (거래/입지 변수, 기준금리)
+      "area_floor_coef" : (전용면적_평, 층, area_floor_inter) 계수
+    """
+    latest = (
+        df_trade.sort_values("계약일", ascending=False, kind="mergesort")
+        .drop_duplicates(subset="PNU", keep="first")
+        .set_index("PNU")
+    )
+    location = pnu_location.drop_duplicates(subset="PNU", keep="first").set_index("PNU")
+    has_location = latest.index.isin(location.index)
+    location = location.reindex(latest.index)
+
+    partial_ln, area_floor_coef = [None] * len(latest), None
+    if hedonic_pkg is not None:
+        coef = hedonic_coef_map(hedonic_pkg)
+        trade_features = [f for f in hedonic_pkg["selected_features"] if f not in HEDONIC_AREA_FLOOR_FEATURES]
+        terms = hedonic_trade_terms(latest)
+        partial_ln = (coef["const"] + terms[trade_features].to_numpy(dtype=float) @ np.array(
+            [coef[f] for f in trade_features]
+        )).tolist()
+        area_floor_coef = tuple(coef.get(f, 0.0) for f in HEDONIC_AREA_FLOOR_FEATURES)
+
+    index = {}
+    for pnu, row, found, lat, lon, partial in zip(
+        latest.index,
+        latest.to_dict("records"),
+        has_location,
+        location["위도"].tolist(),
+        location["경도"].tolist(),
+        partial_ln,
+    ):
+        entry = {
+            "latest": row,
+            "lat": lat if found else None,
+            "lon": lon if found else None,
+        }
+        if partial is not None:
+            entry["partial_ln"] = partial
+            entry["area_floor_coef"] = area_floor_coef
+        index[str(pnu)] = entry
+    return index
+
+
+@lru_cache(maxsize=1)
+def load_pnu_index():
+    """load_assets()의 매매/위경도 테이블 + 헤도닉 계수로 PNU 인덱스를 프로세스당 1번만 생성."""
+    df_trade, _, pnu_location, hedonic_pkg, _, _ = load_assets()
+    return build_pnu_index(df_trade, pnu_location, hedonic_pkg)
+
+
+def hedonic_price_from_partial(entry, area_m2, floor):
+    """PNU 인덱스 항목의 부분 선형예측값 + 면적/층 항 → 매매 적정가 (pandas/numpy 미사용)"""
+    area_pyeong = float(area_m2) / 3.3058
+    floor = int(floor)
+    c_area, c_floor, c_inter = entry["area_floor_coef"]
+    ln_price = entry["partial_ln"] + c_area * area_pyeong + c_floor * floor + c_inter * area_pyeong * floor
+    return math.exp(ln_price)
+
+
+def lookup_pnu(pnu, df_trade=None, pnu_location=None, pnu_index=None):
+    """
+    PNU의 (최신 거래 행, 위도, 경도) 조회.
+    pnu_index가 있으면 O(1) dict 조회, 없으면 DataFrame 전체 스캔(기존 방식).
+    """
+    if pnu_index is not None:
+        entry = pnu_index.get(pnu)
+        if entry is None:
+            raise ValueError(f"PNU {pnu}에 해당하는 매매 이력이 없습니다")
+        if entry["lat"] is None:
+            raise ValueError(f"PNU {pnu}에 해당하는 위경도 정보가 없습니다")
+        return entry["latest"], entry["lat"], entry["lon"]
 
-    pnu = str(pnu)
     matching = df_trade[df_trade["PNU"] == pnu]
 
     if len(matching) == 0:
@@ -93,6 +222,329 @@ def predict_hedonic_price(jibun, area_m2, floor, df_trade, pnu_location, model_p
     lat = location_matching["위도"].iloc[0]
     lon = location_matching["경도"].iloc[0]
 
+    return latest, lat, lon
+
+
+# ==========================================
+# 지번 색인 (자동완성 / 모델 실행 전 검증)
+# ==========================================
+# 예측 가능한 지번 = ltno_to_pnu 결과가 매매 이력(MD1)과 위경도(PNU_location)에 모두 있는 PNU
+JIBUN_INDEX_TABLE = "jibun_index.csv"     # 번들 테이블명 (asset_bundle.build_jibun_index_bundle)
+JIBUN_DONG_CODE = "1150010300"            # ltno_to_pnu 기본 법정동 (화곡동)
+JIBUN_SUGGEST_LIMIT = 10
+JIBUN_KEYS_FILE = "keys.npy"              # 번들 안 정렬된 지번 키 배열 (입력 화면은 이 파일만 읽음)
+
+
+def build_jibun_index(df_trade, pnu_location, dong_code=JIBUN_DONG_CODE):
+    """
+    예측 가능한 PNU → (PNU, 본번, 부번) DataFrame, 지번 키(본번*10000 + 부번) 오름차순.
+    일반 토지(대지구분 1) PNU만 (ltno_to_pnu가 만드는 형태)
+    """
+    trade_pnu = pd.Series(df_trade["PNU"].dropna().astype(str).unique())
+    has_location = trade_pnu.isin(set(pnu_location["PNU"].dropna().astype(str)))
+    prefix = dong_code + "1"
+    pnu = trade_pnu[has_location & (trade_pnu.str.len() == 19) & trade_pnu.str.startswith(prefix)]
+
+    out = pd.DataFrame({
+        "PNU": pnu.to_numpy(),
+        "main": pnu.str[11:15].astype(int).to_numpy(),
+        "sub": pnu.str[15:19].astype(int).to_numpy(),
+    })
+    return out.sort_values(["main", "sub"], kind="mergesort").reset_index(drop=True)
+
+
+@lru_cache(maxsize=1)
+def load_jibun_index():
+    """
+    정렬된 지번 키 list (본번*10000 + 부번). bisect 조회라 numpy 배열 대신 파이썬 int list.
+    번들(python asset_bundle.py)이 fresh하면 번들에서, 아니면 매매 / 위경도 테이블로 생성 (모델은 로드 안 함)
+    """
+    table_path = DATA_DIR / JIBUN_INDEX_TABLE
+    if asset_bundle.is_bundle_fresh(table_path):
+        table = asset_bundle.read_table_bundle(table_path)
+    else:
+        table = build_jibun_index(
+            asset_bundle.load_table(DATA_DIR / "MD1_final.csv", dtype={"PNU": str}),
+            asset_bundle.load_table(DATA_DIR / "PNU_location.csv", dtype={"PNU": str}),
+        )
+    return (np.asarray(table["main"], dtype=np.int64) * 10000 + np.asarray(table["sub"], dtype=np.int64)).tolist()
+
+
+def jibun_keys_path(bundle_dir=None):
+    """asset_bundle.table_dir(DATA_DIR / JIBUN_INDEX_TABLE) / keys.npy (asset_bundle import 없이 같은 경로)"""
+    bundle_dir = Path(bundle_dir) if bundle_dir is not None else DATA_DIR / "bundle"
+    return bundle_dir / Path(JIBUN_INDEX_TABLE).stem / JIBUN_KEYS_FILE
+
+
+@lru_cache(maxsize=1)
+def load_jibun_keys():
+    """
+    입력 화면(자동완성 / 선택 즉시 검증)용 지번 키 list: 미리 빌드된 keys.npy만 읽음.
+    신선도 해시 / pandas / asset_bundle 없이 numpy 하나. 파일이 없으면 None.
+    원본이 바뀌어 낡았을 수 있으므로 최종 검증은 제출 시 load_jibun_index (predict_final)
+    """
+    path = jibun_keys_path()
+    if not path.is_file():
+        return None
+    return np.load(path).tolist()
+
+
+def jibun_key(ltno):
+    """지번 → 키(본번*10000 + 부번), ltno_to_pnu와 같은 해석. 변환 불가면 None"""
+    text = str(ltno).strip()
+    parts = text.split("-")
+    if len(parts) > 2 or text.lower() in ("", "nan", "none"):
+        return None
+    try:
+        main = int(float(parts[0]))
+        sub = int(float(parts[1])) if len(parts) == 2 else 0
+    except ValueError:
+        return None
+    if not (0 <= main < 10000 and 0 <= sub < 10000):
+        return None
+    return main * 10000 + sub
+
+
+def format_jibun(key):
+    main, sub = divmod(int(key), 10000)
+    return str(main) if sub == 0 else f"{main}-{sub}"
+
+
+def is_known_jibun(jibun, keys=None):
+    """예측 가능한 지번인지 (이진 탐색)"""
+    keys = load_jibun_index() if keys is None else keys
+    key = jibun_key(jibun)
+    if key is None:
+        return False
+    i = bisect_left(keys, key)
+    return i < len(keys) and keys[i] == key
+
+
+def suggest_jibun(prefix, limit=JIBUN_SUGGEST_LIMIT, keys=None):
+    """
+    입력 중인 지번 → 예측 가능한 지번 후보 (오름차순, 최대 limit개).
+    "106"  → 본번이 106으로 시작 (106, 1060~1069의 모든 부번)
+    "1067-" → 본번 1067의 모든 부번, "1067-1" → 부번이 1로 시작
+    각 자릿수 구간을 bisect로 잘라 붙이므로 후보 수와 무관하게 구간 수(≤4)만큼의 탐색
+    """
+    keys = load_jibun_index() if keys is None else keys
+    text = str(prefix).strip()
+    main_text, dash, sub_text = text.partition("-")
+    if not (main_text.isdigit() and len(main_text) <= 4 and not main_text.startswith("0")):
+        return []
+    if not ((sub_text.isdigit() and not sub_text.startswith("0") and len(sub_text) <= 4) or sub_text == ""):
+        return []
+
+    main = int(main_text)
+    if dash:
+        base = main * 10000
+        if sub_text == "":
+            ranges = [(base, base + 10000)]
+        else:
+            sub = int(sub_text)
+            ranges = [(base + sub * 10**k, base + (sub + 1) * 10**k) for k in range(5 - len(sub_text))]
+            ranges = [(lo, min(hi, base + 10000)) for lo, hi in ranges]
+    else:
+        ranges = [(main * 10**k * 10000, (main + 1) * 10**k * 10000) for k in range(5 - len(main_text))]
+        ranges = [(lo, min(hi, 10000 * 10000)) for lo, hi in ranges]
+
+    out = []
+    for lo, hi in ranges:
+        i, j = bisect_left(keys, lo), bisect_left(keys, hi)
+        out.extend(format_jibun(k) for k in keys[i : min(j, i + limit - len(out))])
+        if len(out) >= limit:
+            break
+    return out
+
+
+# ==========================================
+# 전세 테이블 공간 인덱스 (KD-tree, km 스케일 좌표)
+# ==========================================
+# 대략적인 km 스케일링(서울 근처 근사): (경도, 위도) * (88, 111)
+KM_SCALE = (88.0, 111.0)
+
+# KD-tree 반경 질의 후 cdist로 재검증할 때 쓰는 여유분 (경계 반올림 차이 흡수)
+_RADIUS_SLACK = 1e-9
+
+
+def build_lease_spatial_index(df_jeonse):
+    """
+    create_logistic_features가 매 요청마다 하던 dropna + 좌표 스케일링을 1번만 수행하고
+    전체 전세 좌표 / 경매_4년이내 == 1 좌표에 대한 KD-tree를 생성.
+    """
+    df_clean = df_jeonse.dropna(subset=["경도", "위도", "Residual"])
+
+    coords_scaled = df_clean[["경도", "위도"]].values * KM_SCALE
+    auction_coords = coords_scaled[df_clean["경매_4년이내"].values == 1]
+
+    return {
+        "coords": coords_scaled,
+        "tree": spatial.cKDTree(coords_scaled),
+        "auction_coords": auction_coords,
+        "auction_tree": spatial.cKDTree(auction_coords),
+        "local_morans_i": df_clean["local_morans_i"].to_numpy(),
+    }
+
+
+@lru_cache(maxsize=1)
+def load_lease_spatial_index():
+    """load_assets()의 전세 테이블로 공간 인덱스를 프로세스당 1번만 생성."""
+    _, df_lease, _, _, _, _ = load_assets()
+    return build_lease_spatial_index(df_lease)
+
+
+def query_lease_spatial_index(spatial_index, user_lat, user_lon, threshold_km=1, return_nearest_km=False):
+    """
+    (user_lat, user_lon) 배열에 대해 (반경 내 경매 건수, 최근접 local_morans_i) 배열 반환.
+    KD-tree로 후보만 뽑고 거리는 cdist로 다시 계산 → 전수 cdist 방식과 결과 동일
+    (반경은 '<' 비교, 최근접 동률은 원본 순서상 첫 행).
+    return_nearest_km=True면 최근접 전세까지 거리(km) 배열도 함께 반환.
+    """
+    user_scaled = np.column_stack(
+        [np.atleast_1d(np.asarray(user_lon, dtype=float)), np.atleast_1d(np.asarray(user_lat, dtype=float))]
+    ) * KM_SCALE
+
+    n = len(user_scaled)
+    nearby = np.zeros(n, dtype=int)
+    morans = np.full(n, np.nan)
+    nearest_km = np.full(n, np.inf)
+
+    if len(spatial_index["auction_coords"]):
+        candidates = spatial_index["auction_tree"].query_ball_point(
+            user_scaled, r=threshold_km * (1 + _RADIUS_SLACK)
+        )
+        for i, cand in enumerate(candidates):
+            if cand:
+                d = distance.cdist(user_scaled[i : i + 1], spatial_index["auction_coords"][cand])[0]
+                nearby[i] = int((d < threshold_km).sum())
+
+    if len(spatial_index["coords"]):
+        nearest_d, _ = spatial_index["tree"].query(user_scaled, k=1)
+        ties = spatial_index["tree"].query_ball_point(user_scaled, r=nearest_d * (1 + _RADIUS_SLACK) + 1e-12)
+        for i, cand in enumerate(ties):
+            cand = np.sort(cand)
+            d = distance.cdist(user_scaled[i : i + 1], spatial_index["coords"][cand])[0]
+            j = int(np.argmin(d))
+            morans[i] = spatial_index["local_morans_i"][cand[j]]
+            nearest_km[i] = d[j]
+
+    if return_nearest_km:
+        return nearby, morans, nearest_km
+
+    return nearby, morans
+
+
+# ==========================================
+# PNU별 공간 변수 사전계산 (nearby_auction_1km / local_morans_i)
+# ==========================================
+# 사용자 좌표는 항상 PNU_location에서 오므로 PNU별로 미리 계산 가능.
+# 번들 경로 이름용 (실제 CSV 파일은 없음, 원본은 MD2_final.csv + PNU_location.csv)
+PNU_SPATIAL_TABLE = "pnu_spatial_features.csv"
+
+
+def _pnu_coordinates(pnu_location):
+    """PNU별 첫 행 좌표 (build_pnu_index와 같은 기준)"""
+    loc = pnu_location.drop_duplicates(subset="PNU", keep="first").dropna(subset=["위도", "경도"])
+    return pd.DataFrame({
+        "PNU": loc["PNU"].astype(str).to_numpy(),
+        "위도": loc["위도"].to_numpy(dtype=float),
+        "경도": loc["경도"].to_numpy(dtype=float),
+    })
+
+
+def build_pnu_spatial_features(pnu_location, spatial_index, threshold_km=1):
+    """PNU_location의 모든 PNU에 대해 공간 변수 계산 → DataFrame (nearest_km은 증분 갱신용)"""
+    features = _pnu_coordinates(pnu_location)
+    nearby, morans, nearest_km = query_lease_spatial_index(
+        spatial_index, features["위도"].to_numpy(), features["경도"].to_numpy(), threshold_km, return_nearest_km=True
+    )
+    features["nearby_auction_1km"] = nearby
+    features["local_morans_i"] = morans
+    features["nearest_km"] = nearest_km
+    return features
+
+
+def update_pnu_spatial_features(features, pnu_location, spatial_index, new_lease_rows, threshold_km=1):
+    """
+    전세 테이블 뒤에 new_lease_rows가 추가됐을 때 영향받는 PNU만 재계산.
+      - 새 경매 행이 반경 안에 들어온 PNU (건수 변화)
+      - 새 행이 기존 최근접 거리 이내인 PNU (최근접 변화 가능)
+      - features에 없던 신규 PNU
+    spatial_index: 새 행까지 포함한 전체 전세 테이블 인덱스
+    반환: (갱신된 features, 재계산한 PNU 배열)
+    """
+    merged = _pnu_coordinates(pnu_location).merge(
+        features[["PNU", "nearby_auction_1km", "local_morans_i", "nearest_km"]], on="PNU", how="left"
+    )
+
+    new_index = build_lease_spatial_index(new_lease_rows)
+    pnu_scaled = merged[["경도", "위도"]].to_numpy(dtype=float) * KM_SCALE
+
+    affected = merged["nearest_km"].isna().to_numpy(copy=True)
+    if len(new_index["coords"]):
+        d_new, _ = new_index["tree"].query(pnu_scaled, k=1)
+        affected |= d_new <= merged["nearest_km"].to_numpy() * (1 + _RADIUS_SLACK) + 1e-12
+    if len(new_index["auction_coords"]):
+        n_new_auction = new_index["auction_tree"].query_ball_point(
+            pnu_scaled, r=threshold_km * (1 + _RADIUS_SLACK), return_length=True
+        )
+        affected |= n_new_auction > 0
+
+    if affected.any():
+        nearby, morans, nearest_km = query_lease_spatial_index(
+            spatial_index,
+            merged.loc[affected, "위도"].to_numpy(),
+            merged.loc[affected, "경도"].to_numpy(),
+            threshold_km,
+            return_nearest_km=True,
+        )
+        merged.loc[affected, "nearby_auction_1km"] = nearby
+        merged.loc[affected, "local_morans_i"] = morans
+        merged.loc[affected, "nearest_km"] = nearest_km
+
+    merged["nearby_auction_1km"] = merged["nearby_auction_1km"].astype(int)
+    return merged, merged.loc[affected, "PNU"].to_numpy()
+
+
+@lru_cache(maxsize=1)
+def load_pnu_spatial_features():
+    """
+    번들(python asset_bundle.py)의 PNU별 공간 변수 → {PNU: (nearby_auction_1km, local_morans_i)}.
+    번들이 없거나 원본과 다르면 빈 dict (요청 시 KD-tree 조회로 대체).
+    """
+    table_path = DATA_DIR / PNU_SPATIAL_TABLE
+    if not asset_bundle.is_bundle_fresh(table_path):
+        return {}
+
+    features = asset_bundle.read_table_bundle(table_path)
+    return {
+        str(pnu): (int(nearby), float(morans))
+        for pnu, nearby, morans in zip(
+            features["PNU"], features["nearby_auction_1km"], features["local_morans_i"]
+        )
+    }
+
+
+# ==========================================
+# 1단계: 헤도닉 예측 (매매 적정가)
+# ==========================================
+def predict_hedonic_price(jibun, area_m2, floor, df_trade, pnu_location, model_package, pnu_index=None):
+    """
+    헤도닉 모델로 매매 적정가 예측 (단위: '만원'이라고 가정)
+    pnu_index(build_pnu_index 결과)를 넘기면 DataFrame 스캔 없이 조회.
+    """
+
+    pnu = ltno_to_pnu(jibun)
+    if pnu is None:
+        raise ValueError(f"유효하지 않은 지번: {jibun}")
+
+    pnu = str(pnu)
+    latest, lat, lon = lookup_pnu(pnu, df_trade, pnu_location, pnu_index)
+
+    entry = pnu_index.get(pnu) if pnu_index is not None else None
+    if entry is not None and "partial_ln" in entry:
+        return hedonic_price_from_partial(entry, area_m2, floor), float(lat), float(lon)
+
     area_pyeong = float(area_m2) / 3.3058
 
     features = {
@@ -103,7 +555,7 @@ def predict_hedonic_price(jibun, area_m2, floor, df_trade, pnu_location, model_p
         "area_floor_inter": area_pyeong * int(floor),
         "관내": latest["관내"] if pd.notna(latest.get("관내", np.nan)) else 0,
         "전월세_평균_보증금(만원)": latest["전월세_평균_보증금(만원)"] if pd.notna(latest.get("전월세_평균_보증금(만원)", np.nan)) else 0,
-        "기준금리(연%)": 2.5,
+        "기준금리(연%)": HEDONIC_BASE_RATE,
         "전월세_평균_월세(만원)": latest["전월세_평균_월세(만원)"] if pd.notna(latest.get("전월세_평균_월세(만원)", np.nan)) else 0,
         "전월세_건수": latest["전월세_건수"] if pd.notna(latest.get("전월세_건수", np.nan)) else 0,
         "공원_최단거리": latest["공원_최단거리"] if pd.notna(latest.get("공원_최단거리", np.nan)) else 0,
@@ -118,13 +570,10 @@ def predict_hedonic_price(jibun, area_m2, floor, df_trade, pnu_location, model_p
         else 0,
     }
 
-    model = model_package["model"]
     selected_features = model_package["selected_features"]
 
-    input_df = pd.DataFrame([features])[selected_features]
-    X_new = sm.add_constant(input_df, has_constant="add")
-
-    ln_price = model.predict(X_new)[0]
+    x_new = [features[f] for f in selected_features]
+    ln_price = slim_models.hedonic_predict_ln(model_package, x_new)
     actual_price = float(np.exp(ln_price))  # 단위가 '만원'이라고 가정
 
     return actual_price, float(lat), float(lon)
@@ -133,13 +582,32 @@ def predict_hedonic_price(jibun, area_m2, floor, df_trade, pnu_location, model_p
 # ==========================================
 # 2단계: 로지스틱 회귀 파생변수 생성
 # ==========================================
-def create_logistic_features(df_jeonse, deposit, hedonic_price, user_lat, user_lon):
-    """로지스틱 회귀용 파생변수 생성"""
+def create_logistic_features(
+    df_jeonse, deposit, hedonic_price, user_lat, user_lon, spatial_index=None, precomputed=None
+):
+    """
+    로지스틱 회귀용 파생변수 생성
+    precomputed: 이 위치의 (nearby_auction_1km, local_morans_i) 사전계산값 (load_pnu_spatial_features)
+    spatial_index(build_lease_spatial_index 결과)를 넘기면 전수 cdist 대신 KD-tree 조회.
+    """
 
     # 단위 통일 가정: deposit, hedonic_price 모두 '만원'
     effective_LTV = (float(deposit) / float(hedonic_price)) * 100 if hedonic_price else 0.0
     deposit_overhang = float(deposit) - float(hedonic_price)
 
+    if precomputed is not None or spatial_index is not None:
+        if precomputed is not None:
+            nearby, morans = precomputed
+        else:
+            nearby, morans = query_lease_spatial_index(spatial_index, user_lat, user_lon, threshold_km=1)
+            nearby, morans = nearby[0], morans[0]
+        return {
+            "effective_LTV": float(effective_LTV),
+            "deposit_overhang": float(deposit_overhang),
+            "nearby_auction_1km": int(nearby),
+            "local_morans_i": float(morans),
+        }
+
     df_clean = df_jeonse.dropna(subset=["경도", "위도", "Residual"]).copy()
 
     coords = df_clean[["경도", "위도"]].values
@@ -154,7 +622,7 @@ def create_logistic_features(df_jeonse, deposit, hedonic_price, user_lat, user_l
     user_coord_scaled[:, 0] *= 88
     user_coord_scaled[:, 1] *= 111
 
-    distances = cdist(user_coord_scaled, coords_scaled)[0]
+    distances = distance.cdist(user_coord_scaled, coords_scaled)[0]
 
     threshold_km = 1
     neighbors = distances < threshold_km
@@ -177,28 +645,66 @@ def create_logistic_features(df_jeonse, deposit, hedonic_price, user_lat, user_l
 # ==========================================
 # 3단계: 로지스틱 회귀 예측 (WoE + 모델)
 # ==========================================
+def compile_woe_tables(auction_pkg):
+    """
+    bins_config / woe_maps → 변수별 (구간 경계 배열, WoE 값 배열).
+    values는 앞뒤에 0을 붙인 길이 len(edges)+1 배열:
+      values[0]       : 첫 경계 미만 (구간 밖)
+      values[k+1]     : k번째 구간 (edges[k], edges[k+1]]
+      values[-1]      : 마지막 경계 초과 또는 NaN
+    구간 밖/NaN/woe_maps에 없는 구간은 기존 .get(bin_idx, 0)과 같이 0.
+    """
+    edges, values = [], []
+    for col in auction_pkg["features"]:
+        e = np.asarray(auction_pkg["bins_config"][col], dtype=float)
+        woe_map = auction_pkg["woe_maps"][col]
+        v = np.zeros(len(e) + 1)
+        v[1:-1] = [woe_map.get(k, 0) for k in range(len(e) - 1)]
+        edges.append(e)
+        values.append(v)
+    return {"features": list(auction_pkg["features"]), "edges": edges, "values": values}
+
+
+def woe_transform(woe_tables, X):
+    """
+    (n, 변수 수) 배열(또는 1행 벡터) → 같은 모양의 WoE 배열.
+    pd.cut(..., labels=False, include_lowest=True)과 동일한 구간 판정:
+    (e_i, e_{i+1}]에 대해 searchsorted(side="left"), 첫 경계값은 첫 구간에 포함.
+    """
+    X = np.asarray(X, dtype=float)
+    X2 = np.atleast_2d(X)
+    out = np.empty_like(X2)
+
+    for j, (e, v) in enumerate(zip(woe_tables["edges"], woe_tables["values"])):
+        x = X2[:, j]
+        pos = np.searchsorted(e, x, side="left")
+        pos[x == e[0]] = 1
+        pos[np.isnan(x)] = len(e)
+        out[:, j] = v[pos]
+
+    return out.reshape(X.shape)
+
+
 def predict_auction_risk(new_data_dict, auction_pkg):
     """경매 위험 확률 예측"""
 
-    model = auction_pkg["model"]
-    bins_config = auction_pkg["bins_config"]
-    woe_maps = auction_pkg["woe_maps"]
     features = auction_pkg["features"]
+    woe_tables = auction_pkg.get("woe_tables") or compile_woe_tables(auction_pkg)
 
     # 입력 데이터를 WoE로 변환
-    woe_vector = []
-    for col in features:
-        val = new_data_dict.get(col, 0)
-        bin_idx = pd.cut([val], bins=bins_config[col], labels=False, include_lowest=True)[0]
-        woe_val = woe_maps[col].get(bin_idx, 0)
-        woe_vector.append(woe_val)
+    woe_vector = woe_transform(woe_tables, [new_data_dict.get(col, 0) for col in features])
 
-    prob = float(model.predict_proba([woe_vector])[0, 1])
-    grade = "고위험" if prob >= 0.63 else ("주의" if prob >= 0.53 else "안전")
+    prob = float(slim_models.auction_predict_proba(auction_pkg, woe_vector))
+    grade = auction_grade(prob)
 
     return {"prob": round(prob, 4), "grade": grade}
 
 
+def auction_grade(prob):
+    """경매 위험 확률 → 등급"""
+    return "고위험" if prob >= 0.63 else ("주의" if prob >= 0.53 else "안전")
+
+
 # ==========================================
 # 설명 문장 생성
 # ==========================================
@@ -235,7 +741,19 @@ def predict_final(jibun, area_m2, floor, deposit):
     반환:
       result: {'prob': 0~1, 'grade': '안전/주의/고위험'}
       comments: 설명 문장 리스트
+    분석할 수 없는 지번, 숫자가 아니거나 NaN / inf인 면적 / 층 / 보증금은 ValueError
+    (predict_final_batch의 error_code와 같은 기준)
     """
+    # 모델 / 테이블 로드 전에 지번 색인으로 먼저 거름
+    if not is_known_jibun(jibun):
+        raise ValueError(f"분석할 수 없는 지번입니다 (매매 이력 / 위경도 없음): {jibun}")
+    try:
+        numbers = [float(area_m2), float(floor), float(deposit)]
+    except (TypeError, ValueError):
+        numbers = [math.nan]
+    if not all(math.isfinite(v) for v in numbers):
+        raise ValueError(f"면적 / 층 / 보증금은 유한한 숫자여야 합니다: {area_m2}, {floor}, {deposit}")
+
     df_trade, df_lease, pnu_location, hedonic_pkg, auction_pkg, total_suspected = load_assets()
 
     hedonic_price, lat, lon = predict_hedonic_price(
@@ -245,14 +763,20 @@ def predict_final(jibun, area_m2, floor, deposit):
         df_trade=df_trade,
         pnu_location=pnu_location,
         model_package=hedonic_pkg,
+        pnu_index=load_pnu_index(),
     )
 
+    # PNU별 사전계산 공간 변수가 있으면 KD-tree 인덱스도 만들지 않음
+    precomputed = load_pnu_spatial_features().get(ltno_to_pnu(jibun))
+
     logistic_features = create_logistic_features(
         df_jeonse=df_lease,
         deposit=deposit,
         hedonic_price=hedonic_price,
         user_lat=lat,
         user_lon=lon,
+        spatial_index=None if precomputed is not None else load_lease_spatial_index(),
+        precomputed=precomputed,
     )
 
     result = predict_auction_risk(logistic_features, auction_pkg)
@@ -266,6 +790,325 @@ def predict_final(jibun, area_m2, floor, deposit):
 
 
 
+# ==========================================
+# predict_final 결과 캐시 (세션 공용 LRU/TTL + 디스크 계층)
+# ==========================================
+# 키: (자산/모델 버전, PNU, 면적, 층, 보증금). 데이터 / 모델 / 번들 파일이 바뀌면 버전이 달라져 자동 무효화
+PREDICT_CACHE_VERSION = 1              # 계산 로직이 바뀌면 올림
+PREDICT_CACHE_SIZE = 1024              # 메모리 계층 항목 수 상한
+PREDICT_CACHE_TTL = 24 * 3600          # 초
+PREDICT_CACHE_DISK = True              # 디스크 계층 사용 여부 (프로세스 재시작 후에도 적중)
+PREDICT_CACHE_DIR = DATA_DIR / "bundle" / "predict_cache"
+PREDICT_CACHE_DISK_MAX = 10000         # 디스크 항목 수 상한 (넘으면 오래된 것부터 삭제)
+
+_predict_cache = OrderedDict()         # key → (저장 시각, (result, comments))
+_predict_cache_lock = threading.Lock()
+_predict_cache_stats = {"hits": 0, "disk_hits": 0, "misses": 0, "disk_writes": 0}
+
+
+@lru_cache(maxsize=1)
+def asset_version():
+    """
+    load_assets가 읽는 원본 / 번들 / 모델 파일의 (이름, 크기, 수정시각) 해시.
+    load_assets와 같이 프로세스당 1번만 계산 (실행 중 파일 교체는 load_assets도 반영하지 않음)
+    """
+    paths = [DATA_DIR / name for name in ["MD1_final.csv", "MD2_final.csv", "PNU_location.csv"]]
+    paths += sorted(MODELS_DIR.glob("*.pkl")) + sorted(MODELS_DIR.glob("*_slim.json"))
+    paths += sorted((DATA_DIR / "bundle").glob("*/manifest.json"))
+
+    h = hashlib.sha256(f"v{PREDICT_CACHE_VERSION}".encode())
+    for path in paths:
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        h.update(f"{path.parent.name}/{path.name}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    return h.hexdigest()[:16]
+
+
+def predict_cache_key(jibun, area_m2, floor, deposit):
+    """
+    정규화된 입력 키 ("1067-01"과 "1067-1", 59와 59.0은 같은 키). 지번 변환 불가면 None.
+    PNU는 jibun_key로 만듦 (ltno_to_pnu와 같은 결과, pandas 없이 → 재시작 직후 디스크 적중이 가벼움)
+    숫자는 float repr 그대로 (int로 자르면 15000.5와 15000.9처럼 다른 입력이 같은 항목을 공유)
+    """
+    key = jibun_key(jibun)
+    if key is None:
+        return None
+    pnu = f"{JIBUN_DONG_CODE}1{key // 10000:04d}{key % 10000:04d}"
+    return f"{asset_version()}:{pnu}:{float(area_m2)!r}:{float(floor)!r}:{float(deposit)!r}"
+
+
+def _disk_cache_path(key, cache_dir):
+    return Path(cache_dir) / f"{hashlib.sha256(key.encode()).hexdigest()[:32]}.json"
+
+
+def _disk_cache_get(key, cache_dir):
+    path = _disk_cache_path(key, cache_dir)
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if payload.get("key") != key or time.time() - payload.get("saved_at", 0) > PREDICT_CACHE_TTL:
+        return None
+    return payload["saved_at"], (payload["result"], payload["comments"])
+
+
+def _disk_cache_put(key, value, cache_dir):
+    """임시 파일에 쓰고 교체 (동시 쓰기에도 깨진 파일 없음). 쓰기 실패(읽기 전용 등)는 무시"""
+    path = _disk_cache_path(key, cache_dir)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp.write_text(
+            json.dumps({"key": key, "saved_at": time.time(), "result": value[0], "comments": value[1]}, ensure_ascii=False),
+            encoding="utf-8",
+        )
+        os.replace(tmp, path)
+    except OSError:
+        return
+    with _predict_cache_lock:
+        _predict_cache_stats["disk_writes"] += 1
+        prune = _predict_cache_stats["disk_writes"] % 256 == 0
+    if prune:
+        prune_predict_cache_dir(cache_dir)
+
+
+def prune_predict_cache_dir(cache_dir=PREDICT_CACHE_DIR, max_entries=PREDICT_CACHE_DISK_MAX):
+    """디스크 계층에서 TTL 지난 항목과 상한 초과분(오래된 순) 삭제"""
+    now = time.time()
+    files = []
+    for path in Path(cache_dir).glob("*.json"):
+        try:
+            files.append((path.stat().st_mtime, path))
+        except OSError:
+            continue
+    files.sort()
+    n_over = len(files) - max_entries
+    for i, (mtime, path) in enumerate(files):
+        if i < n_over or now - mtime > PREDICT_CACHE_TTL:
+            path.unlink(missing_ok=True)
+
+
+def predict_final_cached(jibun, area_m2, floor, deposit, disk=None, cache_dir=PREDICT_CACHE_DIR):
+    """
+    predict_final + 결과 캐시. 같은 (PNU, 면적, 층, 보증금, 자산 버전)이면 재계산 없이 반환.
+    - 메모리: 프로세스 공용 LRU (PREDICT_CACHE_SIZE개, PREDICT_CACHE_TTL초), Streamlit 세션 간 공유
+    - 디스크(disk=None이면 PREDICT_CACHE_DISK): cache_dir의 JSON, 재시작 후 첫 조회도 적중
+    - 오류(ValueError 등)는 캐시하지 않음. 반환값은 복사본 (호출 측 수정이 캐시에 안 번짐)
+    """
+    disk = PREDICT_CACHE_DISK if disk is None else disk
+    key = predict_cache_key(jibun, area_m2, floor, deposit)
+    if key is None:
+        return predict_final(jibun, area_m2, floor, deposit)
+
+    now = time.time()
+    with _predict_cache_lock:
+        hit = _predict_cache.get(key)
+        if hit is not None and now - hit[0] <= PREDICT_CACHE_TTL:
+            _predict_cache.move_to_end(key)
+            _predict_cache_stats["hits"] += 1
+            return copy.deepcopy(hit[1])
+
+    # 어느 계층에서 왔는지 명시 (저장 시각 비교는 시계가 안 움직이면 틀림)
+    tier = "disk_hits"
+    entry = _disk_cache_get(key, cache_dir) if disk else None
+    if entry is None:
+        tier = "misses"
+        entry = (now, predict_final(jibun, area_m2, floor, deposit))
+        if disk:
+            _disk_cache_put(key, entry[1], cache_dir)
+
+    with _predict_cache_lock:
+        _predict_cache_stats[tier] += 1
+        _predict_cache[key] = entry
+        _predict_cache.move_to_end(key)
+        while len(_predict_cache) > PREDICT_CACHE_SIZE:
+            _predict_cache.popitem(last=False)
+    return copy.deepcopy(entry[1])
+
+
+def predict_cache_info():
+    """적중 / 미적중 횟수와 메모리 항목 수"""
+    with _predict_cache_lock:
+        return {**_predict_cache_stats, "size": len(_predict_cache), "version": asset_version()}
+
+
+def clear_predict_cache(disk=False, cache_dir=PREDICT_CACHE_DIR):
+    with _predict_cache_lock:
+        _predict_cache.clear()
+    if disk:
+        prune_predict_cache_dir(cache_dir, max_entries=0)
+
+
+# ==========================================
+# 배치 예측 (매물 피드 일괄 스코어링)
+# ==========================================
+# 행별 오류 코드 (정상 행은 None)
+ERR_INVALID_JIBUN = "invalid_jibun"
+ERR_INVALID_INPUT = "invalid_input"
+ERR_NO_TRADE = "no_trade"
+ERR_NO_LOCATION = "no_location"
+
+def ltno_to_pnu_batch(ltno, dong_code="1150010300"):
+    """ltno_to_pnu의 Series 버전. 변환 불가 지번은 None."""
+    s = pd.Series(ltno, dtype=object)
+    if s.empty:
+        return pd.Series(None, index=s.index, dtype=object)
+    text = s.where(s.notna(), "nan").astype(str).str.strip()
+
+    parts = text.str.split("-", expand=True)
+    if parts.shape[1] == 1:
+        parts[1] = None
+    n_parts = text.str.count("-") + 1
+
+    main = pd.to_numeric(parts[0], errors="coerce")
+    sub = pd.to_numeric(parts[1].where(n_parts == 2, "0"), errors="coerce")
+
+    valid = (
+        (text.str.lower() != "nan")
+        & (n_parts <= 2)
+        & np.isfinite(main) & np.isfinite(sub)
+        & (main >= 0) & (main < 10000) & (sub >= 0) & (sub < 10000)
+    )
+
+    out = pd.Series(None, index=s.index, dtype=object)
+    if valid.any():
+        main_str = np.trunc(main[valid]).astype(int).astype(str).str.zfill(4)
+        sub_str = np.trunc(sub[valid]).astype(int).astype(str).str.zfill(4)
+        out[valid] = dong_code + "1" + main_str + sub_str
+    return out
+
+
+def predict_final_batch(
+    df_listings: pd.DataFrame,
+    jibun_col: str = "jibun",
+    area_col: str = "area_m2",
+    floor_col: str = "floor",
+    deposit_col: str = "deposit",
+) -> pd.DataFrame:
+    """
+    predict_final의 배치 버전: 매물 DataFrame → 결과 DataFrame (입력 index 유지)
+    PNU 변환 / 헤도닉 / 공간 변수 / WoE / 로지스틱을 전부 행 단위가 아닌 배열 단위로 처리.
+    예외 대신 error_code 컬럼에 행별 오류 코드를 기록 (정상 행은 None).
+    행별 계약은 predict_final과 같음: predict_final이 ValueError를 내는 입력이면 error_code,
+    아니면 같은 prob / grade / V0
+      invalid_jibun : 지번 변환 불가
+      invalid_input : 면적 / 층 / 보증금이 숫자가 아니거나 NaN / inf
+      no_trade / no_location : 매매 이력 / 위경도 없는 지번
+    빈 DataFrame이면 모델을 로드하지 않고 같은 컬럼의 빈 결과.
+    """
+    for col in [jibun_col, area_col, floor_col, deposit_col]:
+        if col not in df_listings.columns:
+            raise ValueError(f"필수 컬럼 누락: {col}")
+
+    n = len(df_listings)
+    out = pd.DataFrame(index=df_listings.index)
+    error = np.full(n, None, dtype=object)
+
+    pnu = ltno_to_pnu_batch(df_listings[jibun_col].to_numpy()).to_numpy()
+    out["PNU"] = pnu
+    for col in ["V0", "effective_LTV", "deposit_overhang", "local_morans_i", "prob"]:
+        out[col] = np.nan
+    out["nearby_auction_1km"] = pd.array([pd.NA] * n, dtype="Int64")
+    out["grade"] = None
+    if n == 0:
+        out["error_code"] = pd.Series(error, index=out.index, dtype=object)
+        return out
+
+    _, _, _, hedonic_pkg, auction_pkg, _ = load_assets()
+    pnu_index = load_pnu_index()
+    pnu_spatial = load_pnu_spatial_features()
+
+    # --- 숫자 입력 검증
+    area_m2 = pd.to_numeric(df_listings[area_col], errors="coerce").to_numpy(dtype=float)
+    floor = pd.to_numeric(df_listings[floor_col], errors="coerce").to_numpy(dtype=float)
+    deposit = pd.to_numeric(df_listings[deposit_col], errors="coerce").to_numpy(dtype=float)
+
+    error[pd.isna(pnu)] = ERR_INVALID_JIBUN
+    bad_input = ~(np.isfinite(area_m2) & np.isfinite(floor) & np.isfinite(deposit))
+    error[bad_input & pd.isna(error)] = ERR_INVALID_INPUT
+
+    # --- PNU 인덱스 조회 (고유 PNU 단위)
+    entries = [pnu_index.get(p) if e is None else None for p, e in zip(pnu, error)]
+    for i, entry in enumerate(entries):
+        if error[i] is not None:
+            continue
+        if entry is None:
+            error[i] = ERR_NO_TRADE
+        elif entry["lat"] is None:
+            error[i] = ERR_NO_LOCATION
+
+    ok = pd.isna(error)
+
+    if ok.any():
+        ok_entries = [entries[i] for i in np.flatnonzero(ok)]
+        lat = np.array([e["lat"] for e in ok_entries], dtype=float)
+        lon = np.array([e["lon"] for e in ok_entries], dtype=float)
+
+        # --- 1단계: 헤도닉
+        area_pyeong = area_m2[ok] / 3.3058
+        floor_int = np.trunc(floor[ok]).astype(int)
+
+        if all("partial_ln" in e for e in ok_entries):
+            # PNU별 부분 선형예측값 + 면적/층 항
+            partial = np.array([e["partial_ln"] for e in ok_entries], dtype=float)
+            c_area, c_floor, c_inter = ok_entries[0]["area_floor_coef"]
+            ln_price = partial + c_area * area_pyeong + c_floor * floor_int + c_inter * area_pyeong * floor_int
+        else:
+            # 설계행렬 1번 + predict 1번
+            X = hedonic_trade_terms(pd.DataFrame([e["latest"] for e in ok_entries]))
+            X["전용면적_평"] = area_pyeong
+            X["층"] = floor_int
+            X["area_floor_inter"] = area_pyeong * floor_int
+            X_new = X[hedonic_pkg["selected_features"]].to_numpy(dtype=float)
+            ln_price = slim_models.hedonic_predict_ln(hedonic_pkg, X_new)
+        hedonic_price = np.exp(ln_price)
+
+        # --- 2단계: 로지스틱 파생변수
+        dep = deposit[ok]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            effective_LTV = np.where(hedonic_price != 0, dep / hedonic_price * 100, 0.0)
+        deposit_overhang = dep - hedonic_price
+
+        # 공간 변수: PNU별 사전계산 테이블 우선, 없는 PNU만 KD-tree 조회
+        ok_pnu = pnu[ok]
+        hit = np.array([p in pnu_spatial for p in ok_pnu], dtype=bool)
+        nearby = np.zeros(len(ok_pnu), dtype=int)
+        morans = np.full(len(ok_pnu), np.nan)
+        if hit.any():
+            nearby[hit], morans[hit] = np.array([pnu_spatial[p] for p in ok_pnu[hit]]).T
+        if (~hit).any():
+            nearby[~hit], morans[~hit] = query_lease_spatial_index(
+                load_lease_spatial_index(), lat[~hit], lon[~hit], threshold_km=1
+            )
+
+        feats = {
+            "effective_LTV": effective_LTV,
+            "deposit_overhang": deposit_overhang,
+            "nearby_auction_1km": nearby,
+            "local_morans_i": morans,
+        }
+
+        # --- 3단계: WoE + 로지스틱 (predict_proba 1번)
+        woe = woe_transform(
+            auction_pkg["woe_tables"],
+            np.column_stack([feats[col] for col in auction_pkg["features"]]),
+        )
+        prob = slim_models.auction_predict_proba(auction_pkg, woe)
+
+        out.loc[ok, "V0"] = hedonic_price
+        out.loc[ok, "effective_LTV"] = effective_LTV
+        out.loc[ok, "deposit_overhang"] = deposit_overhang
+        out.loc[ok, "nearby_auction_1km"] = nearby
+        out.loc[ok, "local_morans_i"] = morans
+        out.loc[ok, "prob"] = [round(float(p), 4) for p in prob]
+        out.loc[ok, "grade"] = [auction_grade(p) for p in prob]
+
+    out["error_code"] = pd.Series(error, index=out.index, dtype=object)
+    return out
+
+
 # ==========================================
 # 로컬 테스트용 실행부
 # ==========================================
@@ -13,9 +13,17 @@ Original file is located at
 # - 시나리오 민감도: base / -10% / -20%
 # ============================================================
 
-import numpy as np
-import pandas as pd
-from math import erf, sqrt
+from __future__ import annotations
+
+from functools import lru_cache
+from math import sqrt
+from pathlib import Path
+
+from lazy_import import lazy_module
+
+# numpy/pandas는 첫 계산 시점에 import
+np = lazy_module("numpy")
+pd = lazy_module("pandas")
 
 # ---------------------------
 # 1) 파라미터 정의 (너희 최종값으로 고정)
@@ -40,10 +48,226 @@ EL_CAP = 50000
 SCENARIO_FOR_BSTAR = "base"
 
 # ---------------------------
-# 2) 표준정규 CDF (scipy 없이)
+# 1-1) 거래 이력 추정치 (market_params.py가 번들 옆에 캐시)
+# ---------------------------
+MARKET_PARAMS_PATH = Path(__file__).resolve().parent / "data" / "bundle" / "market_params.json"
+MARKET_PARAMS_ESTIMATOR = "ewma"          # "ewma" or "rolling"
+MU_RATE_ADJ = MU_ANNUAL - MU_HAT          # 금리 보정폭 (추정 mu에도 그대로 적용)
+
+
+def _read_market_params_cache(path) -> dict | None:
+    """
+    캐시 JSON (market_params.load_market_params_cache: 버전 + 원본 sha256 확인).
+    없거나 원본이 바뀌었으면 None → 호출 측이 상수로 대체. 파일이 없으면 market_params(pandas)를 import하지 않음
+    """
+    if not Path(path).exists():
+        return None
+    from market_params import load_market_params_cache
+
+    return load_market_params_cache(path)
+
+
+@lru_cache(maxsize=8)
+def load_market_params(group: str = "all", estimator: str = MARKET_PARAMS_ESTIMATOR, path=MARKET_PARAMS_PATH) -> dict:
+    """
+    캐시된 추정치 → {"MU_HAT", "MU_ANNUAL", "SIGMA_ANNUAL", "source"}
+    - 추정 mu는 보정 전(MU_HAT) 자리, MU_ANNUAL = 추정 mu + MU_RATE_ADJ
+    - 캐시 / 그룹 / 추정치가 없거나 MD1 원본이 캐시 이후 바뀌었으면 위 상수 그대로 (source="constants")
+    """
+    fallback = {"MU_HAT": MU_HAT, "MU_ANNUAL": MU_ANNUAL, "SIGMA_ANNUAL": SIGMA_ANNUAL, "source": "constants"}
+    try:
+        est = _read_market_params_cache(path)["estimates"][group][estimator]
+    except (KeyError, TypeError):
+        return fallback
+    if not est:
+        return fallback
+
+    return {
+        "MU_HAT": est["mu"],
+        "MU_ANNUAL": est["mu"] + MU_RATE_ADJ,
+        "SIGMA_ANNUAL": est["sigma"],
+        "source": f"{Path(path).name}:{group}:{estimator}",
+    }
+
+
+# 캐시가 없을 때의 근사 사후분포: MU_HAT("3년 평균")을 월 수익률 36개로 추정했다고 가정
+PARAM_PRIOR_MONTHS = 36
+PARAM_DRAWS = 1000
+
+
+def param_posterior_draws(mu: float, sigma: float, n_months: int = PARAM_PRIOR_MONTHS, n_draws: int = PARAM_DRAWS, seed: int = 0) -> tuple:
+    """
+    점추정 (mu, sigma)만 있을 때 월 수익률 n_months개, 무정보 사전분포 기준 사후 표본:
+      sigma^2 ~ (n-1)*sigma_hat^2 / chi2(n-1),   nu | sigma ~ N(nu_hat, sigma^2 * 12/n),   mu = nu + 0.5*sigma^2
+    (nu = mu - 0.5*sigma^2: 로그수익률 연 drift)
+    반환: (mu 배열, sigma 배열)
+    """
+    if n_months < 2:
+        raise ValueError("n_months는 2 이상이어야 합니다.")
+    rng = np.random.default_rng(seed)
+    sig2 = (n_months - 1) * sigma**2 / rng.chisquare(n_months - 1, n_draws)
+    nu = (mu - 0.5 * sigma**2) + np.sqrt(sig2 * 12.0 / n_months) * rng.standard_normal(n_draws)
+    return nu + 0.5 * sig2, np.sqrt(sig2)
+
+
+@lru_cache(maxsize=8)
+def load_market_param_draws(
+    group: str = "all",
+    estimator: str = MARKET_PARAMS_ESTIMATOR,
+    n_draws: int = PARAM_DRAWS,
+    seed: int = 0,
+    path=MARKET_PARAMS_PATH,
+) -> dict:
+    """
+    (mu, sigma) 불확실성 표본 → {"mu": MU_ANNUAL 기준 배열, "sigma": 배열, "source"}
+    - 캐시된 월별 상태가 있으면 market_params.bootstrap_group (블록 부트스트랩) + MU_RATE_ADJ
+    - 없거나 원본이 바뀌었으면 상수 점추정 주변의 근사 사후분포 (param_posterior_draws)
+    배열은 읽기 전용 (lru_cache로 공유)
+    """
+    draws, source = None, None
+    try:
+        months = _read_market_params_cache(path)["state"]["groups"][group]
+    except (KeyError, TypeError):
+        months = None
+    if months:
+        from market_params import bootstrap_group
+
+        boot = bootstrap_group(months, estimator, n_draws=n_draws, seed=seed)
+        if boot is not None:
+            draws = (boot[0] + MU_RATE_ADJ, boot[1])
+            source = f"{Path(path).name}:{group}:{estimator}:bootstrap"
+
+    if draws is None:
+        mu_hat, sigma = param_posterior_draws(MU_HAT, SIGMA_ANNUAL, n_draws=n_draws, seed=seed)
+        draws = (mu_hat + MU_RATE_ADJ, sigma)
+        source = f"constants:posterior({PARAM_PRIOR_MONTHS}m)"
+
+    mu, sigma = (np.ascontiguousarray(a, dtype=float) for a in draws)
+    mu.setflags(write=False)
+    sigma.setflags(write=False)
+    return {"mu": mu, "sigma": sigma, "source": source}
+
+
+def param_draws_around(mu: float, sigma: float, draws: dict | None = None) -> dict:
+    """
+    (mu, sigma) 표본을 주어진 점추정 주위로 옮김: mu는 평행이동, sigma는 비율 조정.
+    기준은 load_market_params() (표본과 같은 캐시 / 그룹). 기본 시장 추정치를 넘기면 표본 그대로.
+    """
+    draws = load_market_param_draws() if draws is None else draws
+    ref = load_market_params()
+    if mu == ref["MU_ANNUAL"] and sigma == ref["SIGMA_ANNUAL"]:
+        return draws
+    return {
+        "mu": draws["mu"] + (mu - ref["MU_ANNUAL"]),
+        "sigma": draws["sigma"] * (sigma / ref["SIGMA_ANNUAL"]),
+        "source": f"{draws['source']}:recentered",
+    }
+
+# ---------------------------
+# 2) 표준정규 CDF (scipy.special 우선, 없으면 numpy 체비쇼프 커널)
 # ---------------------------
+# erfc(z) = t * exp(-z^2 + P(t)),  t = 2/(2+z),  z >= 0
+# P: [0, 1] 구간 체비쇼프 급수 28항 (Numerical Recipes 3판 Erf::erfccheb와 같은 전개, mpmath 50자리로 재계산)
+_ERFC_CHEB = (
+    -1.3026537197817094, 6.4196979235649026e-1, 1.9476473204185836e-2, -9.561514786808631e-3,
+    -9.46595344482036e-4, 3.66839497852761e-4, 4.2523324806907e-5, -2.0278578112534e-5,
+    -1.624290004647e-6, 1.303655835580e-6, 1.5626441722e-8, -8.5238095915e-8,
+    6.529054439e-9, 5.059343495e-9, -9.91364156e-10, -2.27365122e-10,
+    9.6467911e-11, 2.394038e-12, -6.886027e-12, 8.94487e-13,
+    3.13092e-13, -1.12708e-13, 3.81e-16, 7.106e-15,
+    -1.523e-15, -9.4e-17, 1.21e-16, -2.8e-17,
+)
+
+
+# "auto": scipy.special(ndtr/log_ndtr)이 있으면 사용, "numpy": 아래 체비쇼프 커널만 사용
+NORM_CDF_BACKEND = "auto"
+
+# numpy 커널 블록 크기 (중간 배열이 CPU 캐시에 머물도록)
+_NORM_CDF_BLOCK = 8192
+
+_scipy_special = None
+
+
+def _get_scipy_special():
+    """scipy.special (첫 호출 시 import, 없으면 None)"""
+    global _scipy_special
+    if _scipy_special is None:
+        try:
+            import scipy.special as special
+        except ImportError:
+            special = False
+        _scipy_special = special
+    return _scipy_special or None
+
+
+def _log_erfc_nonneg(z):
+    """z >= 0 배열에 대해 log(erfc(z)). 꼬리에서도 underflow 없음."""
+    t = 2.0 / (2.0 + z)
+    ty = 4.0 * t - 2.0
+    d = np.zeros_like(z)
+    dd = np.zeros_like(z)
+    for c in _ERFC_CHEB[:0:-1]:
+        d, dd = ty * d - dd + c, d
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.log(t) - z * z + 0.5 * (_ERFC_CHEB[0] + ty * d) - dd
+
+
+def _blockwise(kernel, x):
+    """1차원으로 펴서 블록 단위로 kernel 적용 후 원래 모양으로"""
+    flat = x.ravel()
+    out = np.empty_like(flat)
+    for i in range(0, flat.size, _NORM_CDF_BLOCK):
+        out[i : i + _NORM_CDF_BLOCK] = kernel(flat[i : i + _NORM_CDF_BLOCK])
+    return out.reshape(x.shape)
+
+
+def _norm_cdf_kernel(x):
+    u = -x / sqrt(2.0)
+    half_erfc = 0.5 * np.exp(_log_erfc_nonneg(np.abs(u)))
+    return np.where(u >= 0, half_erfc, 1.0 - half_erfc)
+
+
+def _norm_logcdf_kernel(x):
+    u = -x / sqrt(2.0)
+    log_erfc = _log_erfc_nonneg(np.abs(u))
+    return np.where(u >= 0, np.log(0.5) + log_erfc, np.log1p(-0.5 * np.exp(log_erfc)))
+
+
 def norm_cdf(x: np.ndarray) -> np.ndarray:
-    return 0.5 * (1.0 + np.vectorize(erf)(x / sqrt(2.0)))
+    """
+    표준정규 CDF Φ(x) (배열 연산, 파이썬 루프 없음).
+    scipy.special.ndtr가 있으면 사용, 없으면 Φ(x) = erfc(-x/√2)/2 체비쇼프 커널.
+    두 경로 모두 하단 꼬리 상대오차 유지 (기존 0.5*(1+erf)는 x < -8.3 에서 0이 됨).
+    정확도 (mpmath 40자리 기준, benchmarks/bench_norm_cdf.py, numpy 커널):
+      -5  <= x <= 0  : 상대오차 < 1e-14
+      -37 <= x < -5  : 상대오차 < 4e-13 (Φ의 조건수 ~x² 만큼 증가)
+      x < -37.5      : subnormal → 0 으로 underflow (이 구간은 norm_logcdf 사용)
+      x > 0          : 절대오차 < 4e-16
+    """
+    x = np.asarray(x, dtype=float)
+    special = _get_scipy_special() if NORM_CDF_BACKEND == "auto" else None
+    if special is not None:
+        return special.ndtr(x)
+    return _blockwise(_norm_cdf_kernel, x)
+
+
+def norm_logcdf(x: np.ndarray) -> np.ndarray:
+    """
+    log Φ(x). 깊은 하단 꼬리(x < -37.5, Φ가 underflow 되는 구간)에서도 유한값.
+    scipy.special.log_ndtr가 있으면 사용, 없으면 체비쇼프 커널.
+    정확도 (mpmath 50자리 기준, benchmarks/bench_norm_cdf.py, numpy 커널):
+      -1e4 <= x <= 0 : 상대오차 < 1e-15
+      0 < x <= 8     : 상대오차 < 2e-14
+      8 < x <= 37    : 상대오차 < 4e-13 (log Φ(x) ≈ -Φ(-x), norm_cdf 하단 꼬리와 같은 오차)
+      x > 37         : subnormal 구간 (자릿수 손실), x >= 38.5 에서 0 으로 underflow
+    """
+    x = np.asarray(x, dtype=float)
+    special = _get_scipy_special() if NORM_CDF_BACKEND == "auto" else None
+    if special is not None:
+        return special.log_ndtr(x)
+    with np.errstate(over="ignore"):
+        return _blockwise(_norm_logcdf_kernel, x)
+
 
 # ---------------------------
 # 3) PD: GBM 폐형식
@@ -111,64 +335,578 @@ def expected_loss_closed_form(V0, B, T, mu, sigma, alpha):
     out[valid] = np.maximum(out[valid], 0.0)  # 수치 오차 방지
     return out
 
+# ---------------------------
+# 4-1) 계약기간 중 최초 도달(barrier) PD / EL 폐형식
+# ---------------------------
+def pd_first_passage_closed_form(V0, B, T, mu, sigma):
+    """
+    PD_fp = P(min_{0<=t<=T} V_t <= B)   (만기 전이라도 집값이 보증금 아래로 한 번이라도 내려가면 부도)
+    X_t = ln(V_t/V0) = nu*t + sigma*W_t,  nu = mu - 0.5*sigma^2,  b = ln(B/V0) < 0
+      = Φ((b - nu*T)/(sigma*sqrt(T))) + exp(2*nu*b/sigma^2) * Φ((b + nu*T)/(sigma*sqrt(T)))
+    V0 <= B (이미 깡통)이면 1. 항상 pd_gbm_closed_form 이상.
+    """
+    V0 = np.asarray(V0, dtype=float)
+    B  = np.asarray(B, dtype=float)
+    T  = np.asarray(T, dtype=float)
+
+    out = np.full_like(V0, np.nan, dtype=float)
+    valid = (V0 > 0) & (B > 0) & (T > 0) & np.isfinite(V0) & np.isfinite(B) & np.isfinite(T)
+    if valid.sum() == 0:
+        return out
+
+    V0v, Bv, Tv = V0[valid], B[valid], T[valid]
+    underwater = V0v <= Bv
+
+    # sigma<=0: 경로가 단조 → 시작 또는 만기 중 한 곳에서 B 이하인지
+    if sigma <= 0:
+        out[valid] = (underwater | (V0v * np.exp(mu * Tv) <= Bv)).astype(float)
+        return out
+
+    nu = mu - 0.5 * sigma**2
+    b = np.log(Bv / V0v)
+    s = sigma * np.sqrt(Tv)
+
+    # 반사항은 exp(양수) * Φ(아주 작은 값) 꼴이라 로그 공간에서 곱함 (overflow 방지)
+    reflected = np.exp(2.0 * nu * b / sigma**2 + norm_logcdf((b + nu * Tv) / s))
+    pd_fp = np.minimum(norm_cdf((b - nu * Tv) / s) + reflected, 1.0)
+    out[valid] = np.where(underwater, 1.0, pd_fp)
+    return out
+
+
+def expected_loss_first_passage(V0, B, T, mu, sigma, alpha):
+    """
+    도달 즉시 경매 규칙의 기대손실:
+      집값이 보증금 B에 닿는 순간 경매 → 회수 alpha*B, 손실 (1 - alpha)*B
+      끝까지 닿지 않으면 만기에 V_T > B → 보증금 전액 반환, 손실 0
+    → EL_fp = (1 - alpha) * B * PD_fp  (이미 V0 <= B면 즉시 경매: max(B - alpha*V0, 0))
+    """
+    V0 = np.asarray(V0, dtype=float)
+    B  = np.asarray(B, dtype=float)
+
+    pd_fp = pd_first_passage_closed_form(V0, B, T, mu, sigma)
+    with np.errstate(invalid="ignore"):
+        loss_hit = np.where(V0 <= B, np.maximum(B - alpha * V0, 0.0), (1.0 - alpha) * B)
+    return loss_hit * pd_fp
+
+# ---------------------------
+# 4-2) Merton 점프-확산: GBM 대안 (경매 동시 낙찰 같은 급락 반영)
+# ---------------------------
+# dV/V = mu dt + sigma dW + (J - 1) dN,  N ~ Poisson(lam),  ln J ~ N(mu_j, delta^2)
+# 점프 보정(-lam*kappa)으로 E[V_T] = V0*exp(mu*T) 유지 → GBM과 평균은 같고 꼬리만 두꺼움
+# 예시값: 10년에 한 번 -15% 안팎 급락. JUMP_SIGMA_DIFFUSION은 총 로그분산이 SIGMA_ANNUAL^2과 같도록 맞춘 확산 부분
+JUMP_PARAMS = {"lam": 0.10, "mu_j": -0.15, "delta": 0.10}
+JUMP_TAIL_TOL = 1e-12      # 잘라낸 포아송 꼬리 확률 상한
+_JUMP_BLOCK = 1 << 15      # (행 × 점프 수) 중간 배열을 행 블록으로 제한
+
+
+def jump_sigma_diffusion(jump: dict | None = None, sigma_total: float = SIGMA_ANNUAL) -> float:
+    """총 연 로그분산 sigma_total^2에서 점프 분산 lam*(mu_j^2 + delta^2)을 뺀 확산 부분 sigma"""
+    jump = JUMP_PARAMS if jump is None else jump
+    var = sigma_total**2 - jump["lam"] * (jump["mu_j"] ** 2 + jump["delta"] ** 2)
+    if var < 0:
+        raise ValueError("점프 분산이 총 분산(sigma_total^2)보다 큽니다. jump 파라미터를 확인하세요.")
+    return sqrt(var)
+
+
+JUMP_SIGMA_DIFFUSION = jump_sigma_diffusion()
+
+
+def _poisson_n_max(lamT_max, tol=JUMP_TAIL_TOL):
+    """P(N > n_max) < tol 인 최소 n_max (N ~ Poisson(lamT_max); 꼬리는 lamT에 대해 증가하므로 최댓값 기준)"""
+    if lamT_max <= 0:
+        return 0
+    n, log_p, cdf = 0, -lamT_max, np.exp(-lamT_max)
+    while 1.0 - cdf >= tol and n < 10_000:
+        n += 1
+        log_p += np.log(lamT_max) - np.log(n)
+        cdf += np.exp(log_p)
+    return n
+
+
+def _merton_mixture(V0, B, T, mu, sigma, alpha, jump):
+    """
+    유효 행만 받아 (행 × 점프 수 0..n_max) 격자에서 조건부 정규 항을 한 번에 계산.
+    N = n 조건부: ln V_T ~ N(m_n, s_n^2),  m_n = ln V0 + (mu - sigma^2/2 - lam*kappa)T + n*mu_j,  s_n^2 = sigma^2 T + n*delta^2
+    반환: (PD, EL) — alpha가 None이면 EL은 None
+    """
+    lam, mu_j, delta = jump["lam"], jump["mu_j"], jump["delta"]
+    kappa = np.exp(mu_j + 0.5 * delta**2) - 1.0
+    lamT = lam * T
+    n = np.arange(_poisson_n_max(float(lamT.max())) + 1, dtype=float)
+
+    # 포아송 가중치 (로그 공간): -lamT + n ln(lamT) - ln n!
+    log_fact = np.concatenate([[0.0], np.cumsum(np.log(n[1:]))])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_w = -lamT[:, None] + n[None, :] * np.log(lamT)[:, None] - log_fact[None, :]
+    w = np.exp(np.where(n[None, :] == 0, -lamT[:, None], log_w))
+
+    m = (np.log(V0) + (mu - 0.5 * sigma**2 - lam * kappa) * T)[:, None] + n[None, :] * mu_j
+    var = sigma**2 * T[:, None] + n[None, :] * delta**2
+    s = np.sqrt(var)
+    stochastic = s > 0
+    s_safe = np.where(stochastic, s, 1.0)
+    Bc = B[:, None]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = (np.log(Bc) - m) / s_safe
+        # s_n = 0 (sigma=0, n=0): 확정적 비교
+        pd_ = np.sum(w * np.where(stochastic, norm_cdf(z), (m < np.log(Bc)).astype(float)), axis=1)
+        if alpha is None:
+            return pd_, None
+
+        d = z - np.log(alpha) / s_safe
+        term = Bc * norm_cdf(d) - alpha * np.exp(m + 0.5 * var) * norm_cdf(d - s_safe)
+        term = np.where(stochastic, term, np.maximum(Bc - alpha * np.exp(m), 0.0))
+    return pd_, np.sum(w * term, axis=1)
+
+
+def pd_el_merton(V0, B, T, mu, sigma, alpha, jump=None):
+    """
+    점프-확산 PD와 EL을 한 번에 (포아송 가중치 / 조건부 평균·분산 공유).
+    alpha=None이면 PD만 계산하고 EL은 None.
+    """
+    V0 = np.asarray(V0, dtype=float)
+    B  = np.asarray(B, dtype=float)
+    T  = np.asarray(T, dtype=float)
+    jump = JUMP_PARAMS if jump is None else jump
+
+    pd_out = np.full_like(V0, np.nan, dtype=float)
+    el_out = np.full_like(V0, np.nan, dtype=float) if alpha is not None else None
+    valid = (V0 > 0) & (B > 0) & (T > 0) & np.isfinite(V0) & np.isfinite(B) & np.isfinite(T)
+    if valid.sum() == 0:
+        return pd_out, el_out
+
+    V0v, Bv, Tv = V0[valid], B[valid], T[valid]
+    pd_v = np.empty(V0v.shape)
+    el_v = np.empty(V0v.shape)
+    for lo in range(0, V0v.size, _JUMP_BLOCK):
+        sl = slice(lo, lo + _JUMP_BLOCK)
+        p, e = _merton_mixture(V0v[sl], Bv[sl], Tv[sl], mu, max(sigma, 0.0), alpha, jump)
+        pd_v[sl] = p
+        if e is not None:
+            el_v[sl] = e
+
+    pd_out[valid] = np.clip(pd_v, 0.0, 1.0)
+    if el_out is not None:
+        el_out[valid] = np.maximum(el_v, 0.0)
+    return pd_out, el_out
+
+
+def pd_merton_closed_form(V0, B, T, mu, sigma, jump=None):
+    """
+    pd_gbm_closed_form의 점프-확산 버전 (sigma는 확산 부분):
+      PD = Σ_n P(N=n) Φ((ln B - m_n) / s_n)   (포아송 급수, 꼬리 JUMP_TAIL_TOL에서 절단)
+    jump: {"lam", "mu_j", "delta"} (기본 JUMP_PARAMS). lam=0이면 GBM과 같음.
+    """
+    return pd_el_merton(V0, B, T, mu, sigma, None, jump)[0]
+
+
+def expected_loss_merton(V0, B, T, mu, sigma, alpha, jump=None):
+    """
+    expected_loss_closed_form의 점프-확산 버전 (sigma는 확산 부분):
+      EL = Σ_n P(N=n) [B Φ(d_n) - alpha exp(m_n + s_n^2/2) Φ(d_n - s_n)],  d_n = (ln(B/alpha) - m_n) / s_n
+    """
+    return pd_el_merton(V0, B, T, mu, sigma, alpha, jump)[1]
+
+
 # ---------------------------
 # 5) 메인: df에 PD/LGD/EL 컬럼 추가
 # ---------------------------
+# 배열 코어의 블록 크기 (블록 단위 임시 배열만 만들고 결과는 출력 버퍼에 바로 씀)
+TRACKB_BLOCK = 1 << 16
+
+
+def trackB_output_names(scenarios: dict = SCENARIOS, first_passage: bool = True) -> list:
+    """trackB_risk_arrays가 채우는 출력 이름 (add_trackB_risk_columns 컬럼 순서와 동일)"""
+    names = ["jeonse_ratio"]
+    for s_name in scenarios:
+        names += [f"PD_{s_name}", f"EL_{s_name}", f"LGD_{s_name}"]
+        if first_passage:
+            names += [f"PD_fp_{s_name}", f"EL_fp_{s_name}"]
+    return names
+
+
+def trackB_risk_arrays(
+    V0, B, T,
+    mu: float = MU_ANNUAL,
+    sigma: float | None = None,
+    alpha: float = ALPHA_USED,
+    scenarios: dict = SCENARIOS,
+    out: dict | None = None,
+    dtype=None,
+    use_table: bool = False,
+    first_passage: bool = True,
+    block: int = TRACKB_BLOCK,
+    model: str = "gbm",
+    jump: dict | None = None,
+) -> dict:
+    """
+    add_trackB_risk_columns의 배열 코어: 1차원 V0 / B / T → {trackB_output_names: 배열}.
+    - out: 같은 키의 미리 할당된 버퍼(길이 n)를 넘기면 그 안에 씀 (없는 키만 새로 할당)
+    - dtype: 새로 할당하는 버퍼 dtype (기본 float64, 예: np.float32로 메모리 절반)
+    - 계산은 block 행씩 float64로 하고 결과만 버퍼 dtype으로 기록 → 전체 크기 임시 배열 없음
+    - T 검증(NaN / <=0)은 하지 않음 (무효 행은 NaN, DataFrame 래퍼에서 검증)
+    - model="merton": PD/EL을 점프-확산(pd_merton_closed_form / expected_loss_merton, jump 파라미터)으로 계산.
+      sigma는 확산 부분. first-passage 열은 GBM 전용이라 생략
+    - sigma=None: gbm은 SIGMA_ANNUAL, merton은 jump_sigma_diffusion(jump) (총 분산을 GBM과 맞춤 → 점프 분산 이중 계산 없음)
+    """
+    if model not in ("gbm", "merton"):
+        raise ValueError(f'지원하지 않는 model: {model} ("gbm" 또는 "merton")')
+    if sigma is None:
+        sigma = jump_sigma_diffusion(jump) if model == "merton" else SIGMA_ANNUAL
+    if model == "merton" and use_table:
+        raise ValueError("조회표(use_table)는 GBM 모델에서만 사용할 수 있습니다.")
+    first_passage = first_passage and model == "gbm"
+
+    V0 = np.asarray(V0, dtype=float)
+    B = np.asarray(B, dtype=float)
+    T = np.asarray(T, dtype=float)
+    if not (V0.ndim == 1 and V0.shape == B.shape == T.shape):
+        raise ValueError("V0, B, T는 길이가 같은 1차원 배열이어야 합니다.")
+
+    n = V0.shape[0]
+    out = {} if out is None else out
+    for name in trackB_output_names(scenarios, first_passage):
+        if name not in out:
+            out[name] = np.empty(n, dtype=np.float64 if dtype is None else dtype)
+        elif out[name].shape != (n,):
+            raise ValueError(f"출력 버퍼 크기 불일치: {name} {out[name].shape} != ({n},)")
+
+    table = load_trackB_table(mu, sigma, alpha) if use_table else None
+
+    for lo in range(0, n, block):
+        sl = slice(lo, min(lo + block, n))
+        v0, b, t = V0[sl], B[sl], T[sl]
+
+        # --- 전세가율
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out["jeonse_ratio"][sl] = np.where((v0 > 0) & np.isfinite(v0) & np.isfinite(b), b / v0, np.nan)
+
+        for s_name, shock in scenarios.items():
+            v0_s = v0 * (1.0 + shock)
+            v0_s[~(v0_s > 0)] = np.nan
+
+            # PD / EL (폐형식 또는 조회표)
+            if table is not None:
+                PD_arr, EL_arr = pd_el_from_table(table, v0_s, b, t)
+            elif model == "merton":
+                PD_arr, EL_arr = pd_el_merton(v0_s, b, t, mu, sigma, alpha, jump)
+            else:
+                PD_arr = pd_gbm_closed_form(v0_s, b, t, mu, sigma)
+                EL_arr = expected_loss_closed_form(v0_s, b, t, mu, sigma, alpha)
+            out[f"PD_{s_name}"][sl] = PD_arr
+            out[f"EL_{s_name}"][sl] = EL_arr
+
+            # LGD_cond = EL / PD
+            with np.errstate(divide="ignore", invalid="ignore"):
+                out[f"LGD_{s_name}"][sl] = np.where(
+                    (PD_arr > 1e-12) & np.isfinite(PD_arr) & np.isfinite(EL_arr),
+                    EL_arr / PD_arr,
+                    0.0
+                )
+
+            # 만기 전 최초 도달(barrier) 기준
+            if first_passage:
+                out[f"PD_fp_{s_name}"][sl] = pd_first_passage_closed_form(v0_s, b, t, mu, sigma)
+                out[f"EL_fp_{s_name}"][sl] = expected_loss_first_passage(v0_s, b, t, mu, sigma, alpha)
+
+    return out
+
+
 def add_trackB_risk_columns(
     df: pd.DataFrame,
     v0_col: str = "hedonic_price",
     b_col: str  = "deposit",
     t_col: str  = "term",
     mu: float = MU_ANNUAL,
-    sigma: float = SIGMA_ANNUAL,
+    sigma: float | None = None,
     alpha: float = ALPHA_USED,
-    scenarios: dict = SCENARIOS
+    scenarios: dict = SCENARIOS,
+    use_table: bool = False,
+    first_passage: bool = True,
+    dtype=None,
+    model: str = "gbm",
+    jump: dict | None = None
 ) -> pd.DataFrame:
-
-    out = df.copy()
+    """
+    use_table=True: PD/EL을 폐형식 대신 스케일 불변 조회표(load_trackB_table)에서 보간
+      (보간 오차 추정치는 표의 max_err, sigma > 0 필요)
+    first_passage=True: 계약기간 중 최초 도달 기준 PD_fp_{s} / EL_fp_{s} 컬럼도 추가
+    dtype: 결과 컬럼 dtype (기본 float64, np.float32 가능)
+    model: "gbm"(기본) 또는 "merton"(점프-확산, jump 파라미터 / sigma는 확산 부분)
+    sigma=None: 모델별 기본값 (gbm: SIGMA_ANNUAL, merton: jump_sigma_diffusion(jump))
+    계산은 trackB_risk_arrays, 여기서는 숫자화 / 검증 / 컬럼 붙이기만
+    반환 df는 입력의 얕은 복사 + 새 열 (입력 열 데이터는 복사하지 않고 공유, 입력 df는 그대로)
+    """
 
     # --- 필수 컬럼 체크
     for col in [v0_col, b_col, t_col]:
-        if col not in out.columns:
+        if col not in df.columns:
             raise ValueError(f"필수 컬럼 누락: {col}")
 
-    # --- 숫자화
-    V0 = pd.to_numeric(out[v0_col], errors="coerce").to_numpy(dtype=float)
-    B  = pd.to_numeric(out[b_col],  errors="coerce").to_numpy(dtype=float)
-    out[t_col] = pd.to_numeric(out[t_col], errors="coerce")
+    # --- 숫자화 (이미 float64면 복사 없음)
+    V0 = pd.to_numeric(df[v0_col], errors="coerce").to_numpy(dtype=float)
+    B  = pd.to_numeric(df[b_col],  errors="coerce").to_numpy(dtype=float)
+    T_col = pd.to_numeric(df[t_col], errors="coerce")
 
     # --- T 유효성 체크
-    if out[t_col].isna().any():
+    if T_col.isna().any():
         raise ValueError("계약기간(T)에 NaN 값이 존재합니다. 입력값을 확인하세요.")
-    if (out[t_col] <= 0).any():
+    if (T_col <= 0).any():
         raise ValueError("계약기간(T)은 양수여야 합니다. 입력값을 확인하세요.")
 
-    out["T_years"] = out[t_col]
-    T = out["T_years"].to_numpy(dtype=float)
+    cols = trackB_risk_arrays(
+        V0, B, T_col.to_numpy(dtype=float), mu, sigma, alpha, scenarios,
+        dtype=dtype, use_table=use_table, first_passage=first_passage, model=model, jump=jump,
+    )
+
+    # 얕은 복사에 열 단위로 대입: 기존 블록은 합치거나(consolidate) 복사하지 않음
+    # (pd.concat(axis=1)은 pandas 버전에 따라 원본 블록을 복사)
+    out = df.copy(deep=False)
+    out[t_col] = T_col
+    out["T_years"] = T_col.to_numpy()
+    for name, values in cols.items():
+        out[name] = values
+    return out
 
-    # --- 전세가율
-    out["jeonse_ratio"] = np.where((V0 > 0) & np.isfinite(V0) & np.isfinite(B), B / V0, np.nan)
+# ---------------------------
+# 5-1) 시나리오 큐브: 매물 × shock × mu × sigma (× T) 격자 전체를 한 번에
+# ---------------------------
+# 중간 배열 크기 상한 (원소 수). 매물을 이 크기에 맞춰 청크로 나눠 계산
+CUBE_CHUNK_ELEMS = 1 << 20
 
-    for s_name, shock in scenarios.items():
-        V0_s = V0 * (1.0 + shock)
-        V0_s = np.where(V0_s > 0, V0_s, np.nan)
 
-        # PD / EL (폐형식)
-        out[f"PD_{s_name}"] = pd_gbm_closed_form(V0_s, B, T, mu, sigma)
-        out[f"EL_{s_name}"] = expected_loss_closed_form(V0_s, B, T, mu, sigma, alpha)
+def _cube_chunk(V0, B, T, shocks, mus, sigmas, alpha):
+    """(c, 1, 1, 1, t) 매물 배열 × (S, M, G, 1) 파라미터 격자 → PD, EL (c, S, M, G, t)"""
+    return _pd_el_broadcast(
+        V0 * (1.0 + shocks[:, None, None, None]), B, T,
+        mus[None, :, None, None], sigmas[None, None, :, None], alpha,
+    )
+
 
-        # LGD_cond = EL / PD
-        PD_arr = out[f"PD_{s_name}"].to_numpy(dtype=float)
-        EL_arr = out[f"EL_{s_name}"].to_numpy(dtype=float)
+def _pd_el_broadcast(V0_s, B, T, mus, sigmas, alpha):
+    """
+    브로드캐스팅 가능한 배열끼리 PD, EL (mu / sigma도 배열 가능).
+    pd_gbm_closed_form / expected_loss_closed_form과 같은 식·NaN 규칙.
+    """
+    valid = (V0_s > 0) & (B > 0) & (T > 0) & np.isfinite(V0_s) & np.isfinite(B) & np.isfinite(T)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        EV = V0_s * np.exp(mus * T)                   # E[V_T]
+        stochastic = sigmas > 0
+        s = np.sqrt(T) * np.where(stochastic, sigmas, 1.0)
+        z = (np.log(B / V0_s) - (mus - 0.5 * sigmas**2) * T) / s
+        d = z - np.log(alpha) / s                     # ln(B/α) 기준
+
+        PD = norm_cdf(z)
+        EL = np.maximum(B * norm_cdf(d) - alpha * EV * norm_cdf(d - s), 0.0)
+
+        # sigma<=0: 확정적 비교
+        PD = np.where(stochastic, PD, (EV < B).astype(float))
+        EL = np.where(stochastic, EL, np.maximum(B - alpha * EV, 0.0))
 
-        out[f"LGD_{s_name}"] = np.where(
-            (PD_arr > 1e-12) & np.isfinite(PD_arr) & np.isfinite(EL_arr),
-            EL_arr / PD_arr,
-            0.0
+    PD = np.where(valid, PD, np.nan)
+    EL = np.where(valid, EL, np.nan)
+    return PD, EL
+
+
+def trackB_scenario_cube(
+    df: pd.DataFrame,
+    v0_col: str = "hedonic_price",
+    b_col: str  = "deposit",
+    t_col: str  = "term",
+    shocks=tuple(SCENARIOS.values()),
+    mus=(MU_HAT, MU_ANNUAL),
+    sigmas=(SIGMA_ANNUAL,),
+    terms=None,
+    alpha: float = ALPHA_USED,
+    chunk_elems: int = CUBE_CHUNK_ELEMS,
+) -> dict:
+    """
+    add_trackB_risk_columns의 시나리오 루프를 격자 전체로 확장:
+    매물별 PD / EL / LGD_cond를 shock × mu × sigma (× term) 모든 조합에 대해 브로드캐스팅으로 계산.
+    - terms=None: 매물의 t_col 값을 그대로 사용 (term 축 없음)
+      terms=[1, 2, ...]: 모든 매물을 각 계약기간으로 평가 (term 축 추가, t_col 불필요)
+    - 매물을 청크로 나눠 중간 배열을 chunk_elems 원소 이하로 유지
+    반환: {"dims", "coords", "PD", "EL", "LGD"} (배열 모양 = dims 순서, coords는 축별 라벨)
+    """
+    required = [v0_col, b_col] + ([t_col] if terms is None else [])
+    for col in required:
+        if col not in df.columns:
+            raise ValueError(f"필수 컬럼 누락: {col}")
+
+    V0 = pd.to_numeric(df[v0_col], errors="coerce").to_numpy(dtype=float)
+    B = pd.to_numeric(df[b_col], errors="coerce").to_numpy(dtype=float)
+    shocks = np.atleast_1d(np.asarray(shocks, dtype=float))
+    mus = np.atleast_1d(np.asarray(mus, dtype=float))
+    sigmas = np.atleast_1d(np.asarray(sigmas, dtype=float))
+
+    if terms is None:
+        T = pd.to_numeric(df[t_col], errors="coerce").to_numpy(dtype=float)
+        if np.isnan(T).any():
+            raise ValueError("계약기간(T)에 NaN 값이 존재합니다. 입력값을 확인하세요.")
+        if (T <= 0).any():
+            raise ValueError("계약기간(T)은 양수여야 합니다. 입력값을 확인하세요.")
+        T = T[:, None]
+    else:
+        terms = np.atleast_1d(np.asarray(terms, dtype=float))
+        if not (np.isfinite(terms).all() and (terms > 0).all()):
+            raise ValueError("terms는 양수여야 합니다. 입력값을 확인하세요.")
+        T = np.broadcast_to(terms, (len(df), terms.size))
+
+    n, n_t = T.shape
+    shape = (n, shocks.size, mus.size, sigmas.size, n_t)
+    PD = np.empty(shape)
+    EL = np.empty(shape)
+
+    per_row = max(1, shocks.size * mus.size * sigmas.size * n_t)
+    step = max(1, int(chunk_elems) // per_row)
+    for lo in range(0, n, step):
+        sl = slice(lo, min(lo + step, n))
+        PD[sl], EL[sl] = _cube_chunk(
+            V0[sl, None, None, None, None], B[sl, None, None, None, None], T[sl, None, None, None, :],
+            shocks, mus, sigmas, alpha,
         )
 
+    with np.errstate(divide="ignore", invalid="ignore"):
+        LGD = np.where((PD > 1e-12) & np.isfinite(PD) & np.isfinite(EL), EL / PD, 0.0)
+
+    dims = ("listing", "shock", "mu", "sigma", "term")
+    coords = {"listing": df.index, "shock": shocks, "mu": mus, "sigma": sigmas, "term": terms}
+    if terms is None:
+        dims = dims[:-1]
+        coords.pop("term")
+        PD, EL, LGD = PD[..., 0], EL[..., 0], LGD[..., 0]
+
+    return {"dims": dims, "coords": coords, "PD": PD, "EL": EL, "LGD": LGD}
+
+
+def scenario_cube_to_frame(cube: dict) -> pd.DataFrame:
+    """큐브 → dims MultiIndex + PD/EL/LGD 컬럼의 long 형식 DataFrame (그래프/피벗용)"""
+    index = pd.MultiIndex.from_product([cube["coords"][d] for d in cube["dims"]], names=list(cube["dims"]))
+    return pd.DataFrame({k: cube[k].ravel() for k in ["PD", "EL", "LGD"]}, index=index)
+
+
+# ---------------------------
+# 5-2) 파라미터 불확실성: (mu, sigma) 표본 전체로 PD / EL 분위수
+# ---------------------------
+UNCERTAINTY_QUANTILES = (0.05, 0.5, 0.95)
+
+
+def _pd_el_draws(V0_s, B, T, mus, sigmas, alpha):
+    """
+    (c, 1) 유효 매물 × (1, D) 표본 (sigma > 0) → PD, EL (c, D).
+    _pd_el_broadcast와 같은 식에서 원소별 검증 / 분기를 뺀 판 (검증은 행 단위로 호출 측에서)
+    """
+    s = sigmas * np.sqrt(T)
+    z = (np.log(B / V0_s) - (mus - 0.5 * sigmas**2) * T) / s
+    d = z - np.log(alpha) / s
+    EL = B * norm_cdf(d) - alpha * V0_s * np.exp(mus * T) * norm_cdf(d - s)
+    return norm_cdf(z), np.maximum(EL, 0.0, out=EL)
+
+
+def trackB_param_quantiles(
+    V0, B, T,
+    mu_draws,
+    sigma_draws,
+    alpha: float = ALPHA_USED,
+    shock: float = 0.0,
+    quantiles=UNCERTAINTY_QUANTILES,
+    chunk_elems: int = CUBE_CHUNK_ELEMS,
+) -> dict:
+    """
+    매물 × (mu, sigma) 표본 쌍을 브로드캐스팅해 매물별 PD / EL 분포의 분위수와 평균.
+    - mu_draws, sigma_draws: 같은 길이 D의 표본 (load_market_param_draws 등)
+    - 매물을 청크로 나눠 (청크 × D) 중간 배열을 chunk_elems 원소 이하로 유지
+    - 무효 행(V0<=0, B<=0, T<=0, NaN)은 NaN
+    반환: {"quantiles", "PD": (n, Q), "EL": (n, Q), "PD_mean": (n,), "EL_mean": (n,)}
+    """
+    V0 = np.asarray(V0, dtype=float)
+    B = np.asarray(B, dtype=float)
+    T = np.asarray(T, dtype=float)
+    if not (V0.ndim == 1 and V0.shape == B.shape == T.shape):
+        raise ValueError("V0, B, T는 길이가 같은 1차원 배열이어야 합니다.")
+
+    mus = np.asarray(mu_draws, dtype=float).ravel()
+    sigmas = np.asarray(sigma_draws, dtype=float).ravel()
+    if mus.size == 0 or mus.shape != sigmas.shape:
+        raise ValueError("mu_draws, sigma_draws는 길이가 같은 비어 있지 않은 표본이어야 합니다.")
+    q = np.atleast_1d(np.asarray(quantiles, dtype=float))
+    if not ((q >= 0) & (q <= 1)).all():
+        raise ValueError("quantiles는 0~1 사이여야 합니다.")
+
+    n = V0.shape[0]
+    out = {
+        "quantiles": q,
+        "PD": np.full((n, q.size), np.nan),
+        "EL": np.full((n, q.size), np.nan),
+        "PD_mean": np.full(n, np.nan),
+        "EL_mean": np.full(n, np.nan),
+    }
+
+    V0_s = V0 * (1.0 + shock)
+    valid = np.flatnonzero((V0_s > 0) & (B > 0) & (T > 0) & np.isfinite(V0_s) & np.isfinite(B) & np.isfinite(T))
+    kernel = _pd_el_draws if (sigmas > 0).all() else _pd_el_broadcast
+
+    step = max(1, int(chunk_elems) // mus.size)
+    for lo in range(0, valid.size, step):
+        rows = valid[lo : lo + step]
+        PD, EL = kernel(V0_s[rows, None], B[rows, None], T[rows, None], mus[None, :], sigmas[None, :], alpha)
+        out["PD"][rows] = np.quantile(PD, q, axis=1).T
+        out["EL"][rows] = np.quantile(EL, q, axis=1).T
+        out["PD_mean"][rows] = PD.mean(axis=1)
+        out["EL_mean"][rows] = EL.mean(axis=1)
+
     return out
 
+
+def quantile_suffix(q: float) -> str:
+    """분위수 → 컬럼 접미사 (0.05 → "q05", 0.5 → "q50", 0.975 → "q97.5")"""
+    return f"q{q * 100:02g}" if q * 100 >= 10 else f"q0{q * 100:g}"
+
+
+def add_trackB_uncertainty_columns(
+    df: pd.DataFrame,
+    v0_col: str = "hedonic_price",
+    b_col: str  = "deposit",
+    t_col: str  = "term",
+    draws: dict | None = None,
+    alpha: float = ALPHA_USED,
+    scenarios: dict = SCENARIOS,
+    quantiles=UNCERTAINTY_QUANTILES,
+    chunk_elems: int = CUBE_CHUNK_ELEMS,
+) -> pd.DataFrame:
+    """
+    시나리오별 PD / EL 범위 컬럼 추가: PD_{s}_q05 / PD_{s}_q50 / PD_{s}_q95, EL_{s}_... (quantile_suffix)
+    - draws: {"mu", "sigma"} 표본 (기본 load_market_param_draws(): 거래 이력 부트스트랩 또는 근사 사후분포)
+    - 점추정 컬럼(PD_{s}, EL_{s})은 add_trackB_risk_columns 그대로, 여기서는 범위만
+    """
+    for col in [v0_col, b_col, t_col]:
+        if col not in df.columns:
+            raise ValueError(f"필수 컬럼 누락: {col}")
+
+    V0 = pd.to_numeric(df[v0_col], errors="coerce").to_numpy(dtype=float)
+    B  = pd.to_numeric(df[b_col],  errors="coerce").to_numpy(dtype=float)
+    T  = pd.to_numeric(df[t_col], errors="coerce").to_numpy(dtype=float)
+    if np.isnan(T).any():
+        raise ValueError("계약기간(T)에 NaN 값이 존재합니다. 입력값을 확인하세요.")
+    if (T <= 0).any():
+        raise ValueError("계약기간(T)은 양수여야 합니다. 입력값을 확인하세요.")
+
+    draws = load_market_param_draws() if draws is None else draws
+    new = {}
+    for s_name, shock in scenarios.items():
+        res = trackB_param_quantiles(V0, B, T, draws["mu"], draws["sigma"], alpha, shock, quantiles, chunk_elems)
+        for key in ["PD", "EL"]:
+            for j, q in enumerate(res["quantiles"]):
+                new[f"{key}_{s_name}_{quantile_suffix(q)}"] = res[key][:, j]
+
+    out = df.copy(deep=False)
+    for name in [k for k in new if k in out.columns]:
+        out[name] = new.pop(name)
+    return pd.concat([out, pd.DataFrame(new, index=out.index, copy=False)], axis=1)
+
+
 # ---------------------------
 # 6) B* (권장 보증금 상한) 역산
 # ---------------------------
@@ -228,6 +966,322 @@ def B_star_range_two_mu(V0, T, sigma, alpha, shock, EL_CAP, mu_before, mu_after,
     b2 = find_B_star_by_EL_closed_form(V0, T, mu_after,  sigma, alpha, shock, EL_CAP, tol=tol)
     return b1, b2
 
+# ---------------------------
+# 6-1) B* 벡터화 역산 (행 전체를 한 번에)
+# ---------------------------
+def _el_and_slope(V0_s, B, T, mu, sigma, alpha):
+    """
+    EL(B)와 dEL/dB = Φ(d) (sigma > 0, 유효 행만 넘길 것)
+    E[(B - αV_T)^+]를 B로 미분하면 P(αV_T < B) = Φ(d).
+    """
+    m = np.log(V0_s) + (mu - 0.5 * sigma**2) * T
+    s = sigma * np.sqrt(T)
+    d = (np.log(B / alpha) - m) / s
+    Phi_d = norm_cdf(d)
+    el = np.maximum(B * Phi_d - alpha * np.exp(m + 0.5 * s**2) * norm_cdf(d - s), 0.0)
+    return el, Phi_d
+
+
+def find_B_star_vectorized(
+    V0, T, mu, sigma, alpha, shock,
+    EL_CAP,
+    B_low=1.0,
+    tol=1e-6,
+    max_iter=50
+):
+    """
+    find_B_star_by_EL_closed_form의 배열 버전: EL(B*) = EL_CAP 인 B*를 행별로 동시에 계산.
+    EL(B)는 B에 대해 증가·볼록 → 상한(B - α·E[V_T] <= EL)에서 시작한 뉴턴 반복은 근으로 단조 수렴.
+    뉴턴 스텝이 구간 [lo, hi]를 벗어나거나 비유한이면 이분법으로 대체 (safeguard).
+    - 무효 입력(V0<=0, T<=0, 충격 후 V0<=0, EL_CAP<0) → NaN
+    - EL(B_low) > EL_CAP → B_low (스칼라 버전과 동일)
+    - tol: |스텝| <= tol + 1e-12*B 이면 수렴 (스칼라 버전의 이분 구간폭 tol=100보다 훨씬 정밀)
+    """
+    V0, T, shock, EL_CAP = np.broadcast_arrays(
+        np.asarray(V0, dtype=float), np.asarray(T, dtype=float),
+        np.asarray(shock, dtype=float), np.asarray(EL_CAP, dtype=float),
+    )
+    shape = V0.shape
+    V0, T, shock, EL_CAP = V0.ravel(), T.ravel(), shock.ravel(), EL_CAP.ravel()
+
+    out = np.full(V0.shape, np.nan)
+    V0_s = V0 * (1.0 + shock)
+    valid = (
+        np.isfinite(V0) & np.isfinite(T) & np.isfinite(V0_s) & np.isfinite(EL_CAP)
+        & (V0 > 0) & (T > 0) & (V0_s > 0) & (EL_CAP >= 0)
+    )
+    if not valid.any():
+        return out.reshape(shape)
+
+    idx = np.flatnonzero(valid)
+    V0_s, T, cap = V0_s[idx], T[idx], EL_CAP[idx]
+    B_lo = np.full(idx.shape, float(B_low))
+
+    # 평균 담보가치 α·E[V_T]; EL(B) >= B - α·E[V_T] 이므로 B > cap + α·E[V_T] 이면 EL > cap
+    alpha_EV = alpha * V0_s * np.exp(mu * T)
+
+    if sigma <= 0:
+        # 확정적 케이스: EL(B) = max(B - α·V_T, 0)
+        el_low = np.maximum(B_lo - alpha_EV, 0.0)
+        out[idx] = np.where(el_low > cap, B_lo, cap + alpha_EV)
+        return out.reshape(shape)
+
+    el_low, _ = _el_and_slope(V0_s, B_lo, T, mu, sigma, alpha)
+    out[idx] = np.where(el_low > cap, B_lo, np.nan)
+
+    solve = ~(el_low > cap)
+    k = idx[solve]
+    V0_s, T, cap, alpha_EV = V0_s[solve], T[solve], cap[solve], alpha_EV[solve]
+    lo = B_lo[solve]
+    hi = np.maximum(cap + alpha_EV, lo) * (1.0 + 1e-9) + 1.0
+    x = hi.copy()
+
+    active = np.ones(k.shape, dtype=bool)
+    for _ in range(max_iter):
+        a = np.flatnonzero(active)
+        if a.size == 0:
+            break
+
+        el, slope = _el_and_slope(V0_s[a], x[a], T[a], mu, sigma, alpha)
+        f = el - cap[a]
+
+        # 구간 갱신
+        above = f > 0
+        hi[a] = np.where(above, x[a], hi[a])
+        lo[a] = np.where(above, lo[a], x[a])
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            x_new = np.where(f == 0, x[a], x[a] - f / slope)
+        bad = ~np.isfinite(x_new) | (x_new < lo[a]) | (x_new > hi[a])
+        x_new = np.where(bad, 0.5 * (lo[a] + hi[a]), x_new)
+
+        step = np.abs(x_new - x[a])
+        x[a] = x_new
+        done = step <= tol + 1e-12 * np.abs(x_new)
+        active[a[done]] = False
+
+    out[k] = x
+    return out.reshape(shape)
+
+
+def add_trackB_bstar_columns(
+    df: pd.DataFrame,
+    v0_col: str = "hedonic_price",
+    t_col: str  = "term",
+    sigma: float = SIGMA_ANNUAL,
+    alpha: float = ALPHA_USED,
+    shock: float = SCENARIOS[SCENARIO_FOR_BSTAR],
+    EL_CAP: float = EL_CAP,
+    mu_before: float = MU_HAT,
+    mu_after: float = MU_ANNUAL,
+    use_table: bool = False,
+) -> pd.DataFrame:
+    """
+    B_star_range_two_mu를 행 루프 없이 전체 df에 적용:
+      B_star_before (mu_before), B_star_after (mu_after) 컬럼 추가
+    use_table=True: 뉴턴 역산 대신 조회표(load_trackB_table) 보간
+    """
+    out = df.copy()
+
+    for col in [v0_col, t_col]:
+        if col not in out.columns:
+            raise ValueError(f"필수 컬럼 누락: {col}")
+
+    V0 = pd.to_numeric(out[v0_col], errors="coerce").to_numpy(dtype=float)
+    T = pd.to_numeric(out[t_col], errors="coerce").to_numpy(dtype=float)
+
+    for col, mu in [("B_star_before", mu_before), ("B_star_after", mu_after)]:
+        if use_table:
+            out[col] = find_B_star_from_table(load_trackB_table(mu, sigma, alpha), V0, T, shock, EL_CAP)
+        else:
+            out[col] = find_B_star_vectorized(V0, T, mu, sigma, alpha, shock, EL_CAP)
+    return out
+
+
+# ---------------------------
+# 6-2) 스케일 불변 조회표 (고QPS용 O(1) 스코어링)
+# ---------------------------
+# GBM에서 mu/sigma/alpha 고정 시
+#   PD(V0, B, T) = p(B/V0, T),   EL(V0, B, T) = V0 * g(B/V0, T)
+#   EL(B*) = EL_CAP  <=>  B* = V0 * r*(EL_CAP/V0, T)
+# → (ln 비율, √T) 균일 격자 위 쌍선형 보간으로 대체 (√T 축: 단기 계약의 곡률 완화). 시나리오 충격은 V0 → V0*(1+shock)로
+#   비율만 바뀌므로 표 하나로 모든 시나리오를 처리. 격자 밖 행은 폐형식으로 계산.
+TABLE_RATIO_RANGE = (0.02, 5.0)   # B / V0 (충격 반영 후)
+TABLE_CAP_RANGE   = (1e-3, 10.0)   # EL_CAP / V0 (충격 반영 후)
+TABLE_T_RANGE     = (0.25, 10.0)   # 계약기간(년)
+TABLE_N_RATIO     = 2049
+TABLE_N_T         = 193
+
+
+def _uniform_grid(lo, hi, n):
+    return np.linspace(lo, hi, n), (hi - lo) / (n - 1)
+
+
+def _grid_weights(shape, x0, dx, t0, dt, x, t):
+    """
+    균일 격자 (x0 + i*dx, t0 + j*dt) 위 쌍선형 보간 인덱스/가중치 (t = √T).
+    같은 격자의 여러 표를 보간할 때 한 번만 계산. 격자 밖 / 비유한 입력은 inside=False.
+    """
+    nx, nt = shape
+    fx = (x - x0) / dx
+    ft = (t - t0) / dt
+    inside = (fx >= 0) & (fx <= nx - 1) & (ft >= 0) & (ft <= nt - 1)   # NaN 비교는 False
+
+    np.clip(fx, 0, nx - 1, out=fx)
+    np.clip(ft, 0, nt - 1, out=ft)
+    np.nan_to_num(fx, copy=False)
+    np.nan_to_num(ft, copy=False)
+    i = np.minimum(fx.astype(np.intp), nx - 2)
+    j = np.minimum(ft.astype(np.intp), nt - 2)
+    fx -= i
+    ft -= j
+    return i * nt + j, fx, ft, inside
+
+
+def _grid_eval(values, k, wx, wt, inside):
+    """_grid_weights 결과로 values (nx, nt) 보간. 격자 밖은 NaN."""
+    nt = values.shape[1]
+    flat = values.ravel()
+    lo = flat.take(k)
+    lo += (flat.take(k + nt) - lo) * wx
+    hi = flat.take(k + 1)
+    hi += (flat.take(k + nt + 1) - hi) * wx
+    lo += (hi - lo) * wt
+    lo[~inside] = np.nan
+    return lo
+
+
+def _table_values(x, u, c, mu, sigma, alpha):
+    """격자점 (ln 비율 x, ln 상한비 c, u = √T)에서 PD / EL/V0 / ln r* 계산 (V0 = 1)"""
+    X, TT = np.meshgrid(x, u**2, indexing="ij")
+    C, TC = np.meshgrid(c, u**2, indexing="ij")
+    one = np.ones_like(X)
+    pd_ = pd_gbm_closed_form(one, np.exp(X), TT, mu, sigma)
+    el = expected_loss_closed_form(one, np.exp(X), TT, mu, sigma, alpha)
+    r_star = find_B_star_vectorized(np.ones_like(C), TC, mu, sigma, alpha, 0.0, np.exp(C), B_low=1e-12)
+    return pd_, el, np.log(r_star)
+
+
+def build_trackB_table(
+    mu: float = MU_ANNUAL,
+    sigma: float = SIGMA_ANNUAL,
+    alpha: float = ALPHA_USED,
+    ratio_range: tuple = TABLE_RATIO_RANGE,
+    cap_range: tuple = TABLE_CAP_RANGE,
+    t_range: tuple = TABLE_T_RANGE,
+    n_ratio: int = TABLE_N_RATIO,
+    n_t: int = TABLE_N_T,
+) -> dict:
+    """
+    (ln B/V0, √T) → PD, EL/V0 / (ln EL_CAP/V0, √T) → ln(B*/V0) 조회표.
+    max_err: 보간 오차 추정치 (보장된 상한 아님). 모든 셀의 중점과 두 방향 변 중점에서 폐형식과 비교한 최대 절대오차
+      - "pd": PD, "el_ratio": EL/V0 (원화 오차 ≈ V0 * el_ratio), "ln_b_star": ln B* (상대오차)
+      - 쌍선형 보간 오차는 (dx²/8)·f_xx + (dt²/8)·f_tt 꼴이라 두 곡률의 부호가 다르면 변 중점이 더 큼
+        → 세 종류를 모두 표본으로 씀. 셀 안 다른 점에서 조금 넘을 수 있음
+    """
+    if sigma <= 0:
+        raise ValueError("조회표는 sigma > 0 에서만 사용할 수 있습니다.")
+
+    x, dx = _uniform_grid(np.log(ratio_range[0]), np.log(ratio_range[1]), n_ratio)
+    c, dc = _uniform_grid(np.log(cap_range[0]), np.log(cap_range[1]), n_ratio)
+    u, du = _uniform_grid(sqrt(t_range[0]), sqrt(t_range[1]), n_t)
+    pd_, el, ln_r_star = _table_values(x, u, c, mu, sigma, alpha)
+
+    table = {
+        "mu": mu, "sigma": sigma, "alpha": alpha,
+        "x0": x[0], "dx": dx, "c0": c[0], "dc": dc, "u0": u[0], "du": du,
+        "pd": pd_, "el_ratio": el, "ln_b_star": ln_r_star,
+    }
+
+    # 보간 오차 추정: 셀 중점 / ln 비율 방향 변 중점 / √T 방향 변 중점
+    xm, cm, um = x[:-1] + 0.5 * dx, c[:-1] + 0.5 * dc, u[:-1] + 0.5 * du
+    max_err = {"pd": 0.0, "el_ratio": 0.0, "ln_b_star": 0.0}
+    for xs, us, cs in [(xm, um, cm), (xm, u, cm), (x, um, c)]:
+        pd_m, el_m, ln_r_m = _table_values(xs, us, cs, mu, sigma, alpha)
+        XM, UM = (a.ravel() for a in np.meshgrid(xs, us, indexing="ij"))
+        CM, _ = (a.ravel() for a in np.meshgrid(cs, us, indexing="ij"))
+        w_x = _grid_weights(pd_.shape, x[0], dx, u[0], du, XM, UM)
+        w_c = _grid_weights(ln_r_star.shape, c[0], dc, u[0], du, CM, UM)
+        for name, err in [
+            ("pd", _grid_eval(pd_, *w_x) - pd_m.ravel()),
+            ("el_ratio", _grid_eval(el, *w_x) - el_m.ravel()),
+            ("ln_b_star", _grid_eval(ln_r_star, *w_c) - ln_r_m.ravel()),
+        ]:
+            max_err[name] = max(max_err[name], float(np.max(np.abs(err))))
+    table["max_err"] = max_err
+    return table
+
+
+@lru_cache(maxsize=8)
+def load_trackB_table(mu: float = MU_ANNUAL, sigma: float = SIGMA_ANNUAL, alpha: float = ALPHA_USED) -> dict:
+    """(mu, sigma, alpha)별 조회표 (프로세스당 한 번 빌드)"""
+    return build_trackB_table(mu, sigma, alpha)
+
+
+def pd_el_from_table(table, V0, B, T):
+    """
+    조회표로 PD / EL 계산 (pd_gbm_closed_form / expected_loss_closed_form과 같은 입력·NaN 규칙).
+    격자 밖 행만 폐형식으로 계산.
+    """
+    V0, B, T = np.broadcast_arrays(
+        np.asarray(V0, dtype=float), np.asarray(B, dtype=float), np.asarray(T, dtype=float)
+    )
+    shape = V0.shape
+    V0, B, T = V0.ravel(), B.ravel(), T.ravel()
+
+    valid = (V0 > 0) & (B > 0) & (T > 0) & np.isfinite(V0) & np.isfinite(B) & np.isfinite(T)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x = np.log(B / V0)
+        u = np.sqrt(T)
+    x[~valid] = np.nan
+
+    w = _grid_weights(table["pd"].shape, table["x0"], table["dx"], table["u0"], table["du"], x, u)
+    inside = w[-1]
+    pd_ = _grid_eval(table["pd"], *w)
+    el = _grid_eval(table["el_ratio"], *w)
+    el *= V0
+
+    miss = valid & ~inside
+    if miss.any():
+        mu, sigma, alpha = table["mu"], table["sigma"], table["alpha"]
+        pd_[miss] = pd_gbm_closed_form(V0[miss], B[miss], T[miss], mu, sigma)
+        el[miss] = expected_loss_closed_form(V0[miss], B[miss], T[miss], mu, sigma, alpha)
+    return pd_.reshape(shape), el.reshape(shape)
+
+
+def find_B_star_from_table(table, V0, T, shock, EL_CAP, B_low=1.0):
+    """조회표로 B* 계산 (find_B_star_vectorized와 같은 입력·NaN 규칙). 격자 밖 행만 뉴턴 역산."""
+    V0, T, shock, EL_CAP = np.broadcast_arrays(
+        np.asarray(V0, dtype=float), np.asarray(T, dtype=float),
+        np.asarray(shock, dtype=float), np.asarray(EL_CAP, dtype=float),
+    )
+    shape = V0.shape
+    V0, T, shock, EL_CAP = V0.ravel(), T.ravel(), shock.ravel(), EL_CAP.ravel()
+
+    V0_s = V0 * (1.0 + shock)
+    valid = (
+        np.isfinite(V0) & np.isfinite(T) & np.isfinite(V0_s) & np.isfinite(EL_CAP)
+        & (V0 > 0) & (T > 0) & (V0_s > 0) & (EL_CAP >= 0)
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        c = np.log(EL_CAP / V0_s)
+        u = np.sqrt(T)
+    c[~valid] = np.nan
+
+    w = _grid_weights(table["ln_b_star"].shape, table["c0"], table["dc"], table["u0"], table["du"], c, u)
+    inside = w[-1]
+    ln_r = _grid_eval(table["ln_b_star"], *w)
+    # EL이 B에 대해 증가하므로 B* < B_low  <=>  EL(B_low) > EL_CAP → B_low (스칼라 버전과 동일)
+    out = np.maximum(V0_s * np.exp(ln_r), B_low)
+
+    miss = valid & ~inside
+    if miss.any():
+        out[miss] = find_B_star_vectorized(
+            V0[miss], T[miss], table["mu"], table["sigma"], table["alpha"], shock[miss], EL_CAP[miss], B_low=B_low
+        )
+    return out.reshape(shape)
+
+
 # ---------------------------
 # 7) 시나리오 민감도 리포트
 # ---------------------------
@@ -255,4 +1309,86 @@ def scenario_sensitivity_report(df_out: pd.DataFrame, idx: int = 0, make_plot: b
     rep["EL_ratio_vs_base"] = rep["EL"] / (base_el if base_el > 0 else np.nan)
     slope_per_1pct = (el_20 - base_el) / 20.0
 
-    return rep, base_el, el_20, slope_per_1pct
\ No newline at end of file
+    return rep, base_el, el_20, slope_per_1pct
+
+# ---------------------------
+# 7-1) 메모이즈 평가: 같은 입력이면 리스크 컬럼 / 민감도 / 불확실성 범위 / B* 를 다시 계산하지 않음
+#      (Streamlit 재실행: 토글 클릭처럼 입력이 그대로인 상호작용)
+# ---------------------------
+TRACKB_MEMO_SIZE = 256
+
+
+def trackB_memo_key(V0, B, T, mu, sigma, alpha=ALPHA_USED, scenarios=SCENARIOS, EL_CAP=EL_CAP, mu_before=MU_HAT) -> tuple:
+    """(V0, B, T, mu, sigma, alpha, scenarios, EL_CAP, mu_before) → 해시 가능한 정규화 키"""
+    return (
+        float(V0), float(B), float(T), float(mu), float(sigma), float(alpha),
+        tuple((str(k), float(v)) for k, v in scenarios.items()),
+        float(EL_CAP), float(mu_before),
+    )
+
+
+@lru_cache(maxsize=TRACKB_MEMO_SIZE)
+def _trackB_evaluate(key: tuple) -> dict:
+    V0, B, T, mu, sigma, alpha, scenarios, el_cap, mu_before = key
+    scenarios = dict(scenarios)
+    df_in = pd.DataFrame([{"hedonic_price": V0, "deposit": B, "term": T}])
+
+    df_out = add_trackB_risk_columns(
+        df_in, mu=mu, sigma=sigma, alpha=alpha, scenarios=scenarios,
+    )
+    rep, base_el, el_20, slope = scenario_sensitivity_report(df_out, idx=0, make_plot=False)
+
+    # 불확실성 범위: 거래 이력 표본이 있을 때만 (상수 주변 근사 사후분포는 화면용 범위로 쓰지 않음)
+    # 표본은 키의 mu / sigma 주위로 옮겨서 점추정과 같은 파라미터를 설명하게 함
+    band = {}
+    draws = load_market_param_draws()
+    if "base" in scenarios and not draws["source"].startswith("constants"):
+        band = add_trackB_uncertainty_columns(
+            df_in, draws=param_draws_around(mu, sigma, draws), alpha=alpha,
+            scenarios={"base": scenarios["base"]},
+        ).iloc[0].to_dict()
+
+    shock = scenarios.get(SCENARIO_FOR_BSTAR, 0.0)
+    b_before, b_after = B_star_range_two_mu(
+        V0=V0, T=T, sigma=sigma, alpha=alpha, shock=shock, EL_CAP=el_cap,
+        mu_before=mu_before, mu_after=mu, tol=100.0,
+    )
+    return {
+        "row": df_out.iloc[0].to_dict(),
+        "report": rep,
+        "base_el": float(base_el),
+        "el_20": float(el_20),
+        "slope": float(slope),
+        "band": band,
+        "b_before": float(b_before),
+        "b_after": float(b_after),
+    }
+
+
+def trackB_evaluate(V0, B, T, mu, sigma, alpha=ALPHA_USED, scenarios=SCENARIOS, EL_CAP=EL_CAP, mu_before=MU_HAT) -> dict:
+    """
+    단일 매물 Track B 전체 결과 (메모이즈)
+    → {"row": 리스크 컬럼 dict, "report", "base_el", "el_20", "slope", "band": PD/EL 분위수 dict, "b_before", "b_after"}
+    - 불확실성 범위(band)는 load_market_param_draws() 표본을 mu / sigma 주위로 옮겨 계산 (param_draws_around).
+      거래 이력 캐시가 없어 표본이 상수 근사 사후분포("constants:...")면 band는 빈 dict
+    - 반환값은 복사본이라 호출 쪽에서 수정해도 캐시에 영향 없음
+    """
+    res = _trackB_evaluate(trackB_memo_key(V0, B, T, mu, sigma, alpha, scenarios, EL_CAP, mu_before))
+    return {**res, "row": dict(res["row"]), "report": res["report"].copy(), "band": dict(res["band"])}
+
+
+def trackB_memo_info() -> dict:
+    """적중 / 미적중 횟수, 적중률, 항목 수"""
+    info = _trackB_evaluate.cache_info()
+    calls = info.hits + info.misses
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "hit_rate": info.hits / calls if calls else 0.0,
+        "size": info.currsize,
+        "maxsize": info.maxsize,
+    }
+
+
+def clear_trackB_memo():
+    _trackB_evaluate.cache_clear()
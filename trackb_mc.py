@@ -0,0 +1,184 @@
+# trackb_mc.py
+# ============================================================
+# Track B GBM 몬테카를로: 폐형식(PD / EL) 검증 + 임의 payoff 확장
+# - V_T = V0*(1+shock) * exp((mu - 0.5*sigma^2)T + sigma*sqrt(T)*Z)
+# - 시드 고정 난수 / antithetic / (스크램블) Sobol 준난수
+# - 경로를 청크로 나눠 메모리 상한 유지, 스트림 단위로 프로세스 풀 병렬화
+# - 벤치마크: python benchmarks/bench_mc.py
+# ============================================================
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from trackb_final import ALPHA_USED, MU_ANNUAL, SIGMA_ANNUAL
+
+# 청크 하나의 (매물 × 경로) 원소 수 상한
+MC_CHUNK_ELEMS = 1 << 20
+
+# 독립 난수 스트림 수 (= 병렬 작업 단위). n_jobs와 무관하게 같은 시드면 같은 결과
+MC_N_STREAMS = 8
+
+
+# ==========================================
+# payoff: (V_T (n, m), B (n, 1), alpha) → (n, m)
+# 프로세스 풀에서 쓰려면 모듈 최상위 함수여야 함 (pickle)
+# ==========================================
+def payoff_default(V_T, B, alpha):
+    """PD: 1(V_T < B)  (pd_gbm_closed_form과 같은 사건)"""
+    return (V_T < B).astype(float)
+
+
+def payoff_loss(V_T, B, alpha):
+    """EL: max(B - alpha*V_T, 0)  (expected_loss_closed_form과 같은 손실)"""
+    return np.maximum(B - alpha * V_T, 0.0)
+
+
+DEFAULT_PAYOFFS = {"PD": payoff_default, "EL": payoff_loss}
+
+
+# ==========================================
+# 표준정규 난수 스트림
+# ==========================================
+def _next_pow2(n):
+    return 1 << max(0, int(n) - 1).bit_length()
+
+
+def _normal_chunks(n_paths, chunk, seed_seq, sobol):
+    """길이 합이 n_paths인 표준정규 청크를 차례로 생성"""
+    if sobol:
+        from scipy.special import ndtri
+        from scipy.stats import qmc
+
+        # Sobol 균형성을 위해 청크 크기/개수는 2의 거듭제곱 (n_paths는 호출 측에서 맞춤)
+        engine = qmc.Sobol(d=1, scramble=True, seed=np.random.default_rng(seed_seq))
+        chunk = min(1 << (int(chunk).bit_length() - 1), n_paths)
+        for _ in range(n_paths // chunk):
+            yield ndtri(engine.random(chunk)[:, 0])
+        return
+
+    rng = np.random.default_rng(seed_seq)
+    done = 0
+    while done < n_paths:
+        m = min(chunk, n_paths - done)
+        yield rng.standard_normal(m)
+        done += m
+
+
+def _mc_stream(args):
+    """
+    스트림 하나: 매물별 payoff 표본의 합 / 제곱합 / 표본 수.
+    antithetic이면 (Z, -Z) 한 쌍의 평균이 표본 하나.
+    """
+    V0_s, B, T, mu, sigma, alpha, payoffs, n_paths, seed_seq, antithetic, sobol, chunk_elems = args
+
+    n = V0_s.shape[0]
+    drift = ((mu - 0.5 * sigma**2) * T)[:, None]
+    vol = (sigma * np.sqrt(T))[:, None]
+    V0_s, B = V0_s[:, None], B[:, None]
+
+    sums = {k: np.zeros(n) for k in payoffs}
+    sumsq = {k: np.zeros(n) for k in payoffs}
+    n_draws = n_paths // 2 if antithetic else n_paths
+    chunk = max(1, chunk_elems // (max(n, 1) * (2 if antithetic else 1)))
+
+    count = 0
+    for Z in _normal_chunks(n_draws, chunk, seed_seq, sobol):
+        Z = Z[None, :]
+        V_T = V0_s * np.exp(drift + vol * Z)
+        V_T_anti = V0_s * np.exp(drift - vol * Z) if antithetic else None
+        for k, f in payoffs.items():
+            x = f(V_T, B, alpha)
+            if antithetic:
+                x = 0.5 * (x + f(V_T_anti, B, alpha))
+            sums[k] += x.sum(axis=1)
+            sumsq[k] += np.square(x).sum(axis=1)
+        count += Z.shape[1]
+
+    return sums, sumsq, count
+
+
+# ==========================================
+# 메인
+# ==========================================
+def mc_gbm(
+    V0, B, T,
+    mu=MU_ANNUAL,
+    sigma=SIGMA_ANNUAL,
+    alpha=ALPHA_USED,
+    shock=0.0,
+    n_paths=100_000,
+    payoffs=None,
+    seed=0,
+    antithetic=True,
+    sobol=False,
+    n_jobs=1,
+    n_streams=MC_N_STREAMS,
+    chunk_elems=MC_CHUNK_ELEMS,
+):
+    """
+    매물별 E[payoff(V_T)]와 표준오차.
+    - payoffs: {"이름": f(V_T, B, alpha)} (기본: PD / EL). n_jobs > 1이면 최상위 함수여야 함
+    - 경로를 n_streams개 독립 스트림(SeedSequence.spawn)으로 나눠 n_jobs 프로세스에 분배
+    - sobol=True: 스트림마다 독립 스크램블 Sobol 수열 (scipy 필요), 표준오차는 스트림 평균들의 분산으로 계산.
+      스트림당 경로 수는 2의 거듭제곱으로 올림
+    - 무효 입력(V0<=0, B<=0, T<=0, NaN) → NaN (폐형식과 동일)
+    반환: {"PD": 평균, "PD_se": 표준오차, ..., "n_paths": 실제 경로 수}
+    """
+    V0, B, T, shock = np.broadcast_arrays(
+        np.asarray(V0, dtype=float), np.asarray(B, dtype=float),
+        np.asarray(T, dtype=float), np.asarray(shock, dtype=float),
+    )
+    shape = V0.shape
+    V0_s = (V0 * (1.0 + shock)).ravel()
+    B, T = B.ravel(), T.ravel()
+    payoffs = DEFAULT_PAYOFFS if payoffs is None else payoffs
+
+    if sigma < 0:
+        raise ValueError("sigma는 0 이상이어야 합니다.")
+    if n_paths < 1 or n_streams < 1:
+        raise ValueError("n_paths, n_streams는 1 이상이어야 합니다.")
+
+    valid = (V0_s > 0) & (B > 0) & (T > 0) & np.isfinite(V0_s) & np.isfinite(B) & np.isfinite(T)
+    idx = np.flatnonzero(valid)
+
+    per_stream = -(-int(n_paths) // n_streams)
+    if antithetic:
+        per_stream += per_stream % 2
+    if sobol:
+        per_stream = _next_pow2(per_stream)
+
+    seeds = np.random.SeedSequence(seed).spawn(n_streams)
+    tasks = [
+        (V0_s[idx], B[idx], T[idx], mu, sigma, alpha, payoffs, per_stream, s, antithetic, sobol, chunk_elems)
+        for s in seeds
+    ]
+    if n_jobs > 1 and len(idx):
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            results = list(pool.map(_mc_stream, tasks))
+    else:
+        results = [_mc_stream(t) for t in tasks]
+
+    out = {"n_paths": per_stream * n_streams}
+    for k in payoffs:
+        mean = np.full(V0_s.shape, np.nan)
+        se = np.full(V0_s.shape, np.nan)
+        count = sum(r[2] for r in results)
+
+        if sobol:
+            # 스트림(독립 스크램블)별 평균의 표본분산 → 준난수 오차 추정
+            stream_means = np.stack([r[0][k] / r[2] for r in results])
+            mean[idx] = stream_means.mean(axis=0)
+            if n_streams > 1:
+                se[idx] = stream_means.std(axis=0, ddof=1) / np.sqrt(n_streams)
+        else:
+            total = sum(r[0][k] for r in results)
+            total_sq = sum(r[1][k] for r in results)
+            mean[idx] = total / count
+            if count > 1:
+                var = np.maximum(total_sq / count - mean[idx] ** 2, 0.0) * count / (count - 1)
+                se[idx] = np.sqrt(var / count)
+
+        out[k] = mean.reshape(shape)
+        out[f"{k}_se"] = se.reshape(shape)
+    return out